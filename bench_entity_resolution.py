@@ -0,0 +1,113 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.entity_resolution import EntityResolver, MATCH_THRESHOLD
+
+# --- Configuration ---
+DEFAULT_ROWS = 200_000
+DUPLICATE_SHARE = 0.4 # Fraction of rows that are a re-listing of another row's business
+PLACES = ["Seminole", "Bayside", "Gulf Coast", "Tampa Bay", "Clearwater", "Sunrise", "Pinellas", "Harbor", "Palm",
+          "Pelican", "Suncoast", "Dunedin", "Largo", "Pasadena", "Westchester", "Oldsmar", "Belleair", "Citrus",
+          "Coastal", "Bay Area", "Island", "Keystone", "Lakeside", "Madeira", "Osprey", "Redington", "Safety Harbor"]
+SYLLABLES = ["ba", "lo", "ren", "ta", "mi", "son", "ker", "dal", "vin", "ro", "glat", "thorn", "gar", "ci", "ng",
+             "wen", "jo", "han", "bro", "mar", "tin", "ez", "da", "vis", "mil", "ler", "wil", "moo", "tay", "lor"]
+TRADES = ["Accountants", "Accounting", "Bookkeeping", "Tax Service", "Law", "Legal", "Plumbing", "Electric",
+          "Dental", "Landscaping", "Roofing", "Pizza", "Insurance", "Realty", "Financial", "Consulting"]
+SUFFIXES = ["Inc", "LLC", "P.A.", "Group", "Associates", "Company", "Corp", ""]
+SUFFIX_VARIANTS = {"Inc": [", Inc.", " Incorporated", " INC"], "LLC": [", L.L.C.", " llc", ", LLC"],
+                   "P.A.": [" PA", ", P.A."], "Company": [" Co", " Co."], "Corp": [" Corporation", ", Corp."], "": [" Inc", " LLC"]}
+STREETS = ["Main", "Seminole", "Pasadena", "Bay", "Gulf", "Ulmerton", "East Bay", "Park", "Tyrone", "Belcher"]
+STREET_TYPES = [("Street", "St"), ("Avenue", "Ave"), ("Boulevard", "Blvd"), ("Drive", "Dr"), ("Road", "Rd")]
+
+
+def synthetic_businesses(rows, duplicate_share=DUPLICATE_SHARE, seed=0):
+    """
+    `rows` listings of which about `duplicate_share` re-list an earlier business
+    the way Yellow Pages does: the legal suffix spelled differently, '&' vs 'and',
+    a one-letter typo, a reformatted phone or a spelled-out street type. Returns
+    (DataFrame of name/phone/address, true business ID per row).
+    """
+    rng = np.random.default_rng(seed)
+    businesses = rows - int(rows * duplicate_share)
+    # Made-up surnames of two or three syllables, so most names are as unique as real ones
+    surnames = np.char.capitalize(np.char.add(np.char.add(rng.choice(SYLLABLES, 20000), rng.choice(SYLLABLES, 20000)),
+                                              np.where(rng.random(20000) < 0.5, rng.choice(SYLLABLES, 20000), '')))
+    first, second = rng.choice(surnames, businesses), rng.choice(surnames, businesses)
+    joined = np.where(rng.random(businesses) < 0.3, np.char.add(np.char.add(first, " & "), second), first)
+    stem = np.where(rng.random(businesses) < 0.5, np.char.add(np.char.add(rng.choice(PLACES, businesses), " "), first), joined)
+    trade = rng.choice(TRADES, businesses)
+    suffix = rng.choice(SUFFIXES, businesses)
+    numbers, streets, types = rng.integers(1, 20000, businesses), rng.choice(STREETS, businesses), rng.integers(0, len(STREET_TYPES), businesses)
+    phones = rng.integers(2000000, 9999999, businesses)
+
+    # Businesses that happen to share a name are one multi-location business
+    business_ids = pd.factorize(pd.Series(np.char.add(np.char.add(stem, " "), trade)))[0]
+    listed = np.concatenate([np.arange(businesses), rng.integers(0, businesses, rows - businesses)])
+    names, phone_column, addresses = [], [], []
+    for row, business in enumerate(listed):
+        base = f"{stem[business]} {trade[business]}"
+        name = f"{base} {suffix[business]}".strip()
+        phone = f"(727) {phones[business] // 10000:03d}-{phones[business] % 10000:04d}"
+        street_type = STREET_TYPES[types[business]][1]
+        if row >= businesses: # A re-listing: vary one or two details
+            change = rng.integers(0, 4)
+            if change == 0:
+                name = base + str(rng.choice(SUFFIX_VARIANTS.get(suffix[business], [" Inc"])))
+            elif change == 1:
+                name = name.replace(" & ", " and ") if " & " in name else name.upper()
+            elif change == 2:
+                word = base.split()[-1]
+                cut = int(rng.integers(1, len(word)))
+                name = name.replace(word, word[:cut] + word[cut + 1:], 1) # Drop one letter
+            if rng.random() < 0.5:
+                phone = phone.replace("(727) ", "727.").replace("-", ".")
+            if rng.random() < 0.5:
+                street_type = STREET_TYPES[types[business]][0]
+        names.append(name)
+        phone_column.append(phone)
+        addresses.append(f"{numbers[business]} {streets[business]} {street_type}, Clearwater, FL")
+    df = pd.DataFrame({'name': names, 'phone': phone_column, 'address': addresses})
+    return df, business_ids[listed]
+
+
+def pair_count(sizes):
+    return int((sizes * (sizes - 1) // 2).sum())
+
+
+def pairwise_scores(cluster_ids, true_ids):
+    """(precision, recall) over all pairs of rows the resolver put, or should have put, together."""
+    both = pd.DataFrame({'found': cluster_ids, 'true': true_ids})
+    together = pair_count(both.groupby(['found', 'true']).size().to_numpy())
+    found = pair_count(both.groupby('found').size().to_numpy())
+    expected = pair_count(both.groupby('true').size().to_numpy())
+    return (together / found if found else 1.0), (together / expected if expected else 1.0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time entity resolution on a large synthetic listing set and score its clusters.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--duplicate-share', type=float, default=DUPLICATE_SHARE)
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df, true_ids = synthetic_businesses(args.rows, args.duplicate_share)
+    print(f"Generated {len(df)} synthetic listings of {len(np.unique(true_ids))} businesses in {time.perf_counter() - start:.1f}s\n")
+
+    resolver = EntityResolver(threshold=args.threshold)
+    cluster_ids = resolver.cluster(df)
+    resolver.report()
+
+    # What finalize_list did before: exact (name, phone) then exact name
+    start = time.perf_counter()
+    exact = df.drop_duplicates(subset=['name', 'phone']).drop_duplicates(subset=['name'])
+    exact_seconds = time.perf_counter() - start
+    exact_ids = pd.factorize(df['name'])[0]
+
+    precision, recall = pairwise_scores(cluster_ids.to_numpy(), true_ids)
+    exact_precision, exact_recall = pairwise_scores(exact_ids, true_ids)
+    print(f"\n{'':<20} {'businesses':>10} {'precision':>10} {'recall':>8} {'seconds':>8}")
+    print(f"{'exact name dedupe':<20} {len(exact):>10} {exact_precision:>10.3f} {exact_recall:>8.3f} {exact_seconds:>8.2f}")
+    print(f"{'entity resolution':<20} {resolver.stats['clusters']:>10} {precision:>10.3f} {recall:>8.3f} {resolver.stats['seconds']:>8.2f}")
+    print(f"{'truth':<20} {len(np.unique(true_ids)):>10}")
@@ -0,0 +1,98 @@
+import argparse
+import glob
+import os
+import re
+import time
+from lxml import html as lxml_html
+import site_analyzer
+from utils.async_crawler import page_text
+from utils.fixture_server import FIXTURES_DIR
+
+# --- Configuration ---
+DEFAULT_ITERATIONS = 200
+DEFAULT_SCALE = 20 # Repeat each page this many times to imitate large pages
+
+
+def legacy_extract(full_source, full_text):
+    """The extraction site_analyzer used before the engine: one scan per pattern over the concatenated site."""
+    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', full_source)
+    unique_emails = sorted(list(set(e.lower() for e in emails)))
+
+    tech_stack = []
+    for tech, signatures in site_analyzer.TECH_SIGNATURES.items():
+        if any(sig in full_source for sig in signatures):
+            tech_stack.append(tech)
+
+    social_links = re.findall(r'https?://(?:www\.)?(?:linkedin\.com/company/[^"\']+)|(?:facebook\.com/[^"\']+)|(?:twitter\.com/[^"\']+)', full_source)
+    unique_socials = sorted(list(set(social_links)))
+
+    contacts = []
+    sentences = re.split(r'[\n.!?]', full_text)
+    for sentence in sentences:
+        for keyword in site_analyzer.CONTACT_KEYWORDS:
+            if keyword in sentence.lower():
+                clean_sentence = ' '.join(sentence.strip().split())
+                if not (5 < len(clean_sentence) < 300):
+                    continue
+                if any(junk in clean_sentence.lower() for junk in site_analyzer.JUNK_KEYWORDS):
+                    continue
+                has_proper_noun = any(word.istitle() and word.lower() != keyword for word in clean_sentence.split())
+                if has_proper_noun:
+                    contacts.append(f"{keyword.title()}: {clean_sentence}")
+
+    return {
+        'emails': ', '.join(unique_emails) if unique_emails else 'N/A',
+        'tech_stack': ', '.join(sorted(list(set(tech_stack)))) if tech_stack else 'N/A',
+        'social_links': ', '.join(unique_socials) if unique_socials else 'N/A',
+        'contacts': ' | '.join(list(set(contacts))) if contacts else 'N/A'
+    }
+
+
+def load_corpus(scale):
+    """Every saved page under fixtures/, grouped by site directory, as (html, text) pairs."""
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '**', '*.html'), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        text = page_text(lxml_html.fromstring(source))
+        site = os.path.relpath(os.path.dirname(path), FIXTURES_DIR)
+        corpus.setdefault(site, []).append(('\n'.join([source] * scale), '\n'.join([text] * scale)))
+    return corpus
+
+
+def as_sets(result):
+    return {key: set(value.split(' | ' if key == 'contacts' else ', ')) for key, value in result.items()}
+
+
+def time_it(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-benchmark the single-pass extraction engine against the legacy scans.")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE, help="Times each page is repeated.")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.scale)
+    total_bytes = sum(len(source) for pages in corpus.values() for source, _ in pages)
+    print(f"Corpus: {len(corpus)} sites, {sum(len(p) for p in corpus.values())} pages, {total_bytes / 1e6:.2f} MB of HTML per iteration\n")
+
+    mismatches = 0
+    for site, pages in corpus.items():
+        legacy = legacy_extract(''.join(s for s, _ in pages), ''.join(t for _, t in pages))
+        engine = site_analyzer.extract_site_data(pages)
+        if as_sets(legacy) != as_sets(engine):
+            mismatches += 1
+            print(f"  Result differs for {site}:\n    legacy: {legacy}\n    engine: {engine}")
+
+    legacy_seconds = time_it(lambda: [legacy_extract(''.join(s for s, _ in p), ''.join(t for _, t in p)) for p in corpus.values()], args.iterations)
+    engine_seconds = time_it(lambda: [site_analyzer.extract_site_data(p) for p in corpus.values()], args.iterations)
+
+    mb = total_bytes * args.iterations / 1e6
+    print(f"{'legacy':<8} {legacy_seconds:7.2f}s  ({mb / legacy_seconds:7.1f} MB/s)")
+    print(f"{'engine':<8} {engine_seconds:7.2f}s  ({mb / engine_seconds:7.1f} MB/s)  -> {legacy_seconds / engine_seconds:.1f}x")
+    print("Results identical." if not mismatches else f"{mismatches} site(s) differ.")
@@ -0,0 +1,82 @@
+import argparse
+import os
+import shutil
+import tempfile
+import site_analyzer
+from utils.fixture_server import FixtureServer, SITES_FIXTURES
+from utils.pacing import Pacer
+from utils.resource_blocking import PageWeights
+
+# --- Configuration ---
+DEFAULT_IMAGES = 20 # Images on the synthetic heavy page
+IMAGE_BYTES = 200 * 1024
+FONT_BYTES = 100 * 1024
+VIDEO_BYTES = 2 * 1024 * 1024
+DEFAULT_LATENCY = 0.05 # Seconds added to every response to imitate a real network
+
+
+def build_heavy_site(root, images):
+    """
+    A small business homepage weighed down the way real ones are: photos, a web
+    font, a background video and a third-party ad script, plus a WordPress
+    script and gtag snippet that the tech-stack detection has to keep seeing.
+    """
+    site = os.path.join(root, 'heavy-site')
+    os.makedirs(os.path.join(site, 'doubleclick.net'))
+    for name, size in [('photo.jpg', IMAGE_BYTES), ('brand.woff2', FONT_BYTES), ('hero.mp4', VIDEO_BYTES),
+                       (os.path.join('doubleclick.net', 'ads.js'), 1024)]:
+        with open(os.path.join(site, name), 'wb') as f:
+            f.write(os.urandom(size))
+    tags = ''.join(f'<img src="photo.jpg?n={n}">' for n in range(images))
+    with open(os.path.join(site, 'index.html'), 'w') as f:
+        f.write(f"""<!DOCTYPE html><html><head><title>Heavy Site</title>
+<style>@font-face {{ font-family: Brand; src: url(brand.woff2); }} body {{ font-family: Brand; }}</style>
+<script src="/wp-includes/js/jquery/jquery.min.js"></script>
+<script src="doubleclick.net/ads.js"></script>
+<script>function gtag(){{}} gtag('js', new Date());</script>
+</head><body><h1>Heavy Site Plumbing</h1><video autoplay muted src="hero.mp4"></video>{tags}
+<footer>Contact us: office@heavysite.example. Owner: Pat Heavy, founder of the company.</footer>
+</body></html>""")
+
+
+def run_profile(urls, profile):
+    """Analyzes every URL in one Chrome with the given blocking profile. Returns (PageWeights, {url: result})."""
+    weights = PageWeights('blocked' if profile else 'unblocked', profile)
+    driver = site_analyzer.launch_driver(profile)
+    pacer = Pacer('chrome') # No rate limit: every site is on localhost
+    try:
+        results = {url: site_analyzer.analyze_website(driver, url, pacer, weights=weights) for url in urls}
+    finally:
+        driver.quit()
+    return weights, results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare page weight and load time with and without the resource blocking profile.")
+    parser.add_argument('--images', type=int, default=DEFAULT_IMAGES, help="Images on the synthetic heavy page.")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY, help="Seconds of artificial latency per response.")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        shutil.copytree(SITES_FIXTURES, root, dirs_exist_ok=True)
+        build_heavy_site(root, args.images)
+        with FixtureServer(root, delay=args.latency) as server:
+            sites = sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+            urls = [server.url(f"/{site}/") for site in sites]
+            blocked, blocked_results = run_profile(urls, site_analyzer.BLOCKING_PROFILE)
+            unblocked, unblocked_results = run_profile(urls, [])
+    finally:
+        shutil.rmtree(root)
+
+    print()
+    unblocked.report()
+    blocked.report()
+    (_, kb_off, s_off, _), (_, kb_on, s_on, _) = unblocked.summary(), blocked.summary()
+    if kb_off and s_off:
+        print(f"Blocking saved {100 * (1 - kb_on / kb_off):.0f}% of bytes and {100 * (1 - s_on / s_off):.0f}% of load time per page.")
+    same = blocked_results == unblocked_results
+    print("Extraction results are identical with and without blocking." if same else "Extraction results differ!")
+    for url in urls:
+        if blocked_results[url] != unblocked_results[url]:
+            print(f"  {url}\n    blocked:   {blocked_results[url]}\n    unblocked: {unblocked_results[url]}")
@@ -0,0 +1,54 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils import scoring
+
+# --- Configuration ---
+DEFAULT_ROWS = 100_000
+NAMES = ["Seminole Accountants Inc", "Glatthorn & Company P.A.", "Old Ledger Bookkeeping LLC", "H&R Block",
+         "Pasadena Pizza", "Bayside Law Group", "Sunrise Dental Associates", "Starbucks", "Gulf Coast Gifts"]
+ADDRESSES = ["123 Main St Suite 200", "45 Oak Ave Ste 3", "900 Bay Blvd #12", "1 Harbor Way", "77 Westchester Dr", "5 Pine Bldg C"]
+STATUSES = ["ACTIVE", "INACTIVE", "No Results Found", "Scrape Error"]
+
+
+def synthetic_call_list(rows, distinct=False, seed=0):
+    """
+    An enriched call list of `rows` rows drawn from a few realistic values. With
+    `distinct`, every name and address is made unique (the slowest case).
+    """
+    rng = np.random.default_rng(seed)
+    categories = [c for c in scoring.CATEGORY_SCORES if c != 'default'] + ['Florists']
+    df = pd.DataFrame({
+        'name': rng.choice(NAMES, rows),
+        'category': rng.choice(categories, rows),
+        'address': rng.choice(ADDRESSES, rows),
+        'owner_name': rng.choice(["", "Jane Doe", "John Smith, Ann Lee"], rows),
+        'sunbiz_status': rng.choice(STATUSES, rows),
+    })
+    if distinct:
+        df['name'] = df['name'] + ' ' + df.index.astype(str)
+        df['address'] = df.index.astype(str) + ' ' + df['address']
+    return df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time offline re-scoring of a large synthetic call list.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--distinct', action='store_true', help="Make every name and address unique.")
+    args = parser.parse_args()
+
+    df = synthetic_call_list(args.rows, args.distinct)
+    print(f"Re-scoring {len(df)} synthetic rows{' (all distinct)' if args.distinct else ''}\n")
+
+    start = time.perf_counter()
+    df_scored = scoring.prioritize(scoring.apply_scores(df))
+    default_seconds = time.perf_counter() - start
+    print(f"{'default weights':<18} {default_seconds:6.3f}s")
+
+    start = time.perf_counter()
+    df_rescored = scoring.prioritize(scoring.apply_scores(df, name_keywords={**scoring.NAME_KEYWORDS, 'group': 25}, owner_found_score=60))
+    print(f"{'new weights':<18} {time.perf_counter() - start:6.3f}s")
+
+    print("\nMean score per component:")
+    print(df_scored[scoring.SCORE_COMPONENTS + ['ai_score']].mean().round(1).to_string())
@@ -0,0 +1,80 @@
+import argparse
+import glob
+import os
+import tempfile
+import time
+from lxml import html as lxml_html
+import scraper
+from utils.driver_pool import launch_chrome
+from utils.fixture_server import FixtureServer, YELLOWPAGES_FIXTURES
+
+# --- Configuration ---
+DEFAULT_CARDS = 30 # A full Yellow Pages result page
+DEFAULT_ITERATIONS = 20
+
+
+def build_results_page(cards):
+    """A result page with `cards` v-cards, cycling through the saved fixture listings."""
+    listings = []
+    for path in sorted(glob.glob(os.path.join(YELLOWPAGES_FIXTURES, 'results', '[!_]*.html'))):
+        listings += lxml_html.parse(path).getroot().xpath('//div[@class="result"]')
+    page = lxml_html.parse(os.path.join(YELLOWPAGES_FIXTURES, 'results', 'accountants-1.html')).getroot()
+    container = page.xpath('//div[contains(@class, "search-results")]')[0]
+    for child in list(container):
+        container.remove(child)
+    for i in range(cards):
+        container.append(lxml_html.fromstring(lxml_html.tostring(listings[i % len(listings)])))
+    return lxml_html.tostring(page, doctype='<!DOCTYPE html>')
+
+
+def count_commands(driver):
+    """Wraps driver.execute (every WebDriver command goes through it) and returns the counter dict."""
+    counter = {'commands': 0}
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter['commands'] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def bench_mode(driver, counter, extraction, iterations):
+    """Returns (rows, commands per page, seconds per page) for one extraction mode."""
+    counter['commands'] = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rows = scraper.scrape_page(driver, extraction)
+    seconds = time.perf_counter() - start
+    return rows, counter['commands'] / iterations, seconds / iterations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare WebDriver round trips and latency of the scrape_page extraction modes.")
+    parser.add_argument('--cards', type=int, default=DEFAULT_CARDS, help="v-cards on the benchmark page.")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, 'index.html'), 'wb') as f:
+            f.write(build_results_page(args.cards))
+
+        with FixtureServer(root) as server:
+            driver = launch_chrome()
+            try:
+                driver.get(server.url('/'))
+                counter = count_commands(driver)
+                print(f"Benchmarking a page with {args.cards} cards, {args.iterations} iterations per mode\n")
+
+                results = {}
+                for extraction in scraper.EXTRACTION_MODES:
+                    rows, commands, seconds = bench_mode(driver, counter, extraction, args.iterations)
+                    results[extraction] = rows
+                    print(f"{extraction:<10} {len(rows):>4} rows  {commands:7.1f} commands/page  {seconds * 1000:8.1f} ms/page")
+            finally:
+                driver.quit()
+
+    baseline = results.get('elements')
+    same = all(rows == baseline for rows in results.values())
+    print("\nAll modes returned identical rows." if same else "\nModes returned different rows!")
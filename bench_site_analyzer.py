@@ -0,0 +1,73 @@
+import argparse
+import os
+import time
+import site_analyzer
+from utils.async_crawler import AsyncSiteCrawler, SITE_CONCURRENCY
+from utils.fixture_server import FixtureServer, SITES_FIXTURES
+from utils.pacing import Pacer
+
+# --- Configuration ---
+DEFAULT_REPEAT = 20 # Copies of each fixture site to crawl
+DEFAULT_LATENCY = 0.1 # Seconds added to every response to imitate a real network
+
+
+def fixture_site_urls(server, repeat):
+    """One URL per fixture site per repeat; the query string keeps the copies distinct."""
+    sites = sorted(d for d in os.listdir(SITES_FIXTURES) if os.path.isdir(os.path.join(SITES_FIXTURES, d)))
+    return [server.url(f"/{site}/?copy={n}") for n in range(repeat) for site in sites]
+
+
+def bench_http(urls):
+    """Runs the async crawler plus extraction over every URL. Returns (seconds, sites that still need Chrome)."""
+    needs_browser = []
+
+    def on_result(url, crawl):
+        if crawl.needs_browser:
+            needs_browser.append(url)
+        elif crawl.pages:
+            site_analyzer.extract_site_data(crawl.pages)
+
+    # Every fixture site lives on the same host, so lift the per-host cap to the site cap.
+    crawler = AsyncSiteCrawler(site_analyzer.filter_internal_links, max_subpages=site_analyzer.MAX_SUBPAGES,
+                               per_host=SITE_CONCURRENCY)
+    start = time.perf_counter()
+    crawler.crawl(urls, on_result)
+    return time.perf_counter() - start, needs_browser
+
+
+def bench_chrome(urls):
+    """Runs the original analyze_website over every URL in one headless Chrome. Returns seconds."""
+    driver = site_analyzer.launch_driver()
+    pacer = Pacer('chrome') # No rate limit: every fixture site is on localhost
+    try:
+        start = time.perf_counter()
+        for url in urls:
+            site_analyzer.analyze_website(driver, url, pacer)
+        pacer.report()
+        return time.perf_counter() - start
+    finally:
+        driver.quit()
+
+
+def report(backend, sites, seconds):
+    print(f"{backend:<20} {sites:>6} sites in {seconds:7.1f}s  ->  {sites / seconds * 60:8.1f} sites/minute")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare sites-per-minute of the Chrome and HTTP site analyzer backends.")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Copies of each fixture site to crawl.")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY, help="Seconds of artificial latency per response.")
+    parser.add_argument('--backends', nargs='+', choices=site_analyzer.BACKENDS, default=site_analyzer.BACKENDS)
+    args = parser.parse_args()
+
+    with FixtureServer(SITES_FIXTURES, delay=args.latency) as server:
+        urls = fixture_site_urls(server, args.repeat)
+        print(f"Benchmarking {len(urls)} fixture sites with {args.latency:.2f}s latency per response\n")
+
+        if 'http' in args.backends:
+            seconds, needs_browser = bench_http(urls)
+            report('http', len(urls), seconds)
+            if needs_browser:
+                print(f"{'':<20} ({len(needs_browser)} JS-rendered sites would go to Chrome)")
+        if 'chrome' in args.backends:
+            report('chrome', len(urls), bench_chrome(urls))
@@ -0,0 +1,107 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from bench_entity_resolution import synthetic_businesses
+from utils.scoring import SCORE_COMPONENTS
+from utils.table_io import read_table, write_table
+
+# --- Configuration ---
+DEFAULT_ROWS = 50_000
+REPEATS = 3 # Best of this many saves and loads per file
+LOCALITIES = ["Clearwater, FL", "Largo, FL", "Seminole, FL", "Dunedin, FL", "Pinellas Park, FL", "St. Petersburg, FL",
+              "Palm Harbor, FL", "Tarpon Springs, FL", "Oldsmar, FL", "Safety Harbor, FL"]
+CATEGORIES = ["Accountants", "Lawyers", "Plumbers", "Electricians", "Dentists", "Landscaping", "Roofing Contractors",
+              "Insurance", "Real Estate Agents", "Restaurants"]
+SUNBIZ_STATUSES = ["ACTIVE", "INACTIVE", "NOT FOUND", ""]
+# Each stage's output: the file it used to be (CSV, or XLSX for the call list) and the columns it carries
+CRAWL_COLUMNS = ['name', 'phone', 'address', 'locality', 'category', 'website', 'detail_url', 'listing_id']
+SCORED_COLUMNS = ['call_day', 'ai_score', 'sunbiz_status', 'status', 'notes', 'name', 'owner_name', 'phone', 'category',
+                  'address', 'locality', 'website', 'detail_url', 'listing_id', 'is_chain', 'excluded', 'exclusion_reason',
+                  'sunbiz_path', 'sunbiz_seconds'] + SCORE_COMPONENTS
+STAGES = [
+    ('businesses', 'csv', CRAWL_COLUMNS),
+    ('prioritized_call_list', 'xlsx', SCORED_COLUMNS),
+    ('enriched_businesses', 'csv', SCORED_COLUMNS),
+    ('final_call_list', 'csv', SCORED_COLUMNS + ['cluster_id']),
+    ('fully_enriched_call_list', 'csv', SCORED_COLUMNS + ['cluster_id', 'emails', 'tech_stack', 'social_links', 'contacts']),
+]
+
+
+def synthetic_pipeline_table(rows, seed=0):
+    """`rows` listings with every column the pipeline carries, filled with plausible values."""
+    rng = np.random.default_rng(seed)
+    df, _ = synthetic_businesses(rows, seed=seed)
+    slug = df['name'].str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True).str.strip('-')
+    has_site = rng.random(rows) < 0.6
+    df['locality'] = rng.choice(LOCALITIES, rows)
+    df['category'] = rng.choice(CATEGORIES, rows)
+    df['website'] = np.where(has_site, 'https://www.' + slug + '.com', None)
+    df['detail_url'] = 'https://www.yellowpages.com/clearwater-fl/mip/' + slug + '-' + pd.Series(np.arange(rows)).astype(str)
+    df['listing_id'] = pd.Series(rng.integers(10**8, 10**9, rows)).astype(str)
+    df['sunbiz_status'] = rng.choice(SUNBIZ_STATUSES, rows, p=[0.7, 0.1, 0.15, 0.05])
+    df['owner_name'] = np.where(df['sunbiz_status'] == 'ACTIVE', df['name'].str.split().str[-2].str.upper() + ', JOHN', '')
+    df['status'] = ''
+    df['notes'] = ''
+    df['is_chain'] = rng.random(rows) < 0.05
+    df['excluded'] = rng.random(rows) < 0.1
+    df['exclusion_reason'] = np.where(df['excluded'], 'chain or franchise', '')
+    df['sunbiz_path'] = rng.choice(['search', 'cache', 'skipped'], rows)
+    df['sunbiz_seconds'] = rng.gamma(2.0, 1.5, rows).round(2)
+    for component in SCORE_COMPONENTS:
+        df[component] = rng.choice([0, 10, 20, 40, -50], rows)
+    df['ai_score'] = df[SCORE_COMPONENTS].sum(axis=1)
+    df['call_day'] = rng.integers(1, 6, rows)
+    df['cluster_id'] = np.arange(rows)
+    df['emails'] = np.where(has_site, 'info@' + slug + '.com', 'N/A')
+    df['tech_stack'] = np.where(has_site, rng.choice(['WordPress', 'Wix', 'Squarespace, Google Analytics', 'N/A'], rows), 'N/A')
+    df['social_links'] = np.where(has_site, 'facebook.com/' + slug, 'N/A')
+    df['contacts'] = np.where(has_site & (rng.random(rows) < 0.3), 'Owner: ' + df['owner_name'], 'N/A')
+    return df
+
+
+def best_seconds(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_stage(df, path, repeats):
+    """(save seconds, load seconds, file MB) for one stage file."""
+    save = best_seconds(lambda: write_table(df, path), repeats)
+    load = best_seconds(lambda: read_table(path), repeats)
+    return save, load, os.path.getsize(path) / 2**20
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare save and load times of every stage file as CSV/XLSX and as Parquet.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--no-xlsx', action='store_true', help="Skip XLSX, which is by far the slowest to write.")
+    args = parser.parse_args()
+
+    table = synthetic_pipeline_table(args.rows)
+    print(f"Benchmarking {len(table)} rows per stage, best of {args.repeats}\n")
+    directory = tempfile.mkdtemp(prefix='bench_table_io_')
+    totals = {'old': [0.0, 0.0], 'parquet': [0.0, 0.0]}
+    try:
+        print(f"{'stage':<26} {'format':<8} {'save s':>8} {'load s':>8} {'MB':>8}")
+        for stage, old_format, columns in STAGES:
+            df = table[columns]
+            formats = [old_format, 'parquet'] if not (args.no_xlsx and old_format == 'xlsx') else ['parquet']
+            for file_format in formats:
+                save, load, size = bench_stage(df, os.path.join(directory, f"{stage}.{file_format}"), args.repeats)
+                total = totals['parquet' if file_format == 'parquet' else 'old']
+                total[0] += save
+                total[1] += load
+                print(f"{stage:<26} {file_format:<8} {save:>8.2f} {load:>8.2f} {size:>8.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{'all stages':<26} {'csv/xlsx':<8} {totals['old'][0]:>8.2f} {totals['old'][1]:>8.2f}")
+    print(f"{'all stages':<26} {'parquet':<8} {totals['parquet'][0]:>8.2f} {totals['parquet'][1]:>8.2f}")
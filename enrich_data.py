@@ -1,65 +1,174 @@
 import pandas as pd
+import argparse
 import time
-import undetected_chromedriver as uc
+from contextlib import nullcontext
+from functools import partial
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from urllib.parse import quote_plus
+from utils.exclusions import ExclusionIndex, report_avoided
+from utils.rate_limit import HostRateLimiter
+from utils.pacing import Pacer
+from utils.listing_parser import parse_card_website, parse_first_listing_url, parse_website
+from utils.page_archive import ArchiveMiss, ARCHIVE_DIR, open_archive
+from utils.driver_pool import DriverPool, count_navigation, launch_chrome
+from utils.resource_blocking import DEFAULT_PROFILE, PageWeights, blocked_url_patterns
+from utils.table_io import read_table, write_table
+from utils.business_store import BusinessStore, report_skipped
 
 # --- Configuration ---
-INPUT_FILE = 'prioritized_call_list.xlsx'
-OUTPUT_CSV = 'enriched_businesses.csv'
+INPUT_FILE = 'prioritized_call_list.parquet'
+OUTPUT_FILE = 'enriched_businesses.parquet'
 BASE_SEARCH_URL = "https://www.yellowpages.com/search?search_terms={search_term}&geo_location_terms={location}"
 TEST_MODE = False # Set to False to run on the full list
 TEST_LIMIT = 5 # Number of records to process in test mode
+RATE_LIMIT = 1.0 # Yellow Pages searches per second
+ARCHIVE_STAGE = 'enrich_data' # How this script's pages are filed in the page archive
+RESULT_CARD_XPATH = "./ancestor::div[contains(concat(' ', normalize-space(@class), ' '), ' result ')][1]"
+BLOCKING_PROFILE = DEFAULT_PROFILE # Resource types Chrome never loads: only text and hrefs are read here
+UNSETTLED_PATHS = ['error', 'not archived'] # Lookups that found nothing either way; not stored, so they're tried again
 
-def setup_driver():
-    """Sets up the undetected_chromedriver."""
-    print("Setting up Selenium WebDriver...")
-    options = uc.ChromeOptions()
-    # options.add_argument('--headless')
-    driver = uc.Chrome(options=options, use_subprocess=True)
-    return driver
-
-def find_website(driver, business_name, location):
-    """Performs a targeted search on Yellow Pages to find the business website."""
-    search_term = quote_plus(business_name)
-    location_term = quote_plus(location)
-    search_url = BASE_SEARCH_URL.format(search_term=search_term, location=location_term)
+def build_search_url(business_name, location):
+    location = location if pd.notna(location) else '' # Rows without a locality search everywhere
+    return BASE_SEARCH_URL.format(search_term=quote_plus(str(business_name)), location=quote_plus(str(location)))
+
+def find_website(driver, business_name, location, pacer, archive=None, weights=None):
+    """
+    Performs a targeted search on Yellow Pages to find the business website.
+    Reads the website straight off the first result card when the card has
+    one, and only clicks into the details page when it doesn't.
+    Returns (website, path) with path 'card', 'details', 'not found' or 'error'.
+    """
+    search_url = build_search_url(business_name, location)
     
+    pacer.throttle(search_url)
     driver.get(search_url)
     wait = WebDriverWait(driver, 10)
 
     try:
-        # Step 1: Find the first business listing link and click it
+        # Step 1: Find the first business listing
         print(f" - Searching for '{business_name}'...")
-        first_listing = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'div.result a.business-name')))
+        with pacer.waiting('readiness'):
+            first_listing = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'div.result a.business-name')))
+        detail_url = first_listing.get_attribute('href')
+        if weights is not None:
+            weights.measure(driver)
+        if archive is not None:
+            archive.put(ARCHIVE_STAGE, search_url, driver.page_source, driver.current_url)
+
+        # Fast path: the result card often links the website already
+        card = first_listing.find_element(By.XPATH, RESULT_CARD_XPATH)
+        card_links = card.find_elements(By.CSS_SELECTOR, 'a.track-visit-website')
+        if card_links and card_links[0].get_attribute('href'):
+            website = card_links[0].get_attribute('href')
+            print(f" - Found website on the result card: {website}")
+            return website, 'card'
+
+        # Step 2: On the details page, find the website link
         print(f" - Clicking into details for '{business_name}'...")
         first_listing.click()
-        
-        # Step 2: On the details page, find the website link
+        count_navigation(driver)
         print(f" - Looking for website link on details page...")
-        website_link = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.track-visit-website')))
+        with pacer.waiting('readiness'):
+            website_link = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.track-visit-website')))
+        if weights is not None:
+            weights.measure(driver)
+        if archive is not None:
+            archive.put(ARCHIVE_STAGE, detail_url, driver.page_source, driver.current_url)
         website = website_link.get_attribute('href')
         print(f" - Found website: {website}")
-        return website
+        return website, 'details'
     except (NoSuchElementException, TimeoutException):
         print(f" - Could not find website for {business_name} after clicking into details.")
-        return 'N/A'
+        return 'N/A', 'not found'
+    except Exception as e:
+        print(f" - An unexpected error occurred while processing {business_name}: {e}")
+        return 'N/A', 'error'
+
+def find_website_on_details(driver, business_name, detail_url, pacer, archive=None, weights=None):
+    """
+    Opens a listing's details page straight from the detail_url the scraper
+    recorded, skipping the search. Returns (website, path) like find_website.
+    """
+    try:
+        print(f" - Opening details for '{business_name}'...")
+        pacer.throttle(detail_url)
+        driver.get(detail_url)
+        pacer.page_ready(driver)
+        if weights is not None:
+            weights.measure(driver)
+        if archive is not None:
+            archive.put(ARCHIVE_STAGE, detail_url, driver.page_source, driver.current_url)
+        links = driver.find_elements(By.CSS_SELECTOR, 'a.track-visit-website')
+        website = links[0].get_attribute('href') if links else None
+        if not website:
+            print(f" - No website listed for {business_name}.")
+            return 'N/A', 'not found'
+        print(f" - Found website: {website}")
+        return website, 'detail url'
     except Exception as e:
         print(f" - An unexpected error occurred while processing {business_name}: {e}")
-        return 'N/A'
+        return 'N/A', 'error'
+
+def find_website_replay(archive, business_name, location, detail_url=None):
+    """find_website (or find_website_on_details) re-run over the page archive: the same pages, parsed with lxml and no network."""
+    try:
+        if has_url(detail_url):
+            detail_url, detail_html = archive.fetch(detail_url, ARCHIVE_STAGE)
+            website = parse_website(detail_html, detail_url)
+            return (website, 'detail url') if website else ('N/A', 'not found')
+        search_url, search_html = archive.fetch(build_search_url(business_name, location), ARCHIVE_STAGE)
+        website = parse_card_website(search_html, search_url)
+        if website:
+            return website, 'card'
+        detail_url = parse_first_listing_url(search_html, search_url)
+        if detail_url is None:
+            return 'N/A', 'not found'
+        detail_url, detail_html = archive.fetch(detail_url, ARCHIVE_STAGE)
+        website = parse_website(detail_html, detail_url)
+        return (website, 'details') if website else ('N/A', 'not found')
+    except ArchiveMiss:
+        return 'N/A (Not Archived)', 'not archived'
+
+def has_url(value):
+    """True for an http(s) URL; False for NaN, blanks and the 'N/A ...' placeholders."""
+    return isinstance(value, str) and value.startswith('http')
+
+def report_paths(paths):
+    """Prints how many websites each path produced, so the card fast path's hit rate is visible."""
+    counts = {}
+    for path in paths:
+        counts[path] = counts.get(path, 0) + 1
+    total = max(len(paths), 1)
+    print("Website lookups: " + (', '.join(f"{path} {count} ({100 * count / total:.0f}%)"
+                                            for path, count in sorted(counts.items(), key=lambda item: -item[1])) or 'none'))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find each business's website on Yellow Pages.")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help="Page archive every fetched page is saved to.")
+    parser.add_argument('--no-archive', action='store_true', help="Don't keep the fetched HTML.")
+    parser.add_argument('--replay', action='store_true',
+                        help="No browser or network: re-extract every website from the page archive.")
+    parser.add_argument('--no-blocking', action='store_true',
+                        help="Let Chrome load images, media, fonts and trackers (to compare page weight with the blocking profile).")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Look every business up again, even ones unchanged since their website was stored.")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    started = time.time()
+    archive = open_archive(args.archive_dir, enabled=args.replay or not args.no_archive)
     print(f"Reading businesses from {INPUT_FILE}...")
     try:
-        df = pd.read_excel(INPUT_FILE)
+        df = read_table(INPUT_FILE)
     except FileNotFoundError:
         print(f"Error: The input file '{INPUT_FILE}' was not found.")
         return
     except Exception as e:
-        print(f"Error reading Excel file: {e}")
+        print(f"Error reading '{INPUT_FILE}': {e}")
         return
 
     # Trim the dataframe if in test mode
@@ -68,31 +177,76 @@ def main():
         df = df.head(TEST_LIMIT)
 
     # Assume columns are named 'name' and 'locality' or similar.
-    # Adjust these if the column names in your Excel file are different.
+    # Adjust these if the column names in your input file are different.
     if 'name' not in df.columns or 'locality' not in df.columns:
         print("Error: Input file must contain 'name' and 'locality' columns.")
         print(f"Found columns: {df.columns.tolist()}")
         return
 
-    driver = setup_driver()
-    websites = []
+    # Chains and other excluded businesses never get a Yellow Pages lookup
+    excluded = ExclusionIndex.load().classify(df)['excluded']
+    report_avoided('Yellow Pages website', int(excluded.sum()))
+
+    # Websites the crawl already read off the result cards need no lookup at all
+    known = df['website'].map(has_url) if 'website' in df.columns else pd.Series(False, index=df.index)
+    print(f"Website already known from the crawl for {int((known & ~excluded).sum())} businesses.")
+    # Nor do businesses whose listing hasn't changed since their website was stored
+    store = None if args.replay or args.no_store or not BusinessStore.usable(df) else BusinessStore()
+    reused = pd.Series(False, index=df.index)
+    if store is not None:
+        reused = store.fresh(df, 'websites') & ~excluded & ~known
+        store.carry_forward(df, 'websites', reused)
+        report_skipped('Yellow Pages website', int(reused.sum()), int((~excluded & ~known).sum()))
+    pending = ~excluded & ~known & ~reused
+    print(f"Looking up websites for the remaining {int(pending.sum())} businesses.")
+
+    # One browser, launching in the background while the list is read; recycled as it ages
+    profile = [] if args.no_blocking else BLOCKING_PROFILE
+    weights = PageWeights('enrich_data', profile)
+    pool = None if args.replay or not pending.any() else DriverPool(
+        partial(launch_chrome, blocked_urls=blocked_url_patterns(profile)), name='enrich_data browser')
+    pacer = Pacer('enrich_data', HostRateLimiter(RATE_LIMIT))
+    websites = {index: 'N/A (Excluded)' for index in df.index[excluded.to_numpy()]}
+    if known.any():
+        websites.update(df.loc[known & ~excluded, 'website'].to_dict())
+    if reused.any():
+        websites.update(df.loc[reused, 'website'].to_dict())
+    paths = {}
     
     print("Starting data enrichment process...")
-    for index, row in df.iterrows():
-        business_name = row['name']
-        location = row['locality']
-        print(f"Processing ({index + 1}/{len(df)}): {business_name}...")
-        
-        website = find_website(driver, business_name, location)
-        websites.append(website)
-        time.sleep(1) # Small delay between requests
-
-    driver.quit()
-
-    df['website'] = websites
-    df.to_csv(OUTPUT_CSV, index=False)
+    # Batched by locality, searching one area back to back. The browser is acquired per business,
+    # so the pool can recycle it (by page loads or memory) in the middle of a large locality.
+    batches = df[pending].groupby('locality', sort=False, dropna=False, observed=True)
+    for locality, batch in batches:
+        print(f"--- {locality}: {len(batch)} businesses ---")
+        for index, row in batch.iterrows():
+            business_name = row['name']
+            detail_url = row.get('detail_url')
+            print(f"Processing ({index + 1}/{len(df)}): {business_name}...")
+            with (nullcontext() if args.replay else pool.driver()) as driver:
+                if args.replay:
+                    websites[index], path = find_website_replay(archive, business_name, locality, detail_url)
+                elif has_url(detail_url):
+                    websites[index], path = find_website_on_details(driver, business_name, detail_url, pacer, archive, weights)
+                else:
+                    websites[index], path = find_website(driver, business_name, locality, pacer, archive, weights)
+            paths[index] = path
+    report_paths(list(paths.values()))
+
+    if pool is not None:
+        pool.close()
+        pacer.report()
+        weights.report()
+        if archive is not None:
+            archive.report(ARCHIVE_STAGE, started)
+
+    df['website'] = pd.Series(websites)
+    if store is not None:
+        store.update(df, 'websites', df.index.isin([index for index, path in paths.items() if path not in UNSETTLED_PATHS]))
+        store.save()
+    write_table(df, OUTPUT_FILE)
     
-    print(f"\nEnrichment complete. Saved {len(df)} businesses with website information to {OUTPUT_CSV}")
+    print(f"\nEnrichment complete. Saved {len(df)} businesses with website information to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,52 +1,55 @@
-import pandas as pd
 import sys
+from utils.entity_resolution import EntityResolver
+from utils.table_io import read_table, write_table
 
 # --- Configuration ---
 INPUT_FILE = 'sorted_businesses_for_review.csv'
-OUTPUT_FILE = 'final_call_list.csv'
+OUTPUT_FILE = 'final_call_list.parquet'
 
 def finalize_business_list(input_path, output_path):
     """
-    Reads a manually cleaned CSV, de-duplicates it,
-    handles multi-location businesses by keeping the highest-scored one,
-    sorts by AI score, and saves the final, ready-to-use call list.
+    Reads a manually cleaned CSV, groups duplicate and near-duplicate
+    listings into businesses (cluster_id), keeps the highest-scored
+    listing of each, sorts by AI score, and saves the final call list.
     """
     try:
         print(f"Reading manually cleaned data from '{input_path}'...")
-        df = pd.read_csv(input_path)
+        df = read_table(input_path)
     except FileNotFoundError:
         print(f"Error: The input file '{input_path}' was not found.")
         print("Please make sure you have saved the reviewed file.")
         sys.exit(1)
     except Exception as e:
-        print(f"An error occurred while reading the CSV: {e}")
+        print(f"An error occurred while reading '{input_path}': {e}")
         sys.exit(1)
 
     print(f"Starting with {len(df)} businesses after manual review.")
 
-    # --- Step 1: Handle Straight Duplicates ---
-    # Drop exact duplicates based on name and phone number first.
-    df.drop_duplicates(subset=['name', 'phone'], inplace=True)
-    print(f"List reduced to {len(df)} after removing straight duplicates.")
+    # --- Step 1: Entity Resolution ---
+    # Rows that are the same business get the same cluster_id: exact duplicates,
+    # multi-location listings of one name, and near-duplicates such as
+    # "Seminole Accountants Inc" vs "Seminole Accountants, Inc.".
+    resolver = EntityResolver()
+    df['cluster_id'] = resolver.cluster(df)
+    resolver.report()
 
-    # --- Step 2: Handle Multi-Location Businesses (Keep Highest Score) ---
+    # --- Step 2: Keep the Highest-Scored Listing of Each Business ---
     # First, sort the entire dataframe by 'ai_score' in descending order.
-    df_sorted = df.sort_values(by='ai_score', ascending=False)
+    df_sorted = df.sort_values(by='ai_score', ascending=False, kind='stable')
     
-    # Now, drop duplicates based on just the 'name' column. Because the list is
-    # already sorted by score, the `keep='first'` argument will automatically
-    # preserve the entry with the highest score for each business name.
-    df_final = df_sorted.drop_duplicates(subset=['name'], keep='first')
-    print(f"List reduced to {len(df_final)} after consolidating multi-location businesses.")
+    # Because the list is already sorted by score, `keep='first'` preserves the
+    # entry with the highest score for each business.
+    df_final = df_sorted.drop_duplicates(subset=['cluster_id'], keep='first')
+    print(f"List reduced to {len(df_final)} after consolidating duplicate, near-duplicate and multi-location listings.")
 
     # --- Step 3: Final Sort & Save ---
     # The list is already sorted, so we can just save it.
     try:
         print(f"Saving the final, cleaned call list to '{output_path}'...")
-        df_final.to_csv(output_path, index=False)
+        write_table(df_final, output_path)
         print(f"Success! Your final call list with {len(df_final)} businesses is ready in '{output_path}'.")
     except Exception as e:
-        print(f"An error occurred while saving the final CSV: {e}")
+        print(f"An error occurred while saving the final call list: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,24 +1,24 @@
-import pandas as pd
 import sys
+from utils.table_io import read_table, write_table
 
 # --- Configuration ---
-INPUT_FILE = 'enriched_businesses.csv'
-OUTPUT_FILE = 'sorted_businesses_for_review.csv'
+INPUT_FILE = 'enriched_businesses.parquet'
+OUTPUT_FILE = 'sorted_businesses_for_review.csv' # CSV: this one is opened and edited by hand
 
 def sort_and_save_csv(input_path, output_path):
     """
-    Reads a CSV, sorts it alphabetically by the 'name' column,
-    and saves it to a new file.
+    Reads the enriched list, sorts it alphabetically by the 'name' column,
+    and saves it to a new file for manual review.
     """
     try:
         print(f"Reading data from '{input_path}'...")
-        df = pd.read_csv(input_path)
+        df = read_table(input_path)
     except FileNotFoundError:
         print(f"Error: The input file '{input_path}' was not found.")
         print("Please make sure the enrichment script has been run and the file exists.")
         sys.exit(1)
     except Exception as e:
-        print(f"An error occurred while reading the CSV: {e}")
+        print(f"An error occurred while reading '{input_path}': {e}")
         sys.exit(1)
 
     # Ensure the 'name' column exists
@@ -31,7 +31,7 @@ def sort_and_save_csv(input_path, output_path):
 
     try:
         print(f"Saving sorted data to '{output_path}'...")
-        df_sorted.to_csv(output_path, index=False)
+        write_table(df_sorted, output_path)
         print("Done. The file is ready for your manual review.")
     except Exception as e:
         print(f"An error occurred while saving the new CSV: {e}")
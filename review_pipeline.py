@@ -0,0 +1,158 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+from utils.entity_resolution import EntityResolver
+from utils.external_sort import SortedRuns
+from utils.step_timer import StepTimer
+from utils.table_io import TableWriter, iter_table, read_table, table_columns, write_table
+
+# --- Configuration ---
+INPUT_FILE = 'enriched_businesses.parquet'
+REVIEW_FILE = 'sorted_businesses_for_review.csv' # CSV: this one is opened and edited by hand
+OUTPUT_FILE = 'final_call_list.parquet'
+KEY_COLUMNS = ['name', 'phone', 'address'] # All entity resolution needs from each row
+LAST_NAME = '\U0010ffff' # Sorts after every real name, so blank names go last like sort_values puts NaN
+HELPER_COLUMNS = ['_row', '_name', '_seq', '_cluster', '_rank']
+
+
+def check_columns(columns, input_path):
+    missing = [column for column in ('name', 'ai_score') if column not in columns]
+    if missing:
+        print(f"Error: The required column(s) {missing} were not found in '{input_path}'.")
+        sys.exit(1)
+
+
+def run_in_memory(input_path, review_path, output_path, steps):
+    """
+    organize_for_review and finalize_list in one pass over one DataFrame: the
+    name-sorted review file and the final call list, with no file read twice.
+    """
+    with steps.step('read'):
+        df = read_table(input_path)
+        check_columns(df.columns, input_path)
+        print(f"Read {len(df)} businesses from '{input_path}'.")
+
+    with steps.step('sort for review'):
+        review = df.sort_values(by='name', kind='stable')
+        write_table(review, review_path)
+
+    with steps.step('entity resolution'):
+        resolver = EntityResolver()
+        df['cluster_id'] = resolver.cluster(df)
+        resolver.report()
+
+    with steps.step('finalize'):
+        # Highest score first; ties keep review (name) order, as finalize_list does on the review file
+        ranked = df.loc[review.index].sort_values(by='ai_score', ascending=False, kind='stable')
+        df_final = ranked.drop_duplicates(subset=['cluster_id'], keep='first')
+        write_table(df_final, output_path)
+    return len(df), len(df_final)
+
+
+def without_helpers(block):
+    return block.drop(columns=[column for column in HELPER_COLUMNS if column in block.columns])
+
+
+def run_chunked(input_path, review_path, output_path, steps, chunk_rows, temp_dir=None):
+    """
+    The same outputs as run_in_memory with memory bounded by `chunk_rows`: the
+    input is parsed once, in chunks that are sorted and spilled to disk, then
+    merged back in name order (the review file) while the best listing of each
+    business is tracked in two arrays; the winners are external-sorted by score.
+    Only the name, phone and address columns are ever held for every row.
+    """
+    block_rows = max(1_000, chunk_rows // 10)
+    with SortedRuns('_name', '_row', temp_dir, block_rows) as by_name, SortedRuns('_rank', '_seq', temp_dir, block_rows) as by_score:
+        keys = []
+        with steps.step('read and spill sorted runs'):
+            rows = 0
+            for chunk in iter_table(input_path, chunk_rows):
+                check_columns(chunk.columns, input_path)
+                chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+                keys.append(chunk[[column for column in KEY_COLUMNS if column in chunk.columns]])
+                chunk['_row'] = chunk.index
+                chunk['_name'] = chunk['name'].fillna(LAST_NAME).astype(str)
+                by_name.add(chunk)
+                rows += len(chunk)
+            print(f"Read {rows} businesses from '{input_path}' into {len(by_name.paths)} sorted runs.")
+
+        with steps.step('entity resolution'):
+            resolver = EntityResolver()
+            clusters = resolver.cluster(pd.concat(keys, ignore_index=True) if keys else pd.DataFrame(columns=KEY_COLUMNS)).to_numpy()
+            resolver.report()
+            del keys
+
+        with steps.step('merge for review'):
+            clusters_count = int(clusters.max()) + 1 if len(clusters) else 0
+            best_rank = np.full(clusters_count, np.inf)
+            best_seq = np.full(clusters_count, -1, dtype=np.int64)
+            pending, pending_rows, seq = [], 0, 0
+            review = TableWriter(review_path)
+            for block in by_name.merge():
+                review.write(without_helpers(block))
+                block = block.assign(_seq=np.arange(seq, seq + len(block)), _cluster=clusters[block['_row'].to_numpy()],
+                                     _rank=-pd.to_numeric(block['ai_score'], errors='coerce').astype(float).fillna(-np.inf))
+                seq += len(block)
+                # This block's best listing per business; it replaces the best so far only if strictly better,
+                # since every earlier block came first in review order
+                top = block.sort_values(['_rank', '_seq'], kind='stable').drop_duplicates('_cluster')
+                cluster, rank = top['_cluster'].to_numpy(), top['_rank'].to_numpy()
+                better = (best_seq[cluster] < 0) | (rank < best_rank[cluster])
+                best_rank[cluster[better]] = rank[better]
+                best_seq[cluster[better]] = top['_seq'].to_numpy()[better]
+                pending.append(top[better])
+                pending_rows += int(better.sum())
+                if pending_rows >= chunk_rows:
+                    by_score.add(pd.concat(pending))
+                    pending, pending_rows = [], 0
+            if pending:
+                by_score.add(pd.concat(pending))
+            review.close(columns=table_columns(input_path))
+
+        with steps.step('finalize'):
+            kept = 0
+            final = TableWriter(output_path)
+            for block in by_score.merge():
+                block = block[block['_seq'].to_numpy() == best_seq[block['_cluster'].to_numpy()]]
+                if block.empty:
+                    continue
+                final.write(without_helpers(block.assign(cluster_id=block['_cluster'])))
+                kept += len(block)
+            final.close(columns=table_columns(input_path) + ['cluster_id'])
+    return rows, kept
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Sort the enriched list for review and finalize the call list in one process "
+                    "(organize_for_review.py and finalize_list.py without the intermediate re-read).")
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--review', default=REVIEW_FILE, help="Name-sorted copy for manual review.")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="Final call list: best listing of each business, by AI score.")
+    parser.add_argument('--chunk-rows', type=int, default=0,
+                        help="Process the input this many rows at a time with an external sort (0 = all in memory).")
+    parser.add_argument('--temp-dir', help="Where the external sort spills its runs (defaults to the system temp dir).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.input):
+        print(f"Error: The input file '{args.input}' was not found.")
+        print("Please make sure the enrichment script has been run and the file exists.")
+        sys.exit(1)
+
+    steps = StepTimer('review pipeline')
+    if args.chunk_rows > 0:
+        rows, kept = run_chunked(args.input, args.review, args.output, steps, args.chunk_rows, args.temp_dir)
+    else:
+        rows, kept = run_in_memory(args.input, args.review, args.output, steps)
+    print(f"Saved {rows} businesses sorted for review to '{args.review}' and the final call list of {kept} "
+          f"businesses to '{args.output}'.")
+    steps.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+import time
+import pandas as pd
+from utils.step_timer import StepTimer, run_measured
+from utils.table_io import read_table
+
+# --- Configuration ---
+STATE_FILE = 'pipeline_state.json' # What each stage last ran with, to tell which stages are out of date
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+HASH_BLOCK = 1 << 20
+TABLE_EXTENSIONS = ('.parquet', '.csv', '.xlsx')
+# Columns that differ on every run without the data changing (timings, which cache answered);
+# left out of a table's hash so they don't make every later stage out of date.
+VOLATILE_COLUMNS = ['sunbiz_seconds', 'sunbiz_path']
+# The stages in run order. Inputs and outputs are the files named by each script's INPUT_FILE and
+# OUTPUT_FILE; a stage's code is its script plus every module of this repo that it imports.
+STAGES = [
+    {'name': 'crawl', 'script': 'scraper.py', 'inputs': [], 'outputs': ['businesses.parquet']},
+    {'name': 'sunbiz', 'script': 'utils/enrich_and_score.py', 'inputs': ['businesses.parquet', 'exclusions.json'],
+     'outputs': ['prioritized_call_list.parquet']},
+    {'name': 'websites', 'script': 'enrich_data.py', 'inputs': ['prioritized_call_list.parquet', 'exclusions.json'],
+     'outputs': ['enriched_businesses.parquet']},
+    {'name': 'review', 'script': 'organize_for_review.py', 'inputs': ['enriched_businesses.parquet'],
+     'outputs': ['sorted_businesses_for_review.csv']},
+    {'name': 'finalize', 'script': 'finalize_list.py', 'inputs': ['sorted_businesses_for_review.csv'],
+     'outputs': ['final_call_list.parquet']},
+    {'name': 'sites', 'script': 'site_analyzer.py', 'args': ['--from-input'],
+     'inputs': ['final_call_list.parquet', 'exclusions.json'], 'outputs': ['fully_enriched_call_list.parquet']},
+]
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, or None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def table_hash(path):
+    """
+    SHA-256 of a stage table's contents without its VOLATILE_COLUMNS, or None if
+    it doesn't exist. Compares what the table holds, not how it was written.
+    """
+    if not os.path.exists(path):
+        return None
+    df = read_table(path)
+    df = df.drop(columns=[column for column in VOLATILE_COLUMNS if column in df.columns])
+    digest = hashlib.sha256(json.dumps(list(df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def input_hash(path):
+    return table_hash(path) if path.endswith(TABLE_EXTENSIONS) else file_hash(path)
+
+
+def local_module(name):
+    """The repo file a module name refers to (utils.scoring -> utils/scoring.py), or None for anything else."""
+    base = os.path.join(REPO_DIR, *name.split('.'))
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def code_files(script):
+    """The script and every repo module it imports, directly or through other modules, relative to the repo."""
+    seen, pending = set(), [os.path.join(REPO_DIR, script)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            pending.extend(module for module in map(local_module, names) if module is not None)
+    return sorted(os.path.relpath(path, REPO_DIR) for path in seen)
+
+
+def fingerprint(stage):
+    """Everything a stage's outputs depend on: the hash of each code and input file, and its arguments."""
+    return {'code': {path: file_hash(os.path.join(REPO_DIR, path)) for path in code_files(stage['script'])},
+            'inputs': {path: input_hash(path) for path in stage['inputs']},
+            'args': stage.get('args', [])}
+
+
+def changed(old, new):
+    return sorted(key for key in set(old) | set(new) if old.get(key) != new.get(key))
+
+
+def stale_reason(stage, current, previous):
+    """Why a stage has to run, or None if its last run is still up to date."""
+    if previous is None:
+        return 'never run'
+    missing = [path for path in stage['outputs'] if not os.path.exists(path)]
+    if missing:
+        return f"{', '.join(missing)} missing"
+    code = changed(previous['fingerprint']['code'], current['code'])
+    if code:
+        return f"code changed ({', '.join(code)})"
+    inputs = changed(previous['fingerprint']['inputs'], current['inputs'])
+    if inputs:
+        return f"input changed ({', '.join(inputs)})"
+    if previous['fingerprint']['args'] != current['args']:
+        return 'arguments changed'
+    return None
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, path):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def run_stage(stage):
+    """
+    Runs a stage's script in a subprocess. Returns (error message, or None if it
+    wrote all of its outputs; the subprocess's peak RSS in MB, or None).
+    """
+    before = {path: os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in stage['outputs']}
+    command = [sys.executable, os.path.join(REPO_DIR, stage['script'])] + stage.get('args', [])
+    returncode, peak_mb = run_measured(command)
+    if returncode:
+        return f"{stage['script']} exited with status {returncode}", peak_mb
+    unwritten = [path for path in stage['outputs'] if not os.path.exists(path) or os.stat(path).st_mtime_ns == before[path]]
+    if unwritten:
+        return f"{stage['script']} didn't write {', '.join(unwritten)}", peak_mb
+    return None, peak_mb
+
+
+def select_stages(names, first=None, last=None):
+    start = names.index(first) if first else 0
+    end = names.index(last) + 1 if last else len(names)
+    return names[start:end]
+
+
+def parse_args():
+    names = [stage['name'] for stage in STAGES]
+    parser = argparse.ArgumentParser(
+        description="Run the pipeline (" + " -> ".join(names) + "), skipping every stage whose code and inputs "
+                    "haven't changed since its last successful run.")
+    parser.add_argument('--from', dest='first', choices=names, help="Start at this stage; earlier ones aren't checked.")
+    parser.add_argument('--until', dest='last', choices=names, help="Stop after this stage.")
+    parser.add_argument('--force', nargs='+', choices=names, default=[],
+                        help="Run these stages even if they're up to date (later stages still only run if their inputs change).")
+    parser.add_argument('--dry-run', action='store_true', help="Only print which stages are out of date and why.")
+    parser.add_argument('--state-file', default=STATE_FILE)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    state = load_state(args.state_file)
+    selected = select_stages([stage['name'] for stage in STAGES], args.first, args.last)
+    steps = StepTimer('pipeline')
+    skipped_seconds = 0.0
+    upstream = set() # Outputs a dry run would have rewritten
+
+    for stage in STAGES:
+        if stage['name'] not in selected:
+            continue
+        current = fingerprint(stage)
+        previous = state.get(stage['name'])
+        reason = 'forced' if stage['name'] in args.force else stale_reason(stage, current, previous)
+        if args.dry_run and reason is None and upstream & set(stage['inputs']):
+            reason = f"runs if {', '.join(sorted(upstream & set(stage['inputs'])))} changes"
+        if reason is None:
+            print(f"[pipeline] {stage['name']}: up to date (last run took {previous['seconds']:.1f}s)")
+            skipped_seconds += previous['seconds']
+            continue
+        print(f"[pipeline] {stage['name']}: {reason}")
+        if args.dry_run:
+            upstream.update(stage['outputs'])
+            continue
+
+        with steps.step(stage['name']) as measured:
+            error, measured['peak_mb'] = run_stage(stage)
+        if error:
+            print(f"[pipeline] {stage['name']} failed: {error}. Later stages were not run.")
+            if steps.steps:
+                steps.report()
+            sys.exit(1)
+        state[stage['name']] = {'fingerprint': current, 'seconds': steps.steps[-1][1],
+                                'finished': time.strftime('%Y-%m-%d %H:%M:%S')}
+        save_state(state, args.state_file)
+
+    if steps.steps:
+        steps.report()
+    if skipped_seconds:
+        print(f"[pipeline] Up-to-date stages skipped: {skipped_seconds:.1f}s of work not redone.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,35 @@
 import pandas as pd
+import argparse
+import multiprocessing
+import multiprocessing.util
 import time
-import undetected_chromedriver as uc
+from collections import deque
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from urllib.parse import urlparse
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from utils.exclusions import ExclusionIndex
+from utils.rate_limit import HostRateLimiter
+from utils.pacing import Pacer
+from utils.driver_pool import DriverPool, count_navigation, launch_chrome
+from utils.listing_parser import parse_listing_cards
+from utils.page_archive import PageArchive, ARCHIVE_DIR, open_archive
+from utils.table_io import write_table
 
 # --- Configuration ---
-OUTPUT_CSV = 'businesses.csv'
+OUTPUT_FILE = 'businesses.parquet'
 PAGES_TO_SCRAPE = 10  # Set how many pages to scrape for each category
 AREA_CODE_FILTER = '(727)'
+DEFAULT_WORKERS = 1 # Browser processes crawling categories side by side
+RATE_LIMIT = 0.5 # Page loads per second allowed against Yellow Pages, shared by all workers
+RATE_BURST = 2
+EXTRACTION_MODES = ['script', 'elements', 'snapshot'] # 'script': one execute_script; 'elements': a query per field; 'snapshot': parse page_source with lxml
+DEFAULT_EXTRACTION = 'script'
+PAGINATION_MODES = ['click', 'url'] # 'url' loads ?page=N directly, so pages of one category can load side by side
+DEFAULT_PAGINATION = 'click'
 
 CATEGORIES = [
     "Accountants", "Financial Advisors", "Bookkeeping Services", "Tax Return Preparation",
@@ -19,17 +39,53 @@ CATEGORIES = [
     "Landscaping", "Cleaning Services", "Security Services", "Business Consultants", "Photographers"
 ]
 BASE_URL = "https://www.yellowpages.com/pinellas-county-fl/"
+ARCHIVE_STAGE = 'scraper' # How this script's pages are filed in the page archive
+MP_CONTEXT = multiprocessing.get_context('spawn') # Don't fork a process that may be driving a browser
 
-def setup_driver():
-    """Sets up the undetected_chromedriver."""
-    print("Setting up Selenium WebDriver...")
-    options = uc.ChromeOptions()
-    # options.add_argument('--headless') # Run in headless mode if you don't need to see the browser
-    driver = uc.Chrome(options=options, use_subprocess=True)
-    return driver
+# Reads every card's fields in the browser and returns them in one round trip.
+# innerText matches what WebElement.text returns; href is already absolute; a missing element is null.
+CARD_SCRIPT = """
+const text = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : null;
+};
+const link = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element && element.getAttribute('href') ? element.href : null;
+};
+const listingId = card => {
+    const result = card.closest('div.result');
+    return card.dataset.ypid || (result && result.id.startsWith('lid-') ? result.id.slice(4) : null);
+};
+return Array.from(document.querySelectorAll('div.v-card'), card => ({
+    name: text(card, 'a.business-name span'),
+    phone: text(card, 'div.phones.phone.primary'),
+    street: text(card, 'div.street-address'),
+    locality: text(card, 'div.locality'),
+    category: text(card, 'div.categories a'),
+    website: link(card, 'a.track-visit-website'),
+    detail_url: link(card, 'a.business-name'),
+    listing_id: listingId(card)
+}));
+"""
+LISTING_COLUMNS = ['name', 'phone', 'address', 'locality', 'category', 'website', 'detail_url', 'listing_id']
 
-def scrape_page(driver):
-    """Scrapes all business listings from the current page."""
+def element_href(root, selector):
+    """The absolute href of the first element matching selector under root, or None."""
+    links = root.find_elements(By.CSS_SELECTOR, selector)
+    return (links[0].get_attribute('href') or None) if links else None
+
+def element_listing_id(listing):
+    """A card's listing ID: its data-ypid, else the 'lid-<id>' of the result around it."""
+    ypid = listing.get_attribute('data-ypid')
+    if ypid:
+        return ypid
+    results = listing.find_elements(By.XPATH, "./ancestor::div[contains(concat(' ', normalize-space(@class), ' '), ' result ')][1]")
+    result_id = results[0].get_attribute('id') if results else ''
+    return result_id[len('lid-'):] if result_id and result_id.startswith('lid-') else None
+
+def scrape_page_elements(driver):
+    """Scrapes all business listings from the current page, one WebDriver call per field."""
     results = []
     try:
         listings = driver.find_elements(By.CSS_SELECTOR, 'div.v-card')
@@ -47,68 +103,426 @@ def scrape_page(driver):
                 address = f"{street}, {locality}"
                 category_tags = listing.find_elements(By.CSS_SELECTOR, 'div.categories a')
                 category = category_tags[0].text if category_tags else 'N/A'
+                website = element_href(listing, 'a.track-visit-website')
+                detail_url = element_href(listing, 'a.business-name')
 
-                results.append([name, phone, address, locality, category])
+                results.append([name, phone, address, locality, category, website, detail_url, element_listing_id(listing)])
             except NoSuchElementException:
                 continue # Skip if a card is missing some info
     except Exception as e:
         print(f"An error occurred while scraping the page: {e}")
     return results
 
+def card_rows(cards):
+    """
+    Turns card dicts ({name, phone, street, locality, category, website,
+    detail_url, listing_id}, None for a missing element) into LISTING_COLUMNS
+    rows, with the same rules as the per-element path: cards missing a required
+    field are skipped, then AREA_CODE_FILTER.
+    """
+    results = []
+    for card in cards:
+        if any(card.get(field) is None for field in ('name', 'phone', 'street', 'locality')):
+            continue # Skip if a card is missing some info
+        if AREA_CODE_FILTER not in card['phone']:
+            continue
+        category = card['category'] if card.get('category') is not None else 'N/A'
+        results.append([card['name'], card['phone'], f"{card['street']}, {card['locality']}", card['locality'], category,
+                        card.get('website'), card.get('detail_url'), card.get('listing_id')])
+    return results
 
-def main():
-    driver = setup_driver()
-    wait = WebDriverWait(driver, 10)
-    all_businesses = []
-    
-    print("Starting the scraping process...")
-
-    for category in CATEGORIES:
-        print(f"\n--- Scraping Category: {category} ---")
-        url = f"{BASE_URL}{category.replace(' ', '-')}"
+def scrape_page_script(driver):
+    """Scrapes all business listings from the current page in a single execute_script round trip."""
+    try:
+        return card_rows(driver.execute_script(CARD_SCRIPT) or [])
+    except Exception as e:
+        print(f"An error occurred while scraping the page: {e}")
+        return []
+
+def scrape_page_snapshot(driver):
+    """Grabs the page HTML once and parses it with lxml instead of querying the live DOM."""
+    try:
+        return card_rows(parse_listing_cards(driver.page_source, driver.current_url))
+    except Exception as e:
+        print(f"An error occurred while scraping the page: {e}")
+        return []
+
+def scrape_page(driver, extraction=DEFAULT_EXTRACTION):
+    """Scrapes all business listings from the current page with the chosen extraction mode."""
+    if extraction == 'elements':
+        return scrape_page_elements(driver)
+    if extraction == 'snapshot':
+        return scrape_page_snapshot(driver)
+    return scrape_page_script(driver)
+
+def process_snapshot(page_source, url, archive=None):
+    """Runs off the browser's critical path: archives the page HTML (if archiving) and parses it into rows."""
+    if archive is not None:
+        archive.put(ARCHIVE_STAGE, url, page_source)
+    return card_rows(parse_listing_cards(page_source, url))
+
+_archives = {} # archive dir -> this process's PageArchive
+
+def process_archive(options):
+    """This process's handle on the page archive named in options, or None when archiving is off."""
+    path = options.get('archive_dir')
+    if path and path not in _archives:
+        _archives[path] = PageArchive(path)
+    return _archives.get(path)
+
+
+def category_slug(category):
+    return category.replace(' ', '-')
+
+def category_url(base_url, category, page=1):
+    """The listing URL for one page of a category; page 1 has no query string."""
+    url = f"{base_url}{category_slug(category)}"
+    return url if page == 1 else f"{url}?page={page}"
+
+def scrape_category(driver, wait, category, pacer, options=None, parser=None):
+    """
+    Scrapes up to PAGES_TO_SCRAPE result pages of one category by clicking "next"
+    and returns its rows. With 'snapshot' extraction each page's HTML is handed
+    to `parser` (an executor) and the browser moves straight on to the next page.
+    """
+    options = options or default_options()
+    archive = process_archive(options)
+    print(f"\n--- Scraping Category: {category} ---")
+    url = category_url(options['base_url'], category)
+    rows = []
+    snapshots = [] # Parse futures, in page order
+
+    try:
+        pacer.throttle(url)
+        driver.get(url)
+    except Exception as e:
+        print(f"Could not load page for {category}. Error: {e}")
+        return rows
+
+    for page in range(1, PAGES_TO_SCRAPE + 1):
+        print(f"[{category}] Scraping page {page}/{PAGES_TO_SCRAPE}...")
         
+        # Wait for the results to be present
         try:
-            driver.get(url)
-        except Exception as e:
-            print(f"Could not load page for {category}. Error: {e}")
-            continue
-
-        for page in range(1, PAGES_TO_SCRAPE + 1):
-            print(f"Scraping page {page}/{PAGES_TO_SCRAPE}...")
-            
-            # Wait for the results to be present
-            try:
+            with pacer.waiting('readiness'):
                 wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.v-card')))
-            except TimeoutException:
-                print("Timed out waiting for page content. Moving to next category.")
+        except TimeoutException:
+            print(f"[{category}] Timed out waiting for page content. Moving to next category.")
+            break
+
+        if options['extraction'] == 'snapshot' and parser is not None:
+            page_url = category_url(options['base_url'], category, page)
+            snapshots.append(parser.submit(process_snapshot, driver.page_source, page_url, archive))
+            print(f"[{category}] Captured page {page} for parsing.")
+        else:
+            page_results = scrape_page(driver, options['extraction'])
+            if archive is not None:
+                # Filed under its ?page=N URL, whichever way the browser got there
+                archive.put(ARCHIVE_STAGE, category_url(options['base_url'], category, page), driver.page_source)
+            rows.extend(page_results)
+            print(f"[{category}] Found {len(page_results)} new businesses on this page. Total so far: {len(rows)}")
+        
+        # Navigate to the next page
+        try:
+            next_button = driver.find_element(By.CSS_SELECTOR, 'a.next.ajax-page')
+            if next_button.is_displayed() and next_button.is_enabled():
+                previous_cards = driver.find_elements(By.CSS_SELECTOR, 'div.v-card')
+                signature = previous_cards[0].text if previous_cards else None # Read before the click re-renders it
+                pacer.throttle(driver.current_url)
+                next_button.click()
+                count_navigation(driver)
+                # Wait for the card set to be replaced rather than a fixed sleep
+                if not pacer.results_changed(driver, 'div.v-card', previous_cards, signature):
+                    print(f"[{category}] Next page never rendered new results. End of results for this category.")
+                    break
+            else:
+                print(f"[{category}] Next button not found or disabled. End of results for this category.")
                 break
+        except NoSuchElementException:
+            print(f"[{category}] No 'Next' button found. End of results for this category.")
+            break
+
+    for page, snapshot in enumerate(snapshots, 1):
+        try:
+            rows.extend(snapshot.result())
+        except Exception as e:
+            print(f"[{category}] Could not parse page {page}. Error: {e}")
+    if snapshots:
+        print(f"[{category}] Parsed {len(snapshots)} pages: {len(rows)} businesses.")
+    return rows
+
+def scrape_page_at(driver, url, pacer, extraction=DEFAULT_EXTRACTION, archive=None):
+    """
+    Loads one result page by URL and scrapes it. Returns None when the page has
+    no v-card listings at all (past the last page), otherwise its rows; with
+    'snapshot' extraction, the page HTML to be parsed (and archived) elsewhere.
+    """
+    pacer.throttle(url)
+    driver.get(url)
+    pacer.page_ready(driver)
+    if not driver.find_elements(By.CSS_SELECTOR, 'div.v-card'):
+        return None
+    if extraction == 'snapshot':
+        return driver.page_source
+    rows = scrape_page(driver, extraction)
+    if archive is not None:
+        archive.put(ARCHIVE_STAGE, url, driver.page_source)
+    return rows
+
+def default_options(base_url=BASE_URL, extraction=DEFAULT_EXTRACTION, archive_dir=None):
+    """Settings every worker needs; a plain dict so it can be sent to worker processes."""
+    return {'base_url': base_url, 'extraction': extraction, 'archive_dir': archive_dir}
+
+# Set in each worker process by _init_worker
+_limiter = None
+_launch_lock = None
+_options = default_options()
+_pool = None
+_pool_finalizer = None
+
+def _init_worker(limiter, launch_lock, options):
+    global _limiter, _launch_lock, _options
+    _limiter, _launch_lock, _options = limiter, launch_lock, options
+    _worker_pool() # Start warming this worker's browser before its first task arrives
+
+def _worker_pool():
+    """
+    This process's browser pool (one browser, recycled as it ages), closed when
+    the process exits. undetected_chromedriver patches the chromedriver binary
+    on launch, so launches hold the cross-process launch lock.
+    """
+    global _pool, _pool_finalizer
+    if _pool is None:
+        _pool = DriverPool(partial(launch_chrome, launch_lock=_launch_lock), size=1, name='scraper browser')
+        _pool_finalizer = multiprocessing.util.Finalize(None, _pool.close, exitpriority=10)
+    return _pool
+
+def _close_worker_pool():
+    global _pool, _pool_finalizer
+    if _pool_finalizer is not None:
+        _pool_finalizer() # Quits the browser, reports and unregisters the exit hook
+    _pool, _pool_finalizer = None, None
+
+def crawl_shard(categories):
+    """
+    Worker process entry point for 'click' pagination: one browser crawls a
+    shard of categories. Returns ({category: rows}, pacing totals).
+    """
+    pacer = Pacer('scraper', _limiter)
+    parser = ThreadPoolExecutor(max_workers=1) # Parses snapshots while the browser moves on
+    results = {}
+    try:
+        for category in categories:
+            # Back to the pool between categories, so an old browser is recycled at a clean break
+            with _worker_pool().driver() as driver:
+                results[category] = scrape_category(driver, WebDriverWait(driver, 10), category, pacer, _options, parser)
+        return results, pacer.totals()
+    finally:
+        parser.shutdown()
+
+def scrape_page_task(category, page):
+    """
+    Worker entry point for 'url' pagination: scrapes one page of one category
+    in this process's browser. Returns (category, page, rows / page HTML / None,
+    pacing totals).
+    """
+    pacer = Pacer('scraper', _limiter)
+    url = category_url(_options['base_url'], category, page)
+    try:
+        with _worker_pool().driver() as driver:
+            rows = scrape_page_at(driver, url, pacer, _options['extraction'], process_archive(_options))
+        found = 'no results' if rows is None else ('captured' if isinstance(rows, str) else f'{len(rows)} businesses')
+        print(f"[{category}] Page {page}: {found}")
+    except Exception as e:
+        print(f"[{category}] Could not load page {page}. Error: {e}")
+        rows = []
+    return category, page, rows, pacer.totals()
+
+def shard_categories(categories, workers):
+    """Deals the categories out round-robin into at most `workers` shards."""
+    return [shard for shard in (categories[i::workers] for i in range(workers)) if shard]
 
-            page_results = scrape_page(driver)
-            all_businesses.extend(page_results)
-            print(f"Found {len(page_results)} new businesses on this page. Total so far: {len(all_businesses)}")
-            
-            # Navigate to the next page
+def crawl_by_click(categories, workers, limiter, options):
+    """Each worker browser clicks through the categories of its shard. Returns ({category: rows}, [pacing totals])."""
+    if workers <= 1:
+        _init_worker(limiter, MP_CONTEXT.Lock(), options)
+        try:
+            results, totals = crawl_shard(categories)
+        finally:
+            _close_worker_pool()
+        return results, [totals]
+
+    results, pacing = {}, []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT, initializer=_init_worker,
+                             initargs=(limiter, MP_CONTEXT.Lock(), options)) as pool:
+        futures = [pool.submit(crawl_shard, shard) for shard in shard_categories(categories, workers)]
+        for future in as_completed(futures):
             try:
-                next_button = driver.find_element(By.CSS_SELECTOR, 'a.next.ajax-page')
-                if next_button.is_displayed() and next_button.is_enabled():
-                    next_button.click()
-                    time.sleep(3) # Wait for page to load
+                shard_results, totals = future.result()
+                results.update(shard_results)
+                pacing.append(totals)
+            except Exception as e:
+                print(f"A crawl worker failed: {e}")
+    return results, pacing
+
+def crawl_by_url(categories, workers, limiter, options):
+    """
+    Treats every (category, page) as its own job, queued category by category,
+    so up to `workers` pages of the same category load at once. The first page
+    without any listings ends its category: later pages are no longer queued
+    and results from ones already in flight are dropped. With 'snapshot'
+    extraction the workers send back page HTML, which is parsed here on a
+    separate thread while they load the next pages.
+    Returns ({category: rows}, [pacing totals]).
+    """
+    if workers <= 1:
+        _init_worker(limiter, MP_CONTEXT.Lock(), options)
+        executor = ThreadPoolExecutor(max_workers=1) # Same jobs, run in this process's browser
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT, initializer=_init_worker,
+                                       initargs=(limiter, MP_CONTEXT.Lock(), options))
+    parser = ThreadPoolExecutor(max_workers=1)
+
+    jobs = deque((category, page) for category in categories for page in range(1, PAGES_TO_SCRAPE + 1))
+    last_page = {} # category -> last page that can have results, once an empty page was seen
+    pages = {category: {} for category in categories} # page -> rows, or a parse future
+    pacing, in_flight = [], set()
+    try:
+        while jobs or in_flight:
+            while jobs and len(in_flight) < max(workers, 1):
+                category, page = jobs.popleft()
+                if page <= last_page.get(category, PAGES_TO_SCRAPE):
+                    in_flight.add(executor.submit(scrape_page_task, category, page))
+            if not in_flight:
+                continue
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    category, page, rows, totals = future.result()
+                except Exception as e:
+                    print(f"A crawl worker failed: {e}")
+                    continue
+                pacing.append(totals)
+                if rows is None:
+                    last_page[category] = min(last_page.get(category, PAGES_TO_SCRAPE), page - 1)
+                elif isinstance(rows, str):
+                    pages[category][page] = parser.submit(process_snapshot, rows, category_url(options['base_url'], category, page),
+                                                          process_archive(options))
                 else:
-                    print("Next button not found or disabled. End of results for this category.")
-                    break
-            except NoSuchElementException:
-                print("No 'Next' button found. End of results for this category.")
+                    pages[category][page] = rows
+    finally:
+        executor.shutdown()
+        if workers <= 1:
+            _close_worker_pool()
+
+    results = {}
+    for category, by_page in pages.items():
+        results[category] = []
+        for page in sorted(by_page):
+            if page > last_page.get(category, PAGES_TO_SCRAPE):
+                continue
+            rows = by_page[page]
+            if isinstance(rows, Future):
+                try:
+                    rows = rows.result()
+                except Exception as e:
+                    print(f"[{category}] Could not parse page {page}. Error: {e}")
+                    rows = []
+            results[category].extend(rows)
+    parser.shutdown()
+    return results, pacing
+
+def crawl_categories(categories, workers, limiter, pagination=DEFAULT_PAGINATION, base_url=BASE_URL,
+                     extraction=DEFAULT_EXTRACTION, archive_dir=None):
+    """
+    Crawls every category with `workers` browser processes, paginating either
+    by clicking "next" ('click') or by loading ?page=N URLs ('url'), and reading
+    cards with the given extraction mode. Every result page's HTML is kept in
+    the page archive at `archive_dir` when given.
+    Returns ({category: rows}, [pacing totals]).
+    """
+    options = default_options(base_url, extraction, archive_dir)
+    crawl = crawl_by_url if pagination == 'url' else crawl_by_click
+    return crawl(categories, workers, limiter, options)
+
+def replay(archive, categories=CATEGORIES, base_url=BASE_URL):
+    """
+    Re-runs extraction over the archived result pages, with no browser or
+    network: the latest fetch of each category's ?page=N URLs, stopping at the
+    first page that was never archived or has no listings. Returns {category: rows}.
+    """
+    results = {}
+    for category in categories:
+        results[category] = []
+        for page in range(1, PAGES_TO_SCRAPE + 1):
+            url = category_url(base_url, category, page)
+            archived = archive.get(url, ARCHIVE_STAGE)
+            cards = parse_listing_cards(archived[1], archived[0] or url) if archived else []
+            if not cards:
                 break
-    
-    driver.quit()
+            results[category].extend(card_rows(cards))
+        print(f"[{category}] Replayed {len(results[category])} businesses from the archive.")
+    return results
+
+def merge_results(results, categories):
+    """
+    Combines per-category rows in CATEGORIES order and drops businesses that
+    were listed under more than one category.
+    """
+    rows = [row for category in categories for row in results.get(category, [])]
+    df = pd.DataFrame(rows, columns=LISTING_COLUMNS)
+    return df.drop_duplicates(subset=['name', 'phone', 'address'], keep='first').reset_index(drop=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape Yellow Pages listings for every category.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Browser processes crawling categories side by side.")
+    parser.add_argument('--rate-limit', type=float, default=RATE_LIMIT,
+                        help="Page loads per second allowed against Yellow Pages, across all workers (0 = unlimited).")
+    parser.add_argument('--pagination', choices=PAGINATION_MODES, default=DEFAULT_PAGINATION,
+                        help="'click' follows the next button; 'url' loads ?page=N directly and stops at the first empty page.")
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default=DEFAULT_EXTRACTION,
+                        help="'script' reads all cards in one execute_script call; 'elements' queries each field separately; "
+                             "'snapshot' parses the page HTML with lxml on a separate thread while the browser moves on.")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help="Page archive every fetched result page is saved to.")
+    parser.add_argument('--no-archive', action='store_true', help="Don't keep the fetched HTML.")
+    parser.add_argument('--replay', action='store_true',
+                        help="No browser or network: rebuild the output from the result pages in the page archive.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    started = time.time()
+    archive = open_archive(args.archive_dir, enabled=args.replay or not args.no_archive)
+    if args.replay:
+        print(f"Replaying the crawl from the page archive in '{args.archive_dir}' (no network)...")
+        results = replay(archive, CATEGORIES)
+    else:
+        limiter = HostRateLimiter(args.rate_limit, RATE_BURST, hosts=[urlparse(BASE_URL).netloc], context=MP_CONTEXT)
+
+        print(f"Starting the scraping process with {args.workers} worker(s), '{args.pagination}' pagination...")
+        results, pacing = crawl_categories(CATEGORIES, args.workers, limiter, args.pagination,
+                                           extraction=args.extraction, archive_dir=archive and archive.path)
+
+        # Wait vs work, summed over every worker's browser time
+        pacer = Pacer('scraper')
+        for totals in pacing:
+            pacer.merge(totals)
+        pacer.report(elapsed=sum(elapsed for elapsed, _ in pacing))
+        if archive is not None:
+            archive.report(ARCHIVE_STAGE, started)
+    scraped = sum(len(rows) for rows in results.values())
 
-    if all_businesses:
-        df = pd.DataFrame(all_businesses, columns=['name', 'phone', 'address', 'locality', 'category'])
-        df.to_csv(OUTPUT_CSV, index=False)
-        print(f"\nScraping complete. Saved {len(df)} businesses to {OUTPUT_CSV}")
+    if scraped:
+        df = merge_results(results, CATEGORIES)
+        print(f"\nMerged {scraped} listings from {len(results)} categories into {len(df)} unique businesses.")
+        # Tag chains and other exclusions now so no later stage spends a lookup on them
+        df = ExclusionIndex.load().tag(df)
+        write_table(df, OUTPUT_FILE)
+        print(f"\nScraping complete. Saved {len(df)} businesses to {OUTPUT_FILE} ({int(df['excluded'].sum())} excluded).")
     else:
         print("\nScraping complete. No businesses were found.")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
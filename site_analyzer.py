@@ -1,20 +1,46 @@
 import pandas as pd
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from urllib.parse import urljoin, urlparse
-import re
-import time
 import sys
 import os
+import argparse
+import time
+from functools import partial
+from utils.journal import Journal
+from utils.async_crawler import AsyncSiteCrawler, ArchiveReplayCrawler
+from utils.extraction import ExtractionEngine
+from utils.exclusions import ExclusionIndex, report_avoided
+from utils.rate_limit import HostRateLimiter
+from utils.pacing import Pacer
+from utils.page_archive import ARCHIVE_DIR, open_archive
+from utils.driver_pool import DriverPool, launch_chrome
+from utils.resource_blocking import DEFAULT_PROFILE, PageWeights, blocked_url_patterns
+from utils.table_io import read_table, write_table
+from utils.business_store import BusinessStore, report_skipped
 
 # --- Configuration ---
-INPUT_FILE = 'final_call_list.csv'
-OUTPUT_FILE = 'fully_enriched_call_list.csv'
+INPUT_FILE = 'final_call_list.parquet'
+OUTPUT_FILE = 'fully_enriched_call_list.parquet'
+EXPORT_FILE = 'fully_enriched_call_list.csv' # The copy for people, written once at the end of a run
+RESULTS_JOURNAL = 'site_analysis_journal.jsonl' # Per-record results, compacted into OUTPUT_FILE
+COMPACT_EVERY = 50 # Rewrite OUTPUT_FILE after this many new records
+RESULT_COLUMNS = ['emails', 'tech_stack', 'social_links', 'contacts']
 TEST_MODE = False  # Set to False to run on the full list
 TEST_LIMIT = 5    # Number of records to process in test mode
+LINK_KEYWORDS = ['about', 'contact', 'team', 'staff', 'service'] # Sub-pages worth visiting
+MAX_SUBPAGES = 2 # Limit sub-pages per site for efficiency
+RATE_LIMIT = 2.0 # Page loads per second against any one website
+BACKENDS = ['chrome', 'http'] # 'http' crawls static sites without a browser
+DEFAULT_BACKEND = 'chrome'
+ARCHIVE_STAGE = 'site_analyzer' # How this script's pages are filed in the page archive
+EMPTY_RESULT = {'contacts': 'N/A', 'emails': 'N/A', 'tech_stack': 'N/A', 'social_links': 'N/A'}
+
+# --- Contact Filtering ---
+CONTACT_KEYWORDS = ['owner', 'founder', 'ceo', 'manager', 'president', 'principal']
+JUNK_KEYWORDS = ['entity', 'subsidiary', 'third-party', 'ownership', 'affiliate']
 
 # --- Tech Stack Signatures ---
 TECH_SIGNATURES = {
@@ -26,88 +52,105 @@ TECH_SIGNATURES = {
     'Google Analytics': ['google-analytics.com/ga.js', 'gtag(']
 }
 
-def setup_driver():
-    """Sets up the undetected_chromedriver."""
-    print("Setting up Selenium WebDriver...")
-    options = uc.ChromeOptions()
+# --- Resource Blocking (headless runs only read HTML, text and hrefs) ---
+BLOCKING_PROFILE = DEFAULT_PROFILE # Any of 'images', 'media', 'fonts', 'trackers'
+
+EXTRACTOR = ExtractionEngine(TECH_SIGNATURES, CONTACT_KEYWORDS, JUNK_KEYWORDS)
+
+def blocked_urls(profile=BLOCKING_PROFILE):
+    """Requests this stage never needs. Anything TECH_SIGNATURES looks for stays loadable."""
+    return blocked_url_patterns(profile, keep=[s for signatures in TECH_SIGNATURES.values() for s in signatures])
+
+def launch_driver(profile=BLOCKING_PROFILE):
+    """Launches this stage's Chrome for the driver pool, blocking the resource types in `profile`."""
     # When running the full script, headless is much faster.
     # For testing, we want to see the browser.
-    if not TEST_MODE:
-         options.add_argument('--headless')
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    driver = uc.Chrome(options=options, use_subprocess=True)
-    driver.set_page_load_timeout(15) # Slightly shorter timeout
-    return driver
+    return launch_chrome(headless=not TEST_MODE, arguments=["--disable-gpu", "--no-sandbox"],
+                         page_load_timeout=15, # Slightly shorter timeout
+                         blocked_urls=blocked_urls(profile))
 
-def get_internal_links(driver, base_url):
-    """Finds links on the current page that point to the same website."""
-    links = set()
+def filter_internal_links(hrefs, base_url):
+    """Keeps the links that point to the same website and look like about/contact/team pages."""
+    links = []
     base_netloc = urlparse(base_url).netloc
-    keywords = ['about', 'contact', 'team', 'staff', 'service']
     
-    for a in driver.find_elements(By.TAG_NAME, 'a'):
-        href = a.get_attribute('href')
-        if href:
+    for href in hrefs:
+        if href and href not in links:
             try:
                 parsed_href = urlparse(href)
                 # Check if it's an internal link and contains a keyword
-                if parsed_href.netloc == base_netloc and any(keyword in href for keyword in keywords):
-                    links.add(href)
+                if parsed_href.netloc == base_netloc and any(keyword in href for keyword in LINK_KEYWORDS):
+                    links.append(href)
             except Exception:
                 continue # Ignore malformed URLs
-    return list(links)
+    return links
+
+def get_internal_links(driver, base_url):
+    """Finds links on the current page that point to the same website."""
+    return filter_internal_links([a.get_attribute('href') for a in driver.find_elements(By.TAG_NAME, 'a')], base_url)
 
-def analyze_website(driver, url):
+def analyze_website(driver, url, pacer, archive=None, weights=None):
     """
     Visits a website, finds key internal pages, and scrapes aggregated data.
     **Now with added support for legacy HTML framesets and footer-first analysis.**
+    Every page's rendered HTML is filed in `archive`, and its transfer size
+    and load time recorded in `weights` (a PageWeights), when given.
+    Returns None if the homepage couldn't be loaded.
     """
     wait = WebDriverWait(driver, 10)
-    full_source = ""
-    full_text = ""
+    pages = [] # (html, visible text) per page, each scanned once by the extractor
+
+    def keep(page_url):
+        if weights is not None:
+            weights.measure(driver)
+        if archive is not None:
+            archive.put(ARCHIVE_STAGE, page_url, driver.page_source, driver.current_url)
     
     # --- Page Loading and Initial Content Gathering ---
     try:
         print(f" - Navigating to homepage: {url}")
+        pacer.throttle(url)
         driver.get(url)
-        time.sleep(2) # Increased sleep to allow for JS-heavy sites to settle.
+        pacer.page_ready(driver) # Let JS-heavy sites settle: readyState complete and network idle
+        keep(url)
 
         # Handle websites using Framesets first
         frames = driver.find_elements(By.TAG_NAME, 'frame')
         if frames:
             print(f"   - Legacy frameset detected. Analyzing {len(frames)} frames.")
+            frame_urls = [frame.get_attribute('src') for frame in frames]
             for i in range(len(frames)):
                 try:
                     driver.switch_to.frame(i)
-                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    full_source += driver.page_source
-                    full_text += driver.find_element(By.TAG_NAME, 'body').text
+                    with pacer.waiting('readiness'):
+                        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                    pages.append((driver.page_source, driver.find_element(By.TAG_NAME, 'body').text))
+                    if archive is not None and frame_urls[i]:
+                        archive.put(ARCHIVE_STAGE, frame_urls[i], driver.page_source)
                 except (WebDriverException, TimeoutException) as e:
                     print(f"     - Could not analyze frame {i}. Error: {type(e).__name__}")
                 finally:
                     driver.switch_to.default_content()
         else:
             # Standard page: wait for body and get content
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            full_source = driver.page_source
-            full_text = driver.find_element(By.TAG_NAME, 'body').text
+            with pacer.waiting('readiness'):
+                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            pages.append((driver.page_source, driver.find_element(By.TAG_NAME, 'body').text))
 
     except (WebDriverException, TimeoutException) as e:
         print(f" - FATAL: Could not load homepage {url}. Error: {type(e).__name__}")
-        return {'contacts': 'N/A', 'emails': 'N/A', 'tech_stack': 'N/A', 'social_links': 'N/A'}
+        return None
 
-    if not full_source:
+    if not any(source for source, _ in pages):
          print(f" - FATAL: Could not retrieve any content from {url}.")
-         return {'contacts': 'N/A', 'emails': 'N/A', 'tech_stack': 'N/A', 'social_links': 'N/A'}
+         return None
 
     # --- NEW: Footer-First Analysis ---
     try:
         footer = driver.find_element(By.TAG_NAME, 'footer')
         print("   - Found footer. Prioritizing for analysis.")
-        # Add footer content to the top of our text for priority.
-        full_text = footer.text + "\n" + full_text
-        full_source = footer.get_attribute('innerHTML') + "\n" + full_source
+        # Analyze the footer first for priority.
+        pages.insert(0, (footer.get_attribute('innerHTML'), footer.text))
     except Exception:
         print("   - No explicit <footer> tag found. Analyzing full page content.")
         pass # It's okay if there's no footer tag, we'll just analyze the whole page.
@@ -117,92 +160,185 @@ def analyze_website(driver, url):
         internal_links_to_visit = get_internal_links(driver, url)
         if internal_links_to_visit:
             print(f" - Found {len(internal_links_to_visit)} key internal pages to supplement analysis.")
-            for link in internal_links_to_visit[:2]: # Limit to 2 pages for efficiency
+            for link in internal_links_to_visit[:MAX_SUBPAGES]:
                 try:
                     print(f"   - Analyzing sub-page: {link}")
+                    pacer.throttle(link)
                     driver.get(link)
-                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    full_source += driver.page_source
-                    full_text += driver.find_element(By.TAG_NAME, 'body').text
+                    with pacer.waiting('readiness'):
+                        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                    pages.append((driver.page_source, driver.find_element(By.TAG_NAME, 'body').text))
+                    keep(link)
                 except (WebDriverException, TimeoutException) as e:
                     print(f"     - Could not load sub-page {link}. Error: {type(e).__name__}")
                     continue
     except Exception as e:
         print(f"   - Error during sub-page analysis: {type(e).__name__}")
 
-    # --- Analysis on Aggregated Data ---
-    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', full_source)
-    unique_emails = sorted(list(set(e.lower() for e in emails)))
+    return extract_site_data(pages)
 
-    tech_stack = []
-    for tech, signatures in TECH_SIGNATURES.items():
-        if any(sig in full_source for sig in signatures):
-            tech_stack.append(tech)
-    
-    social_links = re.findall(r'https?://(?:www\.)?(?:linkedin\.com/company/[^"\']+)|(?:facebook\.com/[^"\']+)|(?:twitter\.com/[^"\']+)', full_source)
-    unique_socials = sorted(list(set(social_links)))
+def extract_site_data(pages):
+    """
+    Pulls emails, tech stack, social links and likely contacts out of a site's
+    pages, given as (html, visible text) pairs. Each page is scanned once.
+    """
+    extraction = EXTRACTOR.start()
+    for source, text in pages:
+        extraction.feed(source, text)
+    return extraction.result()
 
-    # **FIX 2: Intelligent Contact Filtering**
-    contacts = []
-    contact_keywords = ['owner', 'founder', 'ceo', 'manager', 'president', 'principal']
-    junk_keywords = ['entity', 'subsidiary', 'third-party', 'ownership', 'affiliate']
-    
-    sentences = re.split(r'[\n.!?]', full_text)
-    for sentence in sentences:
-        for keyword in contact_keywords:
-            if keyword in sentence.lower():
-                clean_sentence = ' '.join(sentence.strip().split())
-                
-                # Check 1: Is it a reasonable length?
-                if not (5 < len(clean_sentence) < 300):
-                    continue
-                
-                # Check 2: Does it contain junk words?
-                if any(junk in clean_sentence.lower() for junk in junk_keywords):
-                    continue
-                
-                # Check 3: Does it likely refer to a person? (Look for capitalized words)
-                has_proper_noun = any(word.istitle() and word.lower() != keyword for word in clean_sentence.split())
-                if has_proper_noun:
-                    contacts.append(f"{keyword.title()}: {clean_sentence}")
-    
-    return {
-        'emails': ', '.join(unique_emails) if unique_emails else 'N/A',
-        'tech_stack': ', '.join(sorted(list(set(tech_stack)))) if tech_stack else 'N/A',
-        'social_links': ', '.join(unique_socials) if unique_socials else 'N/A',
-        'contacts': ' | '.join(list(set(contacts))) if contacts else 'N/A'
-    }
+def website_key(website):
+    """A row's website as the journal records it: '' when it has none."""
+    return website if isinstance(website, str) else ''
+
+def load_journal(df_master):
+    """
+    Reads the results journal and applies it to the master DataFrame.
+    Returns the set of indices that have already been analyzed; a site whose
+    latest record is a failed analysis isn't, so it is tried again. Records are
+    matched to rows by name and website, so a reordered or regrown call list
+    only needs its new sites analyzed; records from before the journal kept the
+    website are matched by index and name.
+    """
+    websites = df_master['website'] if 'website' in df_master.columns else pd.Series('', index=df_master.index)
+    rows = {}
+    for index, name, website in zip(df_master.index, df_master['name'], websites):
+        rows.setdefault((str(name), website_key(website)), []).append(index)
+
+    analyzed = set()
+    for record in Journal.read(RESULTS_JOURNAL):
+        if 'website' in record:
+            indices = rows.get((record['name'], record['website']), [])
+        else:
+            index = record['index']
+            indices = [index] if index in df_master.index and str(df_master.at[index, 'name']) == record['name'] else []
+        for index in indices:
+            if record.get('failed'):
+                analyzed.discard(index)
+                continue
+            for col in RESULT_COLUMNS:
+                df_master.loc[index, col] = record[col]
+            analyzed.add(index)
+    return analyzed
+
+def compact(df_master):
+    """Merges everything analyzed so far into OUTPUT_FILE with an atomic temp-file-and-rename write."""
+    try:
+        write_table(df_master, OUTPUT_FILE)
+        print(f"   - Compacted results into '{OUTPUT_FILE}'.")
+    except Exception as e:
+        print(f"   - CRITICAL: Could not write '{OUTPUT_FILE}'. Results are safe in '{RESULTS_JOURNAL}'. Error: {e}")
+
+def export(df_master):
+    """Writes the finished list to EXPORT_FILE for people to open; the pipeline itself only reads OUTPUT_FILE."""
+    try:
+        write_table(df_master, EXPORT_FILE)
+        print(f"--- Exported {len(df_master)} records to '{EXPORT_FILE}'. ---")
+    except Exception as e:
+        print(f"--- Could not write '{EXPORT_FILE}': {e}. The results are in '{OUTPUT_FILE}'. ---")
+
+def analyze_with_http(rows, record, crawler=None):
+    """
+    Crawls the rows' websites concurrently with the async HTTP crawler (or the
+    given crawler, e.g. an ArchiveReplayCrawler) and records each result as it
+    arrives. Returns the rows whose homepage looked JS-rendered, which still need Chrome.
+    """
+    rows_by_url = {}
+    for index, row in rows:
+        rows_by_url.setdefault(row.get('website'), []).append((index, row))
+
+    needs_browser = []
+
+    def on_result(url, crawl):
+        for index, row in rows_by_url[url]:
+            if crawl.needs_browser:
+                needs_browser.append((index, row))
+                continue
+            if crawl.error or not crawl.pages:
+                print(f" - {row.get('name', 'N/A')}: {crawl.error or 'No content'} ({url})")
+                record(index, row, None)
+            else:
+                print(f" - {row.get('name', 'N/A')}: analyzed {url}")
+                record(index, row, extract_site_data(crawl.pages))
+
+    crawler = crawler or AsyncSiteCrawler(filter_internal_links, max_subpages=MAX_SUBPAGES)
+    print(f"--- Crawling {len(rows_by_url)} websites over HTTP ---")
+    crawler.crawl(list(rows_by_url), on_result)
+    print(f"--- {len(needs_browser)} records look JS-rendered and will be analyzed in Chrome. ---")
+    return needs_browser
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analyze business websites for emails, tech stack, socials and contacts.")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="'http' crawls sites concurrently without a browser and only uses Chrome for JS-rendered pages.")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help="Page archive every fetched page is saved to.")
+    parser.add_argument('--no-archive', action='store_true', help="Don't keep the fetched HTML.")
+    parser.add_argument('--replay', action='store_true',
+                        help="No browser or network: re-analyze every website from the page archive.")
+    parser.add_argument('--no-blocking', action='store_true',
+                        help="Let Chrome load images, media, fonts and trackers (to compare page weight with the blocking profile).")
+    parser.add_argument('--from-input', action='store_true',
+                        help=f"Start from '{INPUT_FILE}' instead of '{OUTPUT_FILE}'; sites already in the journal aren't analyzed again.")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Analyze every site not in the journal, even for businesses unchanged since their results were stored.")
+    return parser.parse_args()
 
 def main():
-    # --- Intelligent Processing: Only target records missing emails from the output file ---
-    if not os.path.exists(OUTPUT_FILE):
-        print(f"Error: Output file '{OUTPUT_FILE}' not found. This file is required to run the script in its current mode.")
-        print("Please run with an existing enriched file or modify the script to start from scratch.")
+    args = parse_args()
+    started = time.time()
+    archive = open_archive(args.archive_dir, enabled=args.replay or not args.no_archive)
+
+    # --- Intelligent Processing: Only target records that haven't been analyzed yet ---
+    source = INPUT_FILE if args.from_input else OUTPUT_FILE
+    if not os.path.exists(source):
+        print(f"Error: '{source}' not found. This file is required to run the script in its current mode.")
+        if not args.from_input:
+            print(f"Run with --from-input to start from the final call list in '{INPUT_FILE}'.")
         sys.exit(1)
 
-    print(f"--- Loading existing data from '{OUTPUT_FILE}' ---")
+    print(f"--- Loading existing data from '{source}' ---")
     try:
-        df_master = pd.read_csv(OUTPUT_FILE)
+        df_master = read_table(source)
     except Exception as e:
-        print(f"Error reading '{OUTPUT_FILE}': {e}")
+        print(f"Error reading '{source}': {e}")
         sys.exit(1)
 
-    # Ensure 'emails' column exists and fill any actual NaN values with a placeholder for consistent string checks
-    if 'emails' not in df_master.columns:
-        df_master['emails'] = 'N/A'
+    for col in RESULT_COLUMNS:
+        if col not in df_master.columns:
+            df_master[col] = 'N/A'
+    # Empty columns load as floats; make them hold strings.
+    df_master[RESULT_COLUMNS] = df_master[RESULT_COLUMNS].astype(object)
     df_master['emails'] = df_master['emails'].fillna('N/A')
 
-    # Define what is considered an "empty" email entry
-    is_placeholder = df_master['emails'].str.strip().str.upper() == 'N/A'
-    is_empty_string = df_master['emails'].str.strip() == ''
-    
-    df_to_process = df_master[is_placeholder | is_empty_string].copy()
+    store = None
+    if args.replay:
+        # Re-extract everything; the replayed results are journaled after (and so override) the old ones
+        df_to_process = df_master.copy()
+    else:
+        # Records in the journal are done, even if the analysis found no email.
+        analyzed = load_journal(df_master)
+        print(f"--- {len(analyzed)} records already analyzed according to '{RESULTS_JOURNAL}'. ---")
+
+        # So are businesses whose listing hasn't changed since their results were stored
+        if not args.no_store and BusinessStore.usable(df_master):
+            store = BusinessStore()
+            remaining = ~df_master.index.isin(analyzed)
+            carried = store.fresh(df_master, 'sites') & remaining
+            store.carry_forward(df_master, 'sites', carried)
+            analyzed.update(df_master.index[carried.to_numpy()])
+            report_skipped('site analysis', int(carried.sum()), int(remaining.sum()))
+
+        # Rows filled in before the journal existed are also done.
+        has_email = ~df_master['emails'].str.strip().str.upper().isin(['N/A', ''])
+        df_to_process = df_master[~df_master.index.isin(analyzed) & ~has_email].copy()
 
     if df_to_process.empty:
-        print("--- No records with missing emails found. Enrichment is complete. ---")
+        print("--- No records left to analyze. Enrichment is complete. ---")
+        compact(df_master)
+        export(df_master)
         return
 
-    print(f"--- Found {len(df_to_process)} records with missing emails to process. ---")
+    print(f"--- Found {len(df_to_process)} records left to process. ---")
 
     if TEST_MODE:
         print(f"--- RUNNING IN TEST MODE: Processing first {TEST_LIMIT} records ---")
@@ -211,33 +347,84 @@ def main():
             print("--- No records to process in test mode. ---")
             return
 
-    driver = setup_driver()
-    
-    # --- Main Processing Loop with In-place Update ---
-    for index, row in df_to_process.iterrows():
-        # Use .get() for safer access in case a column is missing
-        print(f"\nProcessing record for: {row.get('name', 'N/A')} (Index: {index})")
-        website_url = row.get('website')
+    journal = Journal(RESULTS_JOURNAL)
+    processed = [0]
+    recorded = []
+    failed = set() # Sites that couldn't be loaded: journaled as failed and kept out of the store, so the next run tries them again
 
-        if pd.notna(website_url) and isinstance(website_url, str) and website_url.startswith('http'):
-            analysis_data = analyze_website(driver, website_url)
-        else:
-            print(f" - Skipping due to invalid or missing website URL: '{website_url}'")
-            analysis_data = {'contacts': 'N/A', 'emails': 'N/A', 'tech_stack': 'N/A', 'social_links': 'N/A'}
-        
-        # Update the master DataFrame in memory
+    def record(index, row, analysis_data):
+        """
+        Appends one result to the journal and the in-memory master, compacting
+        periodically. An analysis_data of None records a failed analysis as empty.
+        """
+        entry = {'index': int(index), 'name': str(row.get('name')), 'website': website_key(row.get('website'))}
+        if analysis_data is None:
+            analysis_data = dict(EMPTY_RESULT)
+            entry['failed'] = True
+            failed.add(index)
+        journal.append({**entry, **analysis_data})
         for col, value in analysis_data.items():
             df_master.loc[index, col] = value
-        
-        # Save the entire updated DataFrame back to the CSV.
-        # This is a safe way to do incremental, in-place updates.
-        try:
-            df_master.to_csv(OUTPUT_FILE, index=False)
-            print(f"   - Successfully updated and saved record {index}.")
-        except Exception as e:
-            print(f"   - CRITICAL: Could not save progress for record {index}. Error: {e}")
-            
-    driver.quit()
+        recorded.append(index)
+        processed[0] += 1
+        if processed[0] % COMPACT_EVERY == 0:
+            compact(df_master)
+
+    # --- Excluded rows and rows without a usable website are recorded straight away ---
+    excluded = ExclusionIndex.load().classify(df_to_process)['excluded']
+    report_avoided('site analysis', int(excluded.sum()))
+    browser_rows = []
+    for index, row in df_to_process.iterrows():
+        website_url = row.get('website')
+        if excluded[index]:
+            record(index, row, dict(EMPTY_RESULT))
+        elif pd.notna(website_url) and isinstance(website_url, str) and website_url.startswith('http'):
+            browser_rows.append((index, row))
+        else:
+            print(f" - Skipping {row.get('name', 'N/A')} due to invalid or missing website URL: '{website_url}'")
+            record(index, row, dict(EMPTY_RESULT))
+
+    pool = None
+    pacer = Pacer('site_analyzer', HostRateLimiter(RATE_LIMIT))
+    profile = [] if args.no_blocking else BLOCKING_PROFILE
+    weights = PageWeights('site_analyzer', profile)
+    factory = partial(launch_driver, profile)
+    try:
+        if args.backend == 'chrome' and browser_rows and not args.replay:
+            pool = DriverPool(factory, name='site_analyzer browser') # Starts launching right away
+        if args.replay:
+            print(f"--- Replaying from the page archive in '{archive.path}' (no network) ---")
+            crawler = ArchiveReplayCrawler(archive, ARCHIVE_STAGE, filter_internal_links, max_subpages=MAX_SUBPAGES)
+            for index, row in analyze_with_http(browser_rows, record, crawler):
+                record(index, row, None) # Only a JS-less copy was archived
+            browser_rows = []
+        elif args.backend == 'http':
+            crawler = AsyncSiteCrawler(filter_internal_links, max_subpages=MAX_SUBPAGES,
+                                       archive=archive, archive_stage=ARCHIVE_STAGE)
+            browser_rows = analyze_with_http(browser_rows, record, crawler)
+
+        # --- Main Processing Loop: Chrome for everything the HTTP crawler couldn't handle ---
+        if browser_rows and pool is None:
+            pool = DriverPool(factory, name='site_analyzer browser')
+        for index, row in browser_rows:
+            # Use .get() for safer access in case a column is missing
+            print(f"\nProcessing record for: {row.get('name', 'N/A')} (Index: {index})")
+            with pool.driver() as driver:
+                record(index, row, analyze_website(driver, row.get('website'), pacer, archive, weights))
+    finally:
+        journal.close()
+        if pool is not None:
+            pool.close()
+            weights.report()
+        compact(df_master)
+        export(df_master)
+        if store is not None:
+            settled = df_master.index.isin(recorded) & ~df_master.index.isin(list(failed))
+            store.update(df_master, 'sites', settled & ~df_master.index.isin(excluded.index[excluded.to_numpy()]))
+            store.save()
+        pacer.report()
+        if archive is not None and not args.replay:
+            archive.report(ARCHIVE_STAGE, started)
 
     print(f"\nEnrichment complete. All targeted records have been processed and saved to '{OUTPUT_FILE}'")
 
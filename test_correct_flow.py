@@ -1,16 +1,13 @@
 import logging
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.driver_pool import launch_chrome
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 def setup_webdriver():
     """Sets up the undetected ChromeDriver."""
-    options = uc.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = uc.Chrome(options=options, use_subprocess=True)
-    return driver
+    return launch_chrome(arguments=["--start-maximized"])
 
 def get_sunbiz_details_correct_flow(driver, business_name):
     """
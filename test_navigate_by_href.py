@@ -1,15 +1,12 @@
 import logging
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.driver_pool import launch_chrome
 
 def setup_webdriver():
     """Sets up the undetected ChromeDriver."""
-    options = uc.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = uc.Chrome(options=options, use_subprocess=True)
-    return driver
+    return launch_chrome(arguments=["--start-maximized"])
 
 def get_sunbiz_details_nav_by_href(driver, business_name):
     """
@@ -0,0 +1,39 @@
+import sys
+import pandas as pd
+from utils.scoring import NAME_KEYWORDS, keyword_scores
+
+# Names scored by the vectorized scorer, compared with plain substring matching of NAME_KEYWORDS
+# (`keyword in name.lower()`, the check the rest of the baseline used for its keyword lists).
+NAMES = [
+    "Seminole Accountants Inc", "Old Ledger Bookkeeping LLC", "Smith Law PLLC", "Acme Corporation",
+    "Acme Corp", "Glatthorn P.A.", "Glatthorn & Company Pa", "Wells & Associates", "Smith & Co", "Harbor Title Co.",
+    "Acme Incorporated", "Bayside CPA Group", "Pasadena Dental", "Prince Plumbing", "Corporate Cleaning",
+    "Acme Company Inc",
+]
+# Deliberate differences from substring matching: keywords count as whole words (or one of their
+# KEYWORD_SPELLINGS), so a keyword inside another word scores nothing. name -> (score, why)
+DIFFERENCES = {
+    "Acme Incorporated": (15, "'corp' inside 'incorporated'"),
+    "Bayside CPA Group": (15, "'pa' inside 'cpa'"),
+    "Pasadena Dental": (0, "'pa' inside 'pasadena'"),
+    "Prince Plumbing": (0, "'inc' inside 'prince'"),
+    "Corporate Cleaning": (0, "'corp' inside 'corporate'"),
+    "Acme Company Inc": (25, "'pa' inside 'company'"),
+}
+
+def substring_score(name):
+    return sum(weight for keyword, weight in NAME_KEYWORDS.items() if keyword in name.lower())
+
+if __name__ == '__main__':
+    scores = keyword_scores(pd.Series(NAMES), NAME_KEYWORDS)
+    failures = 0
+    for name, score in zip(NAMES, scores.tolist()):
+        expected, why = DIFFERENCES.get(name, (substring_score(name), None))
+        ok = score == expected
+        failures += not ok
+        note = f" (substring: {substring_score(name)}, {why})" if why else ""
+        print(f"  [{'OK' if ok else 'FAIL'}] {name:<28} -> {score:>3}, expected {expected:>3}{note}")
+
+    print("---------------------------------------")
+    print("All name scores matched." if not failures else f"{failures} name score(s) did not match.")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,74 @@
+import argparse
+import logging
+import sys
+import time
+import scraper
+from utils.fixture_server import yellowpages_fixture_server
+from utils.rate_limit import HostRateLimiter
+
+# Categories served by fixtures/yellowpages ('Plumbers' has no fixture pages at all).
+CATEGORIES = ["Accountants", "Lawyers", "Plumbers"]
+
+# (name, phone) rows each category should produce after the AREA_CODE_FILTER, in page order.
+EXPECTED = {
+    "Accountants": [("Seminole Accountants Inc", "(727) 392-2120"), ("Glatthorn & Company Pa", "(727) 347-5100"),
+                    ("H&R Block", "(727) 555-0100"), ("Old Ledger Bookkeeping LLC", "(727) 555-0101"),
+                    ("Bayside CPA Group", "(727) 555-0120")],
+    "Lawyers": [("Bayside Law Group", "(727) 555-0130"), ("Seminole Accountants Inc", "(727) 392-2120")],
+    "Plumbers": [],
+}
+EXPECTED_UNIQUE = 6 # Seminole Accountants Inc is listed under both Accountants and Lawyers
+# Websites linked straight from the result cards; every other business has none
+EXPECTED_WEBSITES = {"Seminole Accountants Inc": "https://www.seminoleaccountants.example/",
+                     "Bayside Law Group": "https://www.baysidelaw.example/"}
+
+def run_crawl(pagination, workers, base_url, extraction=scraper.DEFAULT_EXTRACTION):
+    """Crawls the fixture categories and returns (results, merged DataFrame, seconds)."""
+    logging.info(f"Crawling {len(CATEGORIES)} categories with {workers} worker(s), '{pagination}' pagination, '{extraction}' extraction...")
+    limiter = HostRateLimiter(0, context=scraper.MP_CONTEXT) # No need to be polite to localhost
+    start = time.perf_counter()
+    results, _ = scraper.crawl_categories(CATEGORIES, workers, limiter, pagination, base_url, extraction)
+    return results, scraper.merge_results(results, CATEGORIES), time.perf_counter() - start
+
+def check_results(results, merged):
+    """Compares the crawl against EXPECTED and returns the number of mismatches."""
+    mismatches = 0
+    for category, expected in EXPECTED.items():
+        got = [(row[0], row[1]) for row in results.get(category, [])]
+        ok = got == expected
+        mismatches += not ok
+        print(f"  [{'OK' if ok else 'FAIL'}] {category:<12} -> {len(got)} rows" + ("" if ok else f": {got}"))
+    ok = len(merged) == EXPECTED_UNIQUE
+    mismatches += not ok
+    print(f"  [{'OK' if ok else 'FAIL'}] merged       -> {len(merged)} unique businesses")
+    websites = {name: website for name, website in zip(merged['name'], merged['website']) if isinstance(website, str)}
+    ok = websites == EXPECTED_WEBSITES
+    mismatches += not ok
+    print(f"  [{'OK' if ok else 'FAIL'}] websites     -> {len(websites)} from the cards" + ("" if ok else f": {websites}"))
+    # Every card has a details page and an ID, whether it is on the v-card (data-ypid) or its result wrapper (lid-)
+    ok = all(url and url.endswith(f"-{lid}") for url, lid in zip(merged['detail_url'], merged['listing_id']))
+    mismatches += not ok
+    print(f"  [{'OK' if ok else 'FAIL'}] listing IDs  -> {merged['listing_id'].tolist()}")
+    return mismatches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run both scraper pagination modes against the saved Yellow Pages fixtures.")
+    parser.add_argument('--modes', nargs='+', choices=scraper.PAGINATION_MODES, default=scraper.PAGINATION_MODES)
+    parser.add_argument('--extraction', choices=scraper.EXTRACTION_MODES, default=scraper.DEFAULT_EXTRACTION)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    failures = 0
+
+    with yellowpages_fixture_server() as server:
+        logging.info(f"Fixture Yellow Pages server running at {server.base_url}")
+        base_url = server.url('/pinellas-county-fl/')
+        for pagination in args.modes:
+            for workers in (1, 2):
+                results, merged, elapsed = run_crawl(pagination, workers, base_url, args.extraction)
+                print(f"\n--- RESULTS ({pagination}, {workers} worker(s), {elapsed:.1f}s) ---")
+                failures += check_results(results, merged)
+
+    print("---------------------------------------")
+    print("Both pagination modes matched." if not failures else f"{failures} check(s) did not match.")
+    sys.exit(1 if failures else 0)
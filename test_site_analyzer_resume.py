@@ -0,0 +1,60 @@
+import os
+import shutil
+import sys
+import tempfile
+import pandas as pd
+import site_analyzer
+from utils.business_store import tag
+from utils.fixture_server import FixtureServer, SITES_FIXTURES
+from utils.journal import Journal
+from utils.table_io import read_table, write_table
+
+# Static fixture sites, one row each. FLAKY_SITE is missing from the server on the first run.
+SITES = {"Acme CPA": "acme-cpa", "Bayside Law Group": "bayside-law", "Gulf Coast Gifts": "gulf-coast-gifts"}
+FLAKY_SITE = "bayside-law"
+
+def run_analyzer():
+    """One `site_analyzer.py --from-input --backend http` run in the current directory."""
+    sys.argv = ['site_analyzer.py', '--from-input', '--backend', 'http', '--no-archive']
+    site_analyzer.main()
+    return read_table(site_analyzer.OUTPUT_FILE).set_index('name')
+
+if __name__ == '__main__':
+    root = tempfile.mkdtemp(prefix='sites-')
+    workdir = tempfile.mkdtemp(prefix='site_analyzer-')
+    failures = 0
+    try:
+        for site in SITES.values():
+            if site != FLAKY_SITE:
+                shutil.copytree(os.path.join(SITES_FIXTURES, site), os.path.join(root, site))
+        os.chdir(workdir)
+        with FixtureServer(root) as server:
+            df = pd.DataFrame({'name': list(SITES), 'phone': ['(727) 555-0100', '(727) 555-0101', '(727) 555-0102'],
+                               'address': ['1 Main St', '2 Main St', '3 Main St'],
+                               'website': [server.url(f"/{site}/") for site in SITES.values()]})
+            write_table(tag(df), site_analyzer.INPUT_FILE)
+
+            print("--- First run: the flaky site is down ---")
+            first = run_analyzer()
+            shutil.copytree(os.path.join(SITES_FIXTURES, FLAKY_SITE), os.path.join(root, FLAKY_SITE))
+            print("\n--- Second run: the flaky site is back ---")
+            second = run_analyzer()
+
+        retried = [record['name'] for record in Journal.read(site_analyzer.RESULTS_JOURNAL)][len(SITES):]
+        checks = [
+            ("first run recorded the failure as empty", first.at["Bayside Law Group", 'emails'] == 'N/A'),
+            ("second run analyzed only the failed site again", retried == ["Bayside Law Group"]),
+            ("second run found its email", second.at["Bayside Law Group", 'emails'] != 'N/A'),
+            ("other sites kept their results", (second.drop("Bayside Law Group")['emails'] != 'N/A').all()),
+        ]
+        for label, ok in checks:
+            failures += not ok
+            print(f"  [{'OK' if ok else 'FAIL'}] {label}")
+    finally:
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("---------------------------------------")
+    print("Failed sites are retried on resume." if not failures else f"{failures} check(s) failed.")
+    sys.exit(1 if failures else 0)
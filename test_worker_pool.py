@@ -0,0 +1,69 @@
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from utils import enrich_and_score
+from utils.fixture_server import sunbiz_fixture_server
+from utils.page_archive import PageArchive
+
+# Businesses served by fixtures/sunbiz and what the lookup should return for each.
+EXPECTED = {
+    "Seminole Accountants Inc": ("ACTIVE", ["Geiger, Susan J.", "Lynch, Garrick", "Lynch, Ryan"]),
+    "Glatthorn & Company Pa": ("ACTIVE", ["Glatthorn, Gina M"]),
+    "Old Ledger Bookkeeping LLC": ("INACTIVE", []),
+    "Nobody Registered Here LLC": ("No Results Found", []),
+}
+
+def run_pool(workers, lookups, mode, backend, archive=None):
+    """Runs the lookups through the worker pool and returns (results, seconds)."""
+    logging.info(f"Running {len(lookups)} lookups with {workers} {backend} worker(s) in '{mode}' mode...")
+    start = time.perf_counter()
+    results = enrich_and_score.run_sunbiz_lookups(lookups, workers=workers, mode=mode, backend=backend, archive=archive)
+    return results, time.perf_counter() - start
+
+def check_results(lookups, results):
+    """Compares pool output against EXPECTED and returns the number of mismatches."""
+    mismatches = 0
+    for index, name in lookups:
+        expected = EXPECTED[name]
+        status, officers, path, seconds, detail_url = results.get(index, (None, None, None, 0.0, None))
+        ok = (status, officers) == expected
+        mismatches += not ok
+        print(f"  [{'OK' if ok else 'FAIL'}] {name:<30} -> {status}, {officers} ({path}, {seconds:.2f}s)")
+    return mismatches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the Sunbiz lookup backends against the saved fixture pages.")
+    parser.add_argument('--backends', nargs='+', choices=enrich_and_score.BACKENDS, default=enrich_and_score.BACKENDS,
+                        help="Backends to check. Use '--backends http' on machines without Chrome.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Each name twice so every worker gets more than one job.
+    lookups = list(enumerate(list(EXPECTED) * 2))
+    failures = 0
+    archive = PageArchive(tempfile.mkdtemp(prefix='page_archive-')) # Every backend archives what it fetched
+
+    with sunbiz_fixture_server() as server:
+        logging.info(f"Fixture Sunbiz server running at {server.base_url}")
+        enrich_and_score.SUNBIZ_HOME_URL = server.url('/sunbiz/')
+        enrich_and_score.SUNBIZ_SEARCH_URL = server.url('/Inquiry/CorporationRegistration/ByName')
+
+        for backend in args.backends:
+            # The http backend always builds the results URL directly, so it only needs one mode.
+            modes = enrich_and_score.LOOKUP_MODES if backend == 'selenium' else [enrich_and_score.DEFAULT_LOOKUP_MODE]
+            for mode in modes:
+                for workers in (1, 3):
+                    results, elapsed = run_pool(workers, lookups, mode, backend, archive)
+                    print(f"\n--- RESULTS ({backend}, {workers} worker(s), {mode}, {elapsed:.1f}s) ---")
+                    failures += check_results(lookups, results)
+
+    # The server is gone: replay must answer every lookup from the archived pages alone.
+    results, elapsed = run_pool(1, lookups, enrich_and_score.DEFAULT_LOOKUP_MODE, enrich_and_score.REPLAY_BACKEND, archive)
+    print(f"\n--- RESULTS (replay from {archive.path}, {elapsed:.1f}s) ---")
+    failures += check_results(lookups, results)
+
+    print("---------------------------------------")
+    print("All lookups matched." if not failures else f"{failures} lookup(s) did not match.")
+    sys.exit(1 if failures else 0)
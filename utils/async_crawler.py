@@ -0,0 +1,173 @@
+import asyncio
+import re
+import aiohttp
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+
+# --- Configuration ---
+GLOBAL_CONCURRENCY = 50 # Open connections across all hosts
+PER_HOST_CONCURRENCY = 2 # Open connections to any one host
+SITE_CONCURRENCY = 25 # Sites being crawled at once
+REQUEST_TIMEOUT = 15 # Seconds per request, matching the Chrome page load timeout
+HEADERS = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+    'Accept': "text/html,application/xhtml+xml",
+}
+BLOCK_TAGS = ['p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article', 'header', 'footer', 'address']
+MIN_TEXT_LENGTH = 200 # Pages with less visible text than this are suspected to be JS-rendered
+JS_APP_ROOT = re.compile(r'<div[^>]+id=["\'](?:root|app|__next|___gatsby)["\'][^>]*>\s*</div>', re.I)
+JS_REQUIRED_TEXT = re.compile(r'(?:enable|requires?) javascript', re.I)
+
+
+def page_text(tree):
+    """Visible text of a parsed page, one line per block element, like a browser's body.text."""
+    for bad in tree.xpath('//script | //style | //noscript | //template'):
+        bad.drop_tree()
+    for element in tree.iter(*BLOCK_TAGS):
+        element.tail = '\n' + (element.tail or '')
+    body = tree.find('body')
+    return (body if body is not None else tree).text_content()
+
+
+def looks_js_rendered(source, text):
+    """Guesses whether a page only shows its content after running JavaScript."""
+    if JS_APP_ROOT.search(source):
+        return True
+    if len(text.strip()) < MIN_TEXT_LENGTH and ('<script' in source.lower() or JS_REQUIRED_TEXT.search(source)):
+        return True
+    return False
+
+
+class SiteCrawl:
+    """What the crawler collected for one website, in the same shape analyze_website builds with Chrome."""
+
+    def __init__(self, url):
+        self.url = url
+        self.pages = [] # (html, visible text) pairs, footer first
+        self.needs_browser = False
+        self.error = None
+
+
+class AsyncSiteCrawler:
+    """
+    Fetches business websites over plain HTTP with asyncio/aiohttp. One pooled
+    session is shared by every site; aiohttp's connector enforces the global and
+    per-host connection limits, and a semaphore bounds how many sites are in flight.
+
+    `link_filter(hrefs, base_url)` picks the sub-pages worth visiting; the first
+    `max_subpages` of them are fetched concurrently once the homepage is in.
+    Every page fetched is filed in `archive` under `archive_stage` when given.
+    """
+
+    def __init__(self, link_filter, max_subpages=2, concurrency=GLOBAL_CONCURRENCY,
+                 per_host=PER_HOST_CONCURRENCY, site_concurrency=SITE_CONCURRENCY, timeout=REQUEST_TIMEOUT,
+                 archive=None, archive_stage=None):
+        self.link_filter = link_filter
+        self.max_subpages = max_subpages
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.site_concurrency = site_concurrency
+        self.timeout = timeout
+        self.archive = archive
+        self.archive_stage = archive_stage
+
+    async def fetch(self, session, url):
+        """Returns (final_url, html), or (url, None) on any network or HTTP error."""
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                if response.status >= 400 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+                    return url, None
+                source = await response.text(errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError):
+            return url, None
+        if self.archive is not None:
+            self.archive.put(self.archive_stage, url, source, str(response.url))
+        return str(response.url), source
+
+    async def crawl_site(self, session, url):
+        crawl = SiteCrawl(url)
+        final_url, source = await self.fetch(session, url)
+        if source is None:
+            crawl.error = "Could not load homepage"
+            return crawl
+
+        tree = lxml_html.fromstring(source)
+        tree.make_links_absolute(final_url, handle_failures='ignore')
+
+        # Legacy framesets: the content lives in the frame documents.
+        frame_urls = [src for src in tree.xpath('//frame/@src') if src]
+        hrefs = tree.xpath('//a/@href')
+        footers = tree.xpath('//footer')
+        footer_source = lxml_html.tostring(footers[0], encoding='unicode') if footers else ""
+        footer_text = page_text(lxml_html.fromstring(footer_source)) if footers else ""
+        text = page_text(tree)
+
+        if not frame_urls and looks_js_rendered(source, text):
+            crawl.needs_browser = True
+            return crawl
+
+        # Footer first, like the Chrome path, so its contacts take priority.
+        if footer_source:
+            crawl.pages.append((footer_source, footer_text))
+
+        if frame_urls:
+            frames = await asyncio.gather(*(self.fetch(session, urljoin(final_url, src)) for src in frame_urls))
+            for _, frame_source in frames:
+                if frame_source:
+                    frame_tree = lxml_html.fromstring(frame_source)
+                    hrefs += frame_tree.xpath('//a/@href')
+                    crawl.pages.append((frame_source, page_text(frame_tree)))
+        else:
+            crawl.pages.append((source, text))
+
+        subpages = self.link_filter([urljoin(final_url, h) for h in hrefs], final_url)[:self.max_subpages]
+        for _, sub_source in await asyncio.gather(*(self.fetch(session, link) for link in subpages)):
+            if sub_source:
+                crawl.pages.append((sub_source, page_text(lxml_html.fromstring(sub_source))))
+        return crawl
+
+    async def crawl_many(self, urls, on_result):
+        """Crawls every URL, calling on_result(url, SiteCrawl) as each site finishes."""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.site_concurrency)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS) as session:
+            async def one(url):
+                async with semaphore:
+                    try:
+                        crawl = await self.crawl_site(session, url)
+                    except Exception as e:
+                        crawl = SiteCrawl(url)
+                        crawl.error = f"{type(e).__name__}: {e}"
+                on_result(url, crawl)
+
+            await asyncio.gather(*(one(url) for url in urls))
+
+    def crawl(self, urls, on_result):
+        """Synchronous entry point for the scripts."""
+        asyncio.run(self.crawl_many(urls, on_result))
+
+
+class ArchiveReplayCrawler(AsyncSiteCrawler):
+    """
+    The same crawl, with the latest archived copy of each page standing in for
+    the network: re-runs extraction over what earlier crawls (HTTP or Chrome)
+    archived. Pages that were never archived count as failed fetches.
+    """
+
+    def __init__(self, archive, archive_stage, link_filter, max_subpages=2):
+        super().__init__(link_filter, max_subpages, archive=archive, archive_stage=archive_stage)
+
+    async def fetch(self, session, url):
+        page = self.archive.get(url, self.archive_stage)
+        return page if page is not None else (url, None)
+
+    async def crawl_many(self, urls, on_result):
+        for url in urls:
+            try:
+                crawl = await self.crawl_site(None, url)
+            except Exception as e:
+                crawl = SiteCrawl(url)
+                crawl.error = f"{type(e).__name__}: {e}"
+            on_result(url, crawl)
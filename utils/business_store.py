@@ -0,0 +1,164 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Allow `python utils/business_store.py`
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.entity_resolution import normalize_addresses, normalize_names, normalize_phones
+from utils.table_io import read_table, write_table
+
+# --- Configuration ---
+STORE_FILE = 'business_store.parquet'
+CHANGE_COLUMNS = ['name', 'locality', 'website', 'detail_url'] # Crawled fields the lookups depend on; a change re-enriches the business
+STAGE_COLUMNS = { # What each enrichment stage keeps in the store
+    'sunbiz': ['sunbiz_status', 'owner_name'],
+    'websites': ['website'],
+    'sites': ['emails', 'tech_stack', 'social_links', 'contacts'],
+}
+STAGE_INPUTS = {'sites': ['website']} # Earlier stages' results a stage also depends on: the site analyzed is the one looked up
+REFRESH_DAYS = 90 # Stored results older than this are looked up again even if the listing hasn't changed
+
+
+def business_keys(df):
+    """
+    A business's identity across crawls: its phone digits plus its normalized
+    name and address, so "Seminole Accountants, Inc." at "12 Main Street" keeps
+    the key of last week's "Seminole Accountants Inc" at "12 Main St".
+    """
+    blank = pd.Series('', index=df.index)
+    phones = normalize_phones(df['phone']) if 'phone' in df.columns else blank
+    names = normalize_names(df['name']) if 'name' in df.columns else blank
+    addresses = normalize_addresses(df['address']) if 'address' in df.columns else blank
+    return phones + '|' + names + '|' + addresses
+
+
+def listing_hashes(df, columns=CHANGE_COLUMNS):
+    """A hash of the crawled fields each row's lookups depend on; it changes when the listing does."""
+    values = df[[column for column in columns if column in df.columns]].astype(object).fillna('').astype(str)
+    return pd.util.hash_pandas_object(values, index=False).map('{:016x}'.format)
+
+
+def tag(df):
+    """Adds the business_key and listing_hash columns, right after the crawl, for every later stage to look up by."""
+    return df.assign(business_key=business_keys(df), listing_hash=listing_hashes(df))
+
+
+def report_skipped(stage, skipped, total):
+    """Prints what fraction of a stage's lookups the store saved."""
+    if total:
+        print(f"Business store: {skipped} of {total} {stage} lookups skipped ({100 * skipped / total:.0f}%), "
+              f"unchanged since they were last looked up.")
+
+
+class BusinessStore:
+    """
+    Every business ever crawled, keyed by business_key, with what each enrichment
+    stage found for it and the listing_hash it was found for. A stage only looks
+    up rows that are new, whose listing changed since, or whose stored result is
+    older than refresh_days; everything else is carried forward from the store.
+    """
+
+    def __init__(self, path=STORE_FILE, refresh_days=REFRESH_DAYS):
+        self.path = path
+        self.refresh = refresh_days * 86400
+        columns = ['first_seen', 'last_seen', 'listing_hash']
+        for stage, stage_columns in STAGE_COLUMNS.items():
+            columns += [f'{stage}_hash', f'{stage}_at'] + stage_columns
+        if os.path.exists(path):
+            self.records = read_table(path).set_index('business_key')
+            for column in columns:
+                if column not in self.records.columns:
+                    self.records[column] = np.nan
+        else:
+            self.records = pd.DataFrame(columns=columns, index=pd.Index([], name='business_key'), dtype=object)
+
+    @staticmethod
+    def usable(df):
+        return {'business_key', 'listing_hash'} <= set(df.columns)
+
+    def observe(self, df):
+        """
+        Compares a tagged crawl with the store, prints how many of its businesses
+        are new, changed or unchanged, then records them all as seen.
+        """
+        now = time.time()
+        latest = df.drop_duplicates('business_key', keep='last').set_index('business_key')['listing_hash']
+        stored = self.records['listing_hash'].reindex(latest.index)
+        new = stored.isna()
+        changed = ~new & (stored != latest)
+        gone = int((~self.records.index.isin(latest.index)).sum())
+        print(f"Business store: {len(latest)} businesses in this crawl: {int(new.sum())} new, {int(changed.sum())} changed, "
+              f"{int((~new & ~changed).sum())} unchanged; {gone} stored businesses weren't in it.")
+
+        added = latest.index[new.to_numpy()]
+        self.records = pd.concat([self.records, pd.DataFrame({'first_seen': now}, index=added)]) if len(added) else self.records
+        self.records.loc[latest.index, 'last_seen'] = now
+        self.records.loc[latest.index, 'listing_hash'] = latest.to_numpy()
+
+    @staticmethod
+    def stage_hashes(df, stage):
+        """What a stage's stored results are valid for: the listing, plus any earlier results the stage used."""
+        if stage not in STAGE_INPUTS:
+            return df['listing_hash']
+        return df['listing_hash'] + ':' + listing_hashes(df, STAGE_INPUTS[stage])
+
+    def fresh(self, df, stage):
+        """True for the rows whose stored `stage` results were found for this same listing, recently enough to reuse."""
+        stored = self.records.reindex(df['business_key'])
+        same = stored[f'{stage}_hash'].to_numpy() == self.stage_hashes(df, stage).to_numpy()
+        recent = pd.to_numeric(stored[f'{stage}_at'], errors='coerce').fillna(0).to_numpy() >= time.time() - self.refresh
+        return pd.Series(same & recent, index=df.index)
+
+    def carry_forward(self, df, stage, rows):
+        """Copies the stored `stage` results into `df` for the rows selected by the boolean mask `rows`."""
+        if not rows.any():
+            return
+        stored = self.records.reindex(df.loc[rows, 'business_key'])
+        for column in STAGE_COLUMNS[stage]:
+            values = df[column].astype(object) if column in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+            values[rows.to_numpy()] = stored[column].to_numpy()
+            df[column] = values
+
+    def update(self, df, stage, rows):
+        """Stores the `stage` results of the rows selected by `rows`, as found for each row's current listing."""
+        part = df[rows].assign(_stage_hash=lambda rows_df: self.stage_hashes(rows_df, stage))
+        part = part.drop_duplicates('business_key', keep='last').set_index('business_key')
+        if part.empty:
+            return
+        missing = part.index[~part.index.isin(self.records.index)]
+        if len(missing):
+            self.records = pd.concat([self.records, pd.DataFrame({'first_seen': time.time()}, index=missing)])
+        self.records[STAGE_COLUMNS[stage]] = self.records[STAGE_COLUMNS[stage]].astype(object)
+        for column in STAGE_COLUMNS[stage]:
+            self.records.loc[part.index, column] = part[column].astype(object).to_numpy() if column in part.columns else np.nan
+        self.records.loc[part.index, f'{stage}_hash'] = part['_stage_hash'].to_numpy()
+        self.records.loc[part.index, f'{stage}_at'] = time.time()
+
+    def save(self):
+        self.records.index.name = 'business_key'
+        write_table(self.records.reset_index(), self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the business store, or diff a crawl against it.")
+    parser.add_argument('crawl', nargs='?', help="A crawl (e.g. businesses.parquet) to compare with the store.")
+    parser.add_argument('--store-file', default=STORE_FILE)
+    args = parser.parse_args()
+
+    store = BusinessStore(args.store_file)
+    print(f"'{args.store_file}': {len(store.records)} businesses.")
+    if args.crawl:
+        df = tag(read_table(args.crawl))
+        store.observe(df) # Not saved: only the enrichment stages record what they've seen
+        for stage in STAGE_COLUMNS:
+            if stage not in STAGE_INPUTS: # The others also depend on what earlier stages will find
+                report_skipped(stage, int(store.fresh(df, stage).sum()), len(df))
+    else:
+        for stage in STAGE_COLUMNS:
+            print(f"  {stage:<9}: {int(store.records[f'{stage}_hash'].notna().sum())} businesses with stored results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import threading
+import time
+from contextlib import contextmanager
+import undetected_chromedriver as uc
+from selenium.common.exceptions import WebDriverException
+from utils.resource_blocking import apply_blocking
+
+try:
+    import psutil
+except ImportError:
+    psutil = None # Without it drivers are only recycled by navigation count
+
+# --- Configuration ---
+MAX_NAVIGATIONS = 500 # Recycle a browser after this many page loads
+MAX_MEMORY_GROWTH_MB = 750 # ...or once it has grown this much beyond its first measurement
+MEMORY_CHECK_EVERY = 25 # Page loads between memory measurements
+
+# undetected_chromedriver patches the chromedriver binary on launch, which is
+# not safe to do from several threads at once.
+_launch_lock = threading.Lock()
+
+
+def launch_chrome(headless=False, arguments=(), page_load_timeout=None, launch_lock=None, blocked_urls=()):
+    """
+    Launches one undetected Chrome. `launch_lock` serializes launches across
+    processes (e.g. a multiprocessing Lock); threads are always serialized.
+    Requests matching `blocked_urls` (see utils.resource_blocking) are refused.
+    """
+    options = uc.ChromeOptions()
+    if headless:
+        options.add_argument('--headless')
+    for argument in arguments:
+        options.add_argument(argument)
+    with launch_lock or _launch_lock:
+        driver = uc.Chrome(options=options, use_subprocess=True)
+    if page_load_timeout:
+        driver.set_page_load_timeout(page_load_timeout)
+    if blocked_urls:
+        apply_blocking(driver, blocked_urls)
+    return driver
+
+
+def browser_memory_mb(driver):
+    """Resident memory of the driver's browser and every process it spawned, or None if it can't be measured."""
+    pid = getattr(driver, 'browser_pid', None)
+    if psutil is None or pid is None:
+        return None
+    try:
+        browser = psutil.Process(pid)
+        return sum(process.memory_info().rss for process in [browser] + browser.children(recursive=True)) / 2**20
+    except psutil.Error:
+        return None
+
+
+def is_healthy(driver):
+    """A cheap round trip through the driver: False if the browser or its session is gone."""
+    try:
+        return driver.execute_script("return 1;") == 1 and bool(driver.window_handles)
+    except WebDriverException:
+        return False
+    except Exception:
+        return False # The chromedriver process itself died (connection refused, etc.)
+
+
+class PooledDriver:
+    """One pooled browser and the counters the pool recycles it by."""
+
+    def __init__(self, driver, launch_seconds):
+        self.driver = driver
+        self.launch_seconds = launch_seconds
+        self.navigations = 0
+        self.baseline_mb = None
+        self.checked_at = 0 # Navigation count at the last memory measurement
+
+        get = driver.get
+
+        def counting_get(url):
+            self.navigations += 1
+            return get(url)
+
+        driver.get = counting_get
+        driver.pooled = self # For count_navigation
+
+
+def count_navigation(driver):
+    """
+    Counts a page load that didn't go through driver.get (a clicked link or
+    button) toward the pooled browser's recycling. Does nothing for a driver
+    that isn't pooled.
+    """
+    pooled = getattr(driver, 'pooled', None)
+    if pooled is not None:
+        pooled.navigations += 1
+
+
+class DriverPool:
+    """
+    Reusable browsers for one stage, so Chrome is launched (and chromedriver
+    patched) once per browser rather than once per use:
+      - with prewarm, `size` browsers are launched in the background right away,
+      - acquire() hands out an idle browser after a health check, replacing dead ones,
+      - release() retires a browser after max_navigations page loads (driver.get
+        calls, plus clicks reported with count_navigation), or once its
+        memory has grown by max_memory_growth_mb, and warms up its replacement,
+      - report() prints launch times and pages served per browser.
+    """
+
+    def __init__(self, factory=launch_chrome, size=1, prewarm=True, max_navigations=MAX_NAVIGATIONS,
+                 max_memory_growth_mb=MAX_MEMORY_GROWTH_MB, name='browser pool'):
+        self.factory = factory
+        self.size = max(size, 1)
+        self.prewarm = prewarm
+        self.max_navigations = max_navigations
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.name = name
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock) # Notified when a browser goes idle or a slot is freed
+        self.idle = [] # Most recently used last
+        self.slots = 0 # Browsers launched or launching and not yet retired
+        self.in_use = {} # id(driver) -> PooledDriver
+        self.launch_times = []
+        self.retired = [] # (pages served, reason)
+        self.closed = False
+        if prewarm:
+            self._warm(self.size)
+
+    def _reserve_slot(self):
+        with self.lock:
+            if self.closed or self.slots >= self.size:
+                return False
+            self.slots += 1
+            return True
+
+    def _launch(self):
+        """Launches a browser into a reserved slot, freeing the slot if the launch fails."""
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self.lock:
+                self.slots -= 1
+                self.changed.notify_all() # A waiting acquire() can launch in this slot itself
+            raise
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.launch_times.append(seconds)
+        return PooledDriver(driver, seconds)
+
+    def _warm(self, count):
+        """Launches up to `count` browsers in a background thread and parks them as idle."""
+        def warm():
+            for _ in range(count):
+                if not self._reserve_slot():
+                    return
+                try:
+                    pooled = self._launch()
+                except Exception as e:
+                    print(f"[{self.name}] Could not pre-launch a browser: {e}")
+                    return
+                if self.closed:
+                    self._retire(pooled, 'closed')
+                else:
+                    self._park(pooled)
+
+        threading.Thread(target=warm, name=f"{self.name} warm-up", daemon=True).start()
+
+    def _park(self, pooled):
+        with self.lock:
+            self.idle.append(pooled)
+            self.changed.notify()
+
+    def _retire(self, pooled, reason):
+        with self.lock:
+            self.slots -= 1
+            self.retired.append((pooled.navigations, reason))
+            self.changed.notify_all()
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        """
+        A healthy browser for the caller's exclusive use; hand it back with release().
+        Waits while every browser is busy or still launching; if a launch fails the
+        caller launches in the freed slot itself, so a browser that won't start raises
+        here. Raises TimeoutError after `timeout` seconds without a browser.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                while not self.idle and (self.slots >= self.size or self.closed):
+                    if self.closed:
+                        raise RuntimeError(f"{self.name} is closed")
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"{self.name}: no browser became free within {timeout}s")
+                    self.changed.wait(remaining)
+                pooled = self.idle.pop() if self.idle else None
+                if pooled is None:
+                    self.slots += 1
+            if pooled is None:
+                pooled = self._launch()
+            if pooled.navigations and not is_healthy(pooled.driver):
+                self._retire(pooled, 'unhealthy')
+                continue
+            with self.lock:
+                self.in_use[id(pooled.driver)] = pooled
+            return pooled.driver
+
+    def _recycle_reason(self, pooled):
+        if pooled.navigations >= self.max_navigations:
+            return 'navigations'
+        if pooled.navigations - pooled.checked_at >= MEMORY_CHECK_EVERY or pooled.baseline_mb is None:
+            memory = browser_memory_mb(pooled.driver)
+            pooled.checked_at = pooled.navigations
+            if memory is not None:
+                if pooled.baseline_mb is None:
+                    pooled.baseline_mb = memory
+                elif memory - pooled.baseline_mb >= self.max_memory_growth_mb:
+                    return 'memory'
+        return None
+
+    def release(self, driver):
+        """Returns a browser to the pool, or retires it (and warms a replacement) if it is due for recycling."""
+        with self.lock:
+            pooled = self.in_use.pop(id(driver))
+        reason = 'closed' if self.closed else self._recycle_reason(pooled)
+        if reason is None:
+            self._park(pooled)
+            return
+        self._retire(pooled, reason)
+        if self.prewarm and not self.closed:
+            self._warm(1)
+
+    @contextmanager
+    def driver(self):
+        """`with pool.driver() as driver:` acquires a browser and always releases it."""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self, report=True):
+        """Quits every idle browser (busy ones are quit when released) and prints the pool's metrics."""
+        with self.lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.changed.notify_all()
+        for pooled in idle:
+            self._retire(pooled, 'closed')
+        if report:
+            self.report()
+
+    def report(self):
+        """Prints launch times and how many pages each browser served before it was retired."""
+        with self.lock:
+            launches, retired = list(self.launch_times), list(self.retired)
+        if not launches:
+            print(f"[{self.name}] No browsers launched.")
+            return
+        pages = [served for served, _ in retired]
+        reasons = {}
+        for _, reason in retired:
+            reasons[reason] = reasons.get(reason, 0) + 1
+        recycled = ', '.join(f"{reason} {count}" for reason, count in sorted(reasons.items()))
+        print(f"[{self.name}] {len(launches)} browser launch(es), startup avg {sum(launches) / len(launches):.1f}s "
+              f"(max {max(launches):.1f}s); pages per browser: {', '.join(map(str, pages)) or 'n/a'}; "
+              f"retired: {recycled or 'none'}")
@@ -1,47 +1,126 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Allow `python utils/enrich_and_score.py`
+
 import pandas as pd
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import numpy as np
+import argparse
+import queue
+import threading
 import time
+from urllib.parse import urljoin, urlencode
+from utils import sunbiz_http
+from utils.sunbiz_cache import SunbizCache, normalize_name, CACHE_FILE, TTL_DAYS, NEGATIVE_TTL_DAYS, NEGATIVE_STATUSES
+from utils.journal import Journal
+from utils.scoring import CALLS_PER_DAY, apply_scores, prioritize, SCORE_COMPONENTS
+from utils.exclusions import ExclusionIndex, EXCLUSIONS_FILE, report_avoided
+from utils.page_archive import ArchiveMiss, ARCHIVE_DIR, open_archive
+from utils.driver_pool import DriverPool, count_navigation
+from utils.table_io import read_table, write_table
+from utils.business_store import BusinessStore, STORE_FILE, report_skipped, tag
 
 # --- Configuration ---
-INPUT_CSV = 'businesses.csv'
-OUTPUT_XLSX = 'prioritized_call_list.xlsx'
-CALLS_PER_DAY = 50
+INPUT_FILE = 'businesses.parquet'
+OUTPUT_FILE = 'prioritized_call_list.parquet' # `python utils/table_io.py prioritized_call_list.parquet prioritized_call_list.xlsx` to open it in Excel
+CHECKPOINT_FILE = 'enrich_checkpoint.jsonl'
 SUNBIZ_SEARCH_URL = "https://search.sunbiz.org/Inquiry/CorporationRegistration/ByName"
+SUNBIZ_HOME_URL = "https://dos.fl.gov/sunbiz/"
+BY_NAME_SELECTOR = "#content > div.row > div.page-content.col-md-8 > ul:nth-child(5) > li:nth-child(1) > a"
+SEARCH_BUTTON_SELECTOR = "//input[@type='submit' and @value='Search Now']"
+DEFAULT_WORKERS = 1 # Number of browsers to run side by side
+LOOKUP_MODES = ['direct', 'click'] # 'direct' jumps straight to the results URL and falls back to clicking through
+DEFAULT_LOOKUP_MODE = 'direct'
+BACKENDS = ['selenium', 'http'] # 'http' fetches the server-rendered pages without a browser
+DEFAULT_BACKEND = 'selenium'
+REPLAY_BACKEND = 'replay' # Re-parses archived pages instead of fetching them
+ARCHIVE_STAGE = 'sunbiz' # How this script's pages are filed in the page archive
+WAIT_TIMEOUT = 10 # Shorter wait time for main loop
+RETRY_STATUSES = {"Scrape Error"} # The lookup failed (e.g. Chrome crashed) rather than answered; --resume redoes it
 
-# --- Scoring Weights ---
-CATEGORY_SCORES = {
-    'Accountants': 30, 'Financial Advisors': 30, 'Bookkeeping Services': 25,
-    'Tax Return Preparation': 25, 'Lawyers': 20, 'Plumbers': 10,
-    'Electricians': 10, 'Contractors': 10, 'Landscaping': 10,
-    'Restaurants': -20, 'Pizza': -25, 'Hair Salons': -10,
-    'Nail Salons': -10, 'default': 0
-}
-
-NAME_KEYWORDS = {"inc": 15, "llc": 15, "p.a.": 15, "pa": 15, "group": 15, "associates": 15, "company": 10, "corp": 15}
-ADDRESS_KEYWORDS = {"suite": 10, "ste": 10, "floor": 10, "#": 5, " bldg": 10}
-NATIONAL_CHAINS = ["h&r block", "jackson hewitt", "edward jones", "morgan stanley", "wells fargo", "raymond james", "ameriprise", "regions financial", "rbc wealth", "subway", "mcdonald's", "starbucks"]
-OWNER_FOUND_SCORE = 40
-INACTIVE_PENALTY = -1000
+def build_search_results_url(business_name):
+    """Builds the Sunbiz by-name results URL that the search form would submit to."""
+    name_order = ''.join(ch for ch in str(business_name).upper() if ch.isalnum())
+    query = urlencode({'inquiryType': 'EntityName', 'searchNameOrder': name_order, 'searchTerm': business_name})
+    return f"{urljoin(SUNBIZ_SEARCH_URL, 'SearchResults')}?{query}"
 
-def get_sunbiz_details_selenium(driver, business_name, wait):
+def read_search_results(driver, wait, archive=None, results_url=None):
     """
-    The final, working Selenium function to get details from Sunbiz.
-    Adapted from the successful test script.
+    Reads the Sunbiz results page the driver is currently on, follows the first
+    match to its detail page and returns (status, officers). Both pages go into
+    `archive` when given, the results page filed under `results_url`.
     """
     status = "ERROR"
     officers = []
-    HOME_URL = "https://dos.fl.gov/sunbiz/"
-    BY_NAME_SELECTOR = "#content > div.row > div.page-content.col-md-8 > ul:nth-child(5) > li:nth-child(1) > a"
-    SEARCH_BUTTON_SELECTOR = "//input[@type='submit' and @value='Search Now']"
+
+    wait.until(EC.presence_of_element_located((By.ID, "search-results")))
+    if archive is not None:
+        archive.put(ARCHIVE_STAGE, results_url or driver.current_url, driver.page_source, driver.current_url)
+
+    # --- NEW: User's optimization to check status on results page ---
+    try:
+        # The status is in the 3rd column of the first result row
+        status_cell = driver.find_element(By.CSS_SELECTOR, "#search-results tbody tr:first-child td:nth-child(3)")
+        if "INACT" in status_cell.text:
+            return "INACTIVE", [] # Return immediately, don't waste time clicking
+    except (NoSuchElementException, TimeoutException):
+        # If we can't find this for any reason, proceed as normal.
+        pass
+    # --- END NEW LOGIC ---
+
+    detail_links = driver.find_elements(By.CSS_SELECTOR, "td > a")
+    if not detail_links:
+        return "No Results Found", []
+    
+    detail_url = detail_links[0].get_attribute('href')
+    driver.get(detail_url)
+    
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.corporationName")))
+    if archive is not None:
+        archive.put(ARCHIVE_STAGE, detail_url, driver.page_source, driver.current_url)
     
     try:
-        driver.get(HOME_URL)
+        status_element = driver.find_element(By.XPATH, "//label[contains(text(),'Status')]/following-sibling::span")
+        status = status_element.text.strip()
+    except NoSuchElementException:
+        status = "Unknown"
+        
+    try:
+        # --- NEW, CORRECT PARSING LOGIC BASED ON USER'S HTML ---
+        # Find the parent div containing all officer details
+        officer_section = driver.find_element(By.XPATH, "//div[@class='detailSection' and .//span[contains(text(), 'Officer/Director Detail')]]")
+        # Get all the text within this section
+        full_text = officer_section.text
+        
+        # Split the text into lines and clean them
+        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
+        
+        # Loop through the lines to find titles and their corresponding names
+        for i, line in enumerate(lines):
+            if line.startswith("Title"):
+                # The name is usually the next line, as it's just raw text
+                if i + 1 < len(lines):
+                    potential_name = lines[i+1]
+                    # A simple check to ensure it's a name and not an address line
+                    if potential_name.isupper() and "," in potential_name:
+                        officers.append(potential_name.title())
+
+    except (NoSuchElementException, TimeoutException):
+        pass # It's okay if a business has no listed officers
+
+    return status, officers
+
+def get_sunbiz_details_selenium(driver, business_name, wait, archive=None):
+    """
+    The final, working Selenium function to get details from Sunbiz.
+    Adapted from the successful test script.
+    """
+    try:
+        driver.get(SUNBIZ_HOME_URL)
         wait.until(EC.element_to_be_clickable((By.LINK_TEXT, "Search Records"))).click()
+        count_navigation(driver)
         by_name_link = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, BY_NAME_SELECTOR)))
         target_url = by_name_link.get_attribute("href")
         driver.get(target_url)
@@ -49,117 +128,409 @@ def get_sunbiz_details_selenium(driver, business_name, wait):
         search_box = wait.until(EC.visibility_of_element_located((By.ID, "SearchTerm")))
         search_box.send_keys(business_name)
         wait.until(EC.element_to_be_clickable((By.XPATH, SEARCH_BUTTON_SELECTOR))).click()
+        count_navigation(driver)
         
-        wait.until(EC.presence_of_element_located((By.ID, "search-results")))
-
-        # --- NEW: User's optimization to check status on results page ---
-        try:
-            # The status is in the 3rd column of the first result row
-            status_cell = driver.find_element(By.CSS_SELECTOR, "#search-results tbody tr:first-child td:nth-child(3)")
-            if "INACT" in status_cell.text:
-                return "INACTIVE", [] # Return immediately, don't waste time clicking
-        except (NoSuchElementException, TimeoutException):
-            # If we can't find this for any reason, proceed as normal.
-            pass
-        # --- END NEW LOGIC ---
-
-        detail_links = driver.find_elements(By.CSS_SELECTOR, "td > a")
-        if not detail_links:
-            return "No Results Found", []
-        
-        detail_url = detail_links[0].get_attribute('href')
-        driver.get(detail_url)
-        
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.corporationName")))
-        
-        try:
-            status_element = driver.find_element(By.XPATH, "//label[contains(text(),'Status')]/following-sibling::span")
-            status = status_element.text.strip()
-        except NoSuchElementException:
-            status = "Unknown"
-            
-        try:
-            # --- NEW, CORRECT PARSING LOGIC BASED ON USER'S HTML ---
-            # Find the parent div containing all officer details
-            officer_section = driver.find_element(By.XPATH, "//div[@class='detailSection' and .//span[contains(text(), 'Officer/Director Detail')]]")
-            # Get all the text within this section
-            full_text = officer_section.text
-            
-            # Split the text into lines and clean them
-            lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-            
-            # Loop through the lines to find titles and their corresponding names
-            for i, line in enumerate(lines):
-                if line.startswith("Title"):
-                    # The name is usually the next line, as it's just raw text
-                    if i + 1 < len(lines):
-                        potential_name = lines[i+1]
-                        # A simple check to ensure it's a name and not an address line
-                        if potential_name.isupper() and "," in potential_name:
-                            officers.append(potential_name.title())
-
-        except (NoSuchElementException, TimeoutException):
-            pass # It's okay if a business has no listed officers
-
-        return status, officers
+        return read_search_results(driver, wait, archive, build_search_results_url(business_name))
 
     except Exception:
         # Don't log the full stack trace for a single failed lookup
         return "Scrape Error", []
 
+def get_sunbiz_details_direct(driver, business_name, wait, archive=None):
+    """
+    Fast path: loads the search results URL directly instead of walking
+    home page -> Search Records -> By Name -> search form.
+    """
+    try:
+        results_url = build_search_results_url(business_name)
+        driver.get(results_url)
+        return read_search_results(driver, wait, archive, results_url)
+    except Exception:
+        return "Scrape Error", []
+
+def lookup_sunbiz(driver, business_name, wait, mode=DEFAULT_LOOKUP_MODE, archive=None):
+    """
+    Looks a business up using the requested mode and returns
+    (status, officers, path, seconds), where `path` records how the answer was
+    reached: 'direct', 'fallback' (direct failed, clicked through) or 'click'.
+    """
+    start = time.perf_counter()
+    if mode == 'direct':
+        status, officers = get_sunbiz_details_direct(driver, business_name, wait, archive)
+        path = 'direct'
+        if status == "Scrape Error":
+            status, officers = get_sunbiz_details_selenium(driver, business_name, wait, archive)
+            path = 'fallback'
+    else:
+        status, officers = get_sunbiz_details_selenium(driver, business_name, wait, archive)
+        path = 'click'
+    return status, officers, path, round(time.perf_counter() - start, 2)
+
+def lookup_pages(fetch, business_name):
+    """
+    The Sunbiz lookup over server-rendered HTML, wherever it comes from:
+    fetch(url) returns (final_url, html). Returns (status, officers, detail_url).
+    """
+    page_url, page_html = fetch(build_search_results_url(business_name))
+    status, detail_url = sunbiz_http.parse_search_results(page_html, page_url)
+    if detail_url is None:
+        return status, [], None
+    _, detail_html = fetch(detail_url)
+    status, officers = sunbiz_http.parse_detail_page(detail_html)
+    return status, officers, detail_url
+
+def get_sunbiz_details_http(session, business_name, archive=None):
+    """
+    Same lookup as the Selenium functions, but over plain HTTP. Returns
+    (status, officers, detail_url); the status is "Scrape Error" when a request
+    fails or a page doesn't look server-rendered, so the caller can retry in a browser.
+    """
+    def fetch(url):
+        page_url, page_html = sunbiz_http.fetch(session, url)
+        if archive is not None:
+            archive.put(ARCHIVE_STAGE, url, page_html, page_url)
+        return page_url, page_html
+
+    try:
+        return lookup_pages(fetch, business_name)
+    except Exception:
+        return "Scrape Error", [], None
+
+def get_sunbiz_details_replay(archive, business_name):
+    """
+    The lookup re-run over the page archive with no network. Returns
+    "Not Archived" for businesses whose pages were never fetched.
+    """
+    try:
+        return lookup_pages(lambda url: archive.fetch(url, ARCHIVE_STAGE), business_name)
+    except ArchiveMiss:
+        return "Not Archived", [], None
+    except Exception:
+        return "Scrape Error", [], None
+
+class SunbizWorker:
+    """
+    One worker's connection to Sunbiz. Browser lookups borrow a browser from
+    `pool` for each lookup; the http backend owns a pooled HTTP session and only
+    needs a browser when a page does; the replay backend only reads the page
+    archive. Every page fetched goes into `archive` when given.
+    """
+
+    def __init__(self, backend=DEFAULT_BACKEND, mode=DEFAULT_LOOKUP_MODE, archive=None, pool=None):
+        self.backend = backend
+        self.mode = mode
+        self.archive = archive
+        self.pool = pool
+        self.session = sunbiz_http.create_session() if backend == 'http' else None
+
+    def _browser_lookup(self, business_name):
+        with self.pool.driver() as driver:
+            status, officers, path, seconds = lookup_sunbiz(driver, business_name, WebDriverWait(driver, WAIT_TIMEOUT),
+                                                            self.mode, self.archive)
+            try:
+                current_url = driver.current_url
+            except Exception:
+                current_url = ""
+        detail_url = current_url if 'SearchResultDetail' in current_url else None
+        return status, officers, path, seconds, detail_url
+
+    def lookup(self, business_name):
+        """Returns (status, officers, path, seconds, detail_url) for one business."""
+        start = time.perf_counter()
+        if self.backend == REPLAY_BACKEND:
+            status, officers, detail_url = get_sunbiz_details_replay(self.archive, business_name)
+            return status, officers, REPLAY_BACKEND, round(time.perf_counter() - start, 2), detail_url
+        if self.backend != 'http':
+            return self._browser_lookup(business_name)
+
+        status, officers, detail_url = get_sunbiz_details_http(self.session, business_name, self.archive)
+        if status != "Scrape Error":
+            return status, officers, 'http', round(time.perf_counter() - start, 2), detail_url
+
+        try:
+            status, officers, path, _, detail_url = self._browser_lookup(business_name)
+        except Exception:
+            return status, officers, 'http', round(time.perf_counter() - start, 2), None
+        return status, officers, f"http>{path}", round(time.perf_counter() - start, 2), detail_url
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+def _sunbiz_worker(work_queue, results, progress, backend, mode, archive, pool):
+    """Owns one SunbizWorker and pulls (index, name) jobs off the shared queue until it is empty."""
+    worker = SunbizWorker(backend, mode, archive, pool)
+    try:
+        while True:
+            try:
+                index, name = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                results[index] = worker.lookup(name)
+            except Exception as e:
+                print(f"Worker {threading.current_thread().name} stopped: {e}")
+                break
+            progress(index, name, results[index])
+    finally:
+        worker.close()
+
+def run_sunbiz_lookups(lookups, workers=DEFAULT_WORKERS, progress=None, mode=DEFAULT_LOOKUP_MODE, backend=DEFAULT_BACKEND,
+                       archive=None):
+    """
+    Runs the Sunbiz lookup for every (index, name) pair in `lookups` and returns
+    a dict of index -> (status, officers, path, seconds, detail_url).
+
+    With workers=1 everything happens on a single worker in the calling thread.
+    Otherwise `workers` threads each own their own HTTP session and share one
+    work queue, so a slow lookup never holds up the others. Browsers come from
+    one pool of up to `workers` reused Chrome instances, pre-launched for the
+    selenium backend and launched on demand for the http fallback.
+    """
+    results = {}
+    progress = progress or (lambda index, name, result: None)
+    pool = None if backend == REPLAY_BACKEND else DriverPool(size=min(workers, len(lookups)), prewarm=backend == 'selenium',
+                                                             name='sunbiz browsers')
+
+    if workers <= 1:
+        worker = SunbizWorker(backend, mode, archive, pool)
+        try:
+            for index, name in lookups:
+                results[index] = worker.lookup(name)
+                progress(index, name, results[index])
+        finally:
+            worker.close()
+            if pool is not None:
+                pool.close()
+        return results
+
+    work_queue = queue.Queue()
+    for job in lookups:
+        work_queue.put(job)
+
+    threads = [
+        threading.Thread(target=_sunbiz_worker, args=(work_queue, results, progress, backend, mode, archive, pool), name=f"sunbiz-{n + 1}")
+        for n in range(min(workers, len(lookups)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if pool is not None:
+        pool.close()
+
+    # Anything left over means every worker died before the queue drained.
+    for index, _ in lookups:
+        results.setdefault(index, ("Scrape Error", [], mode, 0.0, None))
+    return results
+
+def journal_record(index, name, result):
+    """The checkpoint line written for one finished row."""
+    status, officers, path, seconds, detail_url = result
+    return {'index': int(index), 'name': str(name), 'status': status, 'officers': officers,
+            'path': path, 'seconds': seconds, 'detail_url': detail_url}
+
+def load_checkpoint(path, df):
+    """
+    Reads finished rows back from the checkpoint journal. Rows whose name no
+    longer matches the input (a different businesses.parquet) are ignored, and
+    rows whose lookup ended in one of RETRY_STATUSES aren't finished.
+    """
+    done = {}
+    for record in Journal.read(path):
+        index = record['index']
+        if index not in df.index or str(df.at[index, 'name']) != record['name']:
+            continue
+        if record['status'] in RETRY_STATUSES:
+            done.pop(index, None)
+        else:
+            done[index] = (record['status'], record['officers'], record['path'], record['seconds'], record['detail_url'])
+    return done
+
+def resolve_sunbiz(lookups, workers=DEFAULT_WORKERS, progress=None, mode=DEFAULT_LOOKUP_MODE,
+                   backend=DEFAULT_BACKEND, cache=None, journal=None, archive=None, retry_errors=False):
+    """
+    Wraps run_sunbiz_lookups with the persistent cache and in-run de-duplication:
+    names answered by the cache are never looked up, and names that appear on
+    several rows (multi-location businesses) are looked up once and fanned out.
+    With retry_errors, cached RETRY_STATUSES answers are looked up again.
+    Every row is appended to `journal` as soon as its answer is known.
+    Returns the same index -> result dict for every row in `lookups`.
+    """
+    results = {}
+    pending = {} # normalized name -> row indices waiting on one lookup
+
+    def finish(index, name, result):
+        results[index] = result
+        if journal is not None:
+            journal.append(journal_record(index, name, result))
+
+    for index, name in lookups:
+        cached = cache.get(name) if cache is not None else None
+        if cached is not None and not (retry_errors and cached[0] in RETRY_STATUSES):
+            status, officers, detail_url = cached
+            finish(index, name, (status, officers, 'cache', 0.0, detail_url))
+        else:
+            pending.setdefault(normalize_name(name), []).append((index, name))
+
+    unique_lookups = [rows[0] for rows in pending.values()]
+    print(f"Sunbiz: {len(lookups)} rows -> {len(results)} cached, {len(unique_lookups)} unique names to look up.")
+
+    def store(index, name, result):
+        status, officers, path, seconds, detail_url = result
+        if cache is not None:
+            cache.put(name, status, officers, detail_url)
+        for row_index, row_name in pending[normalize_name(name)]:
+            if row_index == index:
+                finish(row_index, row_name, result)
+            else:
+                finish(row_index, row_name, (status, officers, 'duplicate', 0.0, detail_url))
+        if progress:
+            progress(index, name, result)
+
+    fetched = run_sunbiz_lookups(unique_lookups, workers=workers, progress=store, mode=mode, backend=backend,
+                                 archive=archive) if unique_lookups else {}
+
+    # Lookups that never reported back (every worker died) still need an answer.
+    for rows in pending.values():
+        first_index, first_name = rows[0]
+        if first_index not in results:
+            for index, name in rows:
+                finish(index, name, fetched[first_index])
+    return results
+
+def print_lookup_path_summary(results):
+    """Prints how many lookups took each path and their average time, so the fast path can be measured."""
+    by_path = {}
+    for status, owners, path, seconds, detail_url in results.values():
+        by_path.setdefault(path, []).append(seconds)
+    for path, timings in sorted(by_path.items()):
+        print(f"  {path:<14}: {len(timings):>5} lookups, avg {sum(timings) / len(timings):.2f}s")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enrich businesses with Sunbiz data and build the prioritized call list.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Number of browsers to run in parallel (1 keeps the original single-driver behaviour).")
+    parser.add_argument('--lookup-mode', choices=LOOKUP_MODES, default=DEFAULT_LOOKUP_MODE,
+                        help="'direct' opens the results URL straight away, 'click' always walks the home page flow.")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="'http' fetches Sunbiz pages without a browser and only falls back to Selenium when a page needs JS.")
+    parser.add_argument('--cache-file', default=CACHE_FILE, help="SQLite file holding previous Sunbiz lookups.")
+    parser.add_argument('--cache-ttl-days', type=float, default=TTL_DAYS, help="Days a found business stays cached.")
+    parser.add_argument('--negative-ttl-days', type=float, default=NEGATIVE_TTL_DAYS,
+                        help="Days a 'No Results Found' or 'Scrape Error' answer stays cached.")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore the cache and look every business up again.")
+    parser.add_argument('--checkpoint-file', default=CHECKPOINT_FILE, help="Append-only journal of finished rows.")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip rows already in the checkpoint journal and only look up the rest. Rows whose "
+                             "lookup ended in a 'Scrape Error' (e.g. a Chrome crash) are looked up again, even if cached.")
+    parser.add_argument('--exclusions-file', default=EXCLUSIONS_FILE,
+                        help="Chains and other businesses that are never looked up (JSON).")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help="Page archive every fetched Sunbiz page is saved to.")
+    parser.add_argument('--no-archive', action='store_true', help="Don't keep the fetched HTML.")
+    parser.add_argument('--replay', action='store_true',
+                        help="No network: re-parse every lookup from the page archive (skips the cache, checkpoint and store).")
+    parser.add_argument('--store-file', default=STORE_FILE,
+                        help="Master store of every business crawled so far and what each stage found for it.")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Look up every business, even ones unchanged since their answer was stored.")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    started = time.time()
+    archive = open_archive(args.archive_dir, enabled=args.replay or not args.no_archive)
+    if args.replay:
+        # Every row is re-extracted from archived pages; cached answers or a checkpoint would skip that
+        args.backend, args.no_cache, args.resume = REPLAY_BACKEND, True, False
+
     print("Loading data...")
-    df = pd.read_csv('businesses.csv')
+    df = read_table(INPUT_FILE)
     df.columns = df.columns.str.strip()
+    df = tag(df) # business_key and listing_hash, carried through every later stage
     print(f"Loaded {len(df)} businesses.")
 
     df['ai_score'] = 0
     df['owner_name'] = ""
     df['sunbiz_status'] = ""
-    df['is_chain'] = False
+    df['sunbiz_path'] = ""
+    df['sunbiz_seconds'] = 0.0
 
-    # --- Set up Selenium WebDriver ---
-    print("Setting up Selenium WebDriver...")
-    driver = uc.Chrome(options=uc.ChromeOptions(), use_subprocess=True)
-    wait = WebDriverWait(driver, 10) # Shorter wait time for main loop
+    # --- Rows finished by a previous, interrupted run ---
+    finished = load_checkpoint(args.checkpoint_file, df) if args.resume else {}
+    if args.resume:
+        print(f"Resuming: {len(finished)} rows already in '{args.checkpoint_file}'.")
 
-    print("Starting enrichment process. This will be slow but accurate...")
-    for index, row in df.iterrows():
-        score = 0
-        name_lower = str(row['name']).lower()
-        
-        score += CATEGORY_SCORES.get(str(row['category']), CATEGORY_SCORES['default'])
-        if any(chain in name_lower for chain in NATIONAL_CHAINS):
-            score += INACTIVE_PENALTY # Use the same penalty to filter chains
-            df.at[index, 'is_chain'] = True
-            status, owners = "N/A (Chain)", []
-        else:
-            status, owners = get_sunbiz_details_selenium(driver, row['name'], wait)
-            if owners:
-                score += OWNER_FOUND_SCORE
-            if status == 'INACTIVE':
-                score += INACTIVE_PENALTY
-        
+    # --- Chains and other exclusions are flagged up front; everything else needs a Sunbiz lookup ---
+    exclusions = ExclusionIndex.load(args.exclusions_file)
+    df = exclusions.tag(df)
+    report_avoided('Sunbiz', int(df['excluded'].sum()))
+
+    # --- Businesses whose listing hasn't changed since their answer was stored keep that answer ---
+    store = None if args.no_store or args.replay else BusinessStore(args.store_file)
+    carried = pd.Series(False, index=df.index)
+    if store is not None:
+        store.observe(df)
+        carried = store.fresh(df, 'sunbiz') & ~df['excluded']
+        store.carry_forward(df, 'sunbiz', carried)
+        df.loc[carried, 'sunbiz_path'] = 'store'
+        report_skipped('Sunbiz', int(carried.sum()), int((~df['excluded']).sum()))
+    lookups = [(index, name) for index, name in df.loc[~df['excluded'] & ~carried, 'name'].items() if index not in finished]
+
+    print_lock = threading.Lock()
+    done = [0]
+
+    def report(index, name, result):
+        status, owners, path, seconds, detail_url = result
+        with print_lock:
+            done[0] += 1
+            print(f"{done[0]}: {str(name)[:30]:<30} | Status: {status:<10} | Owner(s): {len(owners)} | {path} {seconds:.1f}s")
+
+    cache = None if args.no_cache else SunbizCache(args.cache_file, args.cache_ttl_days, args.negative_ttl_days)
+    journal = None if args.replay else Journal(args.checkpoint_file, resume=args.resume)
+
+    print(f"Starting enrichment process with {args.workers} {args.backend} worker(s)...")
+    results = resolve_sunbiz(lookups, workers=args.workers, progress=report, mode=args.lookup_mode,
+                             backend=args.backend, cache=cache, journal=journal, archive=archive,
+                             retry_errors=args.resume)
+    if journal is not None:
+        journal.close()
+    results.update(finished)
+    print("\nEnrichment complete.")
+    print_lookup_path_summary(results)
+    if cache is not None:
+        print(f"Sunbiz cache: {cache.hits} hits, {cache.misses} misses ({cache.path}).")
+        cache.close()
+    if archive is not None:
+        if not args.replay:
+            archive.report(ARCHIVE_STAGE, started)
+        archive.close()
+
+    # --- Merge results back by row index ---
+    for index, (status, owners, path, seconds, detail_url) in results.items():
         df.at[index, 'owner_name'] = ', '.join(owners) if owners else ""
         df.at[index, 'sunbiz_status'] = status
-        df.at[index, 'ai_score'] = score
-        
-        print(f"{index+1}/{len(df)}: {row['name'][:30]:<30} | Status: {status:<10} | Owner(s): {len(owners)}")
+        df.at[index, 'sunbiz_path'] = path
+        df.at[index, 'sunbiz_seconds'] = seconds
+    df.loc[df['excluded'], 'sunbiz_status'] = "N/A (Excluded)"
+    df.loc[df['is_chain'], 'sunbiz_status'] = "N/A (Chain)"
 
-    driver.quit()
-    print("\nEnrichment complete.")
-    
-    # --- Final Processing ---
-    df_sorted = df.sort_values(by='ai_score', ascending=False).reset_index(drop=True)
-    df_sorted['call_day'] = np.arange(len(df_sorted)) // 50 + 1
+    # Negative answers and errors are left to the Sunbiz cache's short TTL
+    if store is not None:
+        looked_up = df.index.isin(list(results)) & ~df['sunbiz_status'].isin(NEGATIVE_STATUSES | {"ERROR"})
+        store.update(df, 'sunbiz', looked_up)
+        store.save()
+
+    # --- Score (no network from here on; `python utils/scoring.py` re-scores the saved list) ---
+    df_sorted = prioritize(apply_scores(df, exclusions=exclusions), CALLS_PER_DAY)
     df_sorted['status'] = "New"
     df_sorted['notes'] = ""
-    
-    final_cols = ['call_day', 'ai_score', 'sunbiz_status', 'status', 'notes', 'name', 'owner_name', 'phone', 'category', 'address', 'locality', 'is_chain']
+
+    final_cols = ['call_day', 'ai_score', 'sunbiz_status', 'status', 'notes', 'name', 'owner_name', 'phone', 'category', 'address', 'locality', 'website', 'detail_url', 'listing_id', 'is_chain', 'excluded', 'exclusion_reason', 'sunbiz_path', 'sunbiz_seconds', 'business_key', 'listing_hash'] + SCORE_COMPONENTS
     df_final = df_sorted[[c for c in final_cols if c in df_sorted.columns]]
 
-    df_final.to_excel('prioritized_call_list.xlsx', index=False)
-    print("Done! Saved to prioritized_call_list.xlsx")
+    write_table(df_final, OUTPUT_FILE)
+    print(f"Done! Saved to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,200 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Allow `python utils/entity_resolution.py`
+
+import argparse
+import re
+import time
+import numpy as np
+import pandas as pd
+from utils.scoring import NAME_KEYWORDS
+from utils.table_io import read_table, write_table
+
+# --- Configuration ---
+# Legal forms are dropped from the end of a name before comparing: the legal-entity
+# keywords the scorer rewards, plus their long and less common spellings.
+LEGAL_SUFFIXES = sorted({keyword.replace('.', '') for keyword in NAME_KEYWORDS} - {'group', 'associates'}
+                        | {'incorporated', 'corporation', 'co', 'ltd', 'pllc', 'llp', 'pc', 'and'})
+ADDRESS_ABBREVIATIONS = {
+    'street': 'st', 'avenue': 'ave', 'boulevard': 'blvd', 'drive': 'dr', 'road': 'rd', 'lane': 'ln',
+    'court': 'ct', 'place': 'pl', 'parkway': 'pkwy', 'highway': 'hwy', 'circle': 'cir', 'terrace': 'ter',
+    'suite': 'ste', 'unit': 'ste', 'building': 'bldg', 'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+}
+MATCH_THRESHOLD = 0.8 # Name similarity (bigram Dice, 0-1) to merge two businesses sharing a phone or address
+NAME_ONLY_THRESHOLD = 0.95 # ...and to merge two that only have similar names
+MAX_BLOCK_SIZE = 50 # Blocks up to this many distinct names are compared all-pairs...
+WINDOW = 4 # ...larger ones only against the next WINDOW names in alphabetical order
+NAME_TOKEN_KEYS = 2 # Each name is blocked under its rarest tokens, this many of them
+
+_NAME_ALPHABET = {char: i for i, char in enumerate(' abcdefghijklmnopqrstuvwxyz0123456789')} # All a normalized name contains
+_SUFFIX_PATTERN = re.compile(r'(?:\s+(?:' + '|'.join(map(re.escape, LEGAL_SUFFIXES)) + r'))+$')
+_ADDRESS_PATTERN = re.compile(r'\b(?:' + '|'.join(ADDRESS_ABBREVIATIONS) + r')\b')
+
+
+def normalize_names(names):
+    """
+    Lower-cases names, spells '&' as 'and', drops punctuation and then any trailing
+    legal suffixes, so "Seminole Accountants, Inc." and "Seminole Accountants Inc"
+    both become "seminole accountants". Blank names come back as ''.
+    """
+    names = names.fillna('').astype(str).str.lower().str.replace('&', ' and ', regex=False)
+    names = names.str.replace(r"[.']", '', regex=True).str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+    names = names.str.replace(_SUFFIX_PATTERN, '', regex=True)
+    return names.str.replace(r'^the\s+', '', regex=True)
+
+
+def normalize_addresses(addresses):
+    """Lower-cased street addresses with punctuation dropped and the usual street/unit words abbreviated."""
+    addresses = addresses.fillna('').astype(str).str.lower().str.replace('#', ' ste ', regex=False)
+    addresses = addresses.str.replace('.', '', regex=False).str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+    return addresses.str.replace(_ADDRESS_PATTERN, lambda match: ADDRESS_ABBREVIATIONS[match.group()], regex=True)
+
+
+def normalize_phones(phones):
+    """The last 10 digits of each phone number; '' when there are fewer than 7 digits."""
+    digits = phones.fillna('').astype(str).str.replace(r'\D', '', regex=True).str[-10:]
+    return digits.where(digits.str.len() >= 7, '')
+
+
+def bigrams(name):
+    """
+    The character bigrams of a normalized name (padded so the first and last
+    letters count too) as a bitset: one bit per possible bigram, so a pair's
+    shared bigrams are `(a & b).bit_count()` and a name costs ~200 bytes.
+    """
+    codes = [_NAME_ALPHABET[char] for char in f" {name} "]
+    bits = 0
+    for first, second in zip(codes, codes[1:]):
+        bits |= 1 << (first * len(_NAME_ALPHABET) + second)
+    return bits
+
+
+class EntityResolver:
+    """
+    Groups rows that are the same business under a cluster ID, without comparing
+    every pair of rows:
+      - names are normalized, and rows with the same normalized name are merged outright,
+      - the distinct names are blocked by shared phone, normalized address and their
+        rarest name tokens; only names sharing a block are ever compared,
+      - a pair is merged (union-find) when its bigram similarity reaches the threshold,
+        or the stricter name_only_threshold when it was only blocked by name token.
+    Blocks too big to compare all-pairs fall back to a sorted-neighbourhood window.
+    """
+
+    def __init__(self, threshold=MATCH_THRESHOLD, name_only_threshold=NAME_ONLY_THRESHOLD,
+                 max_block_size=MAX_BLOCK_SIZE, window=WINDOW):
+        self.threshold = threshold
+        self.name_only_threshold = name_only_threshold
+        self.max_block_size = max_block_size
+        self.window = window
+        self.stats = {}
+
+    def _find(self, code):
+        parent = self.parent
+        while parent[code] != code:
+            parent[code] = parent[parent[code]] # Path halving
+            code = parent[code]
+        return code
+
+    def _compare_block(self, codes, threshold):
+        """Compares the distinct names of one block and merges every pair over the threshold."""
+        if len(codes) > self.max_block_size:
+            self.stats['windowed blocks'] += 1
+            codes = sorted(codes, key=self.names.__getitem__)
+            pairs = ((codes[i], codes[j]) for i in range(len(codes)) for j in range(i + 1, min(i + 1 + self.window, len(codes))))
+        else:
+            pairs = ((codes[i], codes[j]) for i in range(len(codes)) for j in range(i + 1, len(codes)))
+        grams, sizes, find = self.grams, self.sizes, self._find
+        comparisons = merges = 0
+        for a, b in pairs:
+            # Dice can't exceed 2 * min / sum of the bigram counts: skip pairs whose lengths rule a match out
+            if 2 * min(sizes[a], sizes[b]) < threshold * (sizes[a] + sizes[b]):
+                continue
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue # Already linked through another block
+            comparisons += 1
+            if 2 * (grams[a] & grams[b]).bit_count() >= threshold * (sizes[a] + sizes[b]):
+                self.parent[max(root_a, root_b)] = min(root_a, root_b)
+                merges += 1
+        self.stats['comparisons'] += comparisons
+        self.stats['fuzzy merges'] += merges
+
+    def _blocks(self, keys, codes):
+        """The distinct name codes of every key shared by at least two distinct names, one list per key."""
+        pairs = pd.DataFrame({'key': keys, 'code': codes})
+        pairs = pairs[(pairs['key'] != '') & (pairs['code'] >= 0)].drop_duplicates()
+        pairs = pairs[pairs.duplicated('key', keep=False)].sort_values('key', kind='stable')
+        key_ids = pd.factorize(pairs['key'])[0]
+        starts = np.flatnonzero(np.diff(key_ids, prepend=-1))
+        block_codes = pairs['code'].to_numpy().tolist()
+        return [block_codes[start:end] for start, end in zip(starts, np.append(starts[1:], len(block_codes)))]
+
+    def _token_keys(self):
+        """(token, name code) for each name's NAME_TOKEN_KEYS rarest tokens of 3+ characters."""
+        tokens = pd.Series(self.names, dtype=object).str.split().explode().dropna()
+        tokens = tokens[tokens.str.len() >= 3]
+        frequency = tokens.map(tokens.value_counts())
+        ranked = pd.DataFrame({'token': tokens.to_numpy(), 'code': tokens.index.to_numpy(), 'frequency': frequency.to_numpy()})
+        ranked = ranked.sort_values(['code', 'frequency', 'token'], kind='stable').groupby('code').head(NAME_TOKEN_KEYS)
+        return ranked['token'].to_numpy(), ranked['code'].to_numpy()
+
+    def cluster(self, df):
+        """
+        A cluster ID per row of `df` (needs 'name'; 'phone' and 'address' are used
+        when present). IDs are dense and numbered in order of first appearance;
+        rows without a name are each their own cluster.
+        """
+        start = time.perf_counter()
+        self.stats = {'rows': len(df), 'comparisons': 0, 'fuzzy merges': 0, 'windowed blocks': 0}
+        normalized = normalize_names(df['name'])
+        codes, names = pd.factorize(normalized.where(normalized != '')) # Blank names get code -1
+        self.names = names.to_numpy(dtype=object).tolist()
+        self.parent = list(range(len(self.names)))
+        self.grams = [bigrams(name) for name in self.names]
+        self.sizes = [grams.bit_count() for grams in self.grams]
+        self.stats['distinct names'] = len(self.names)
+
+        for column, normalize in (('phone', normalize_phones), ('address', normalize_addresses)):
+            if column in df:
+                for block in self._blocks(normalize(df[column]).to_numpy(), codes):
+                    self._compare_block(block, self.threshold)
+        tokens, token_codes = self._token_keys()
+        for block in self._blocks(tokens, token_codes):
+            self._compare_block(block, self.name_only_threshold)
+
+        roots = np.array([self._find(code) for code in range(len(self.names))], dtype=np.int64)
+        row_roots = np.where(codes >= 0, roots[np.maximum(codes, 0)], -1 - np.arange(len(df)))
+        cluster_ids = pd.factorize(row_roots)[0]
+        self.stats['clusters'] = int(cluster_ids.max()) + 1 if len(df) else 0
+        self.stats['seconds'] = time.perf_counter() - start
+        self.grams = self.sizes = None
+        return pd.Series(cluster_ids, index=df.index, name='cluster_id')
+
+    def report(self):
+        stats = self.stats
+        print(f"Entity resolution: {stats['rows']} rows, {stats['distinct names']} distinct names -> {stats['clusters']} "
+              f"businesses ({stats['fuzzy merges']} fuzzy merges from {stats['comparisons']} comparisons, "
+              f"{stats['windowed blocks']} oversized blocks windowed) in {stats['seconds']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag near-duplicate businesses in a stage file with a shared cluster_id.")
+    parser.add_argument('input', help="Parquet, CSV or XLSX with a 'name' column (and ideally 'phone' and 'address').")
+    parser.add_argument('output', nargs='?', help="Where to save it (defaults to overwriting the input).")
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD)
+    args = parser.parse_args()
+
+    df = read_table(args.input)
+    resolver = EntityResolver(threshold=args.threshold)
+    df['cluster_id'] = resolver.cluster(df)
+    resolver.report()
+    merged = df[df.duplicated('cluster_id', keep=False)].sort_values('cluster_id')
+    if len(merged):
+        print(merged[['cluster_id', 'name', 'phone', 'address']].head(20).to_string(index=False))
+    write_table(df, args.output or args.input)
+    print(f"Saved {len(df)} rows to '{args.output or args.input}'.")
+
+
+if __name__ == "__main__":
+    main()
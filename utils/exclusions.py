@@ -0,0 +1,114 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Allow `python utils/exclusions.py`
+
+import argparse
+import json
+import re
+import pandas as pd
+from utils.table_io import read_table, write_table
+
+# --- Configuration ---
+EXCLUSIONS_FILE = 'exclusions.json'
+DEFAULT_CHAINS = ["h&r block", "jackson hewitt", "edward jones", "morgan stanley", "wells fargo", "raymond james", "ameriprise", "regions financial", "rbc wealth", "subway", "mcdonald's", "starbucks"]
+
+
+class ExclusionIndex:
+    """
+    Decides which businesses are never worth a network lookup. Three kinds of rule:
+      - chains: name substrings of national chains (flagged as is_chain),
+      - names: any other name substrings to skip,
+      - categories: whole categories to skip.
+    Every name rule is compiled into one case-insensitive pattern, so a whole
+    column is classified in a single vectorized pass.
+    """
+
+    def __init__(self, chains=DEFAULT_CHAINS, names=(), categories=()):
+        self.rules = {} # lower-cased term -> reason
+        for kind, terms in (('chain', chains), ('name', names)):
+            for term in terms:
+                self.rules.setdefault(term.lower(), f"{kind}: {term}")
+        self.chain_reasons = {reason for reason in self.rules.values() if reason.startswith('chain: ')}
+        self.categories = {category.lower(): f"category: {category}" for category in categories}
+        # Longest first so "wells fargo advisors" wins over "wells fargo".
+        terms = sorted(self.rules, key=len, reverse=True)
+        alternation = '|'.join(re.escape(t) for t in terms)
+        self.pattern = re.compile(f'({alternation})') if terms else None
+        self.any_pattern = f'(?:{alternation})' # Same terms without a capture group, for yes/no scans
+
+    @classmethod
+    def load(cls, path=EXCLUSIONS_FILE):
+        """Reads the rules from a JSON file; falls back to the built-in chain list if it doesn't exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get('chains', []), config.get('names', []), config.get('categories', []))
+
+    def __len__(self):
+        return len(self.rules) + len(self.categories)
+
+    def match(self, name, category=None):
+        """The reason a single business is excluded, or None."""
+        hit = self.pattern.search(str(name).lower()) if self.pattern else None
+        if hit:
+            return self.rules[hit.group(1)]
+        return self.categories.get(str(category).lower()) if category is not None else None
+
+    def classify(self, df):
+        """
+        Returns a DataFrame (same index as `df`) with 'is_chain', 'excluded' and
+        'exclusion_reason' ('' for rows that are kept).
+        """
+        reasons = pd.Series('', index=df.index, dtype=object)
+        if self.pattern is not None:
+            names = df['name'].fillna('').astype(str).str.lower()
+            # A plain yes/no scan is much cheaper than extracting; only pull the matched term for hits.
+            hit = names.str.contains(self.any_pattern, regex=True).to_numpy(dtype=bool)
+            if hit.any():
+                reasons[hit] = names[hit].str.extract(self.pattern, expand=False).map(self.rules).to_numpy(dtype=object)
+        if self.categories and 'category' in df:
+            by_category = df['category'].astype(object).fillna('').astype(str).str.lower().map(self.categories).fillna('')
+            reasons = reasons.where(reasons != '', by_category)
+
+        flags = pd.DataFrame(index=df.index)
+        flags['is_chain'] = reasons.isin(self.chain_reasons)
+        flags['excluded'] = (reasons != '').astype(bool)
+        flags['exclusion_reason'] = reasons
+        return flags
+
+    def tag(self, df):
+        """Returns a copy of `df` with the classify() columns (re)computed."""
+        tagged = df.copy()
+        flags = self.classify(tagged)
+        for col in flags.columns:
+            tagged[col] = flags[col]
+        return tagged
+
+
+def report_avoided(stage, excluded, lookups_per_row=1):
+    """Prints how much network work the exclusion index saved a stage."""
+    if excluded:
+        print(f"Exclusions: skipped {excluded} rows, avoiding {excluded * lookups_per_row} {stage} lookups.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag (or drop) chains and other excluded businesses in a stage file.")
+    parser.add_argument('input', help="Parquet, CSV or XLSX with at least a 'name' column, e.g. businesses.parquet.")
+    parser.add_argument('output', nargs='?', help="Where to save it (defaults to overwriting the input).")
+    parser.add_argument('--exclusions-file', default=EXCLUSIONS_FILE)
+    parser.add_argument('--drop', action='store_true', help="Remove excluded rows instead of tagging them.")
+    args = parser.parse_args()
+
+    index = ExclusionIndex.load(args.exclusions_file)
+    df = index.tag(read_table(args.input))
+    print(f"{int(df['excluded'].sum())} of {len(df)} rows match one of {len(index)} exclusion rules.")
+    print(df.loc[df['excluded'], 'exclusion_reason'].value_counts().to_string())
+    if args.drop:
+        df = df[~df['excluded']]
+    write_table(df, args.output or args.input)
+    print(f"Saved {len(df)} rows to '{args.output or args.input}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import pickle
+import shutil
+import tempfile
+import pandas as pd
+
+# --- Configuration ---
+BLOCK_ROWS = 10_000 # Rows per block written to (and read back from) a run
+
+
+class SortedRuns:
+    """
+    External merge sort for DataFrames too big to sort in memory. add() sorts a
+    chunk and spills it to a run file as pickled blocks; merge() streams every run
+    back and yields DataFrames in global order while holding only one block per run.
+    Rows are ordered by (primary, secondary); secondary must be unique, e.g. a row
+    number, which also makes the order stable. Both columns must be free of NaN.
+    """
+
+    def __init__(self, primary, secondary, directory=None, block_rows=BLOCK_ROWS):
+        self.primary = primary
+        self.secondary = secondary
+        self.block_rows = block_rows
+        self.directory = tempfile.mkdtemp(prefix='sorted_runs_', dir=directory)
+        self.paths = []
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, df):
+        """Sorts `df` and writes it out as one more run."""
+        if df.empty:
+            return
+        df = df.sort_values([self.primary, self.secondary], kind='stable')
+        path = os.path.join(self.directory, f"run-{len(self.paths):05d}.pkl")
+        with open(path, 'wb') as f:
+            for start in range(0, len(df), self.block_rows):
+                pickle.dump(df.iloc[start:start + self.block_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.paths.append(path)
+        self.rows += len(df)
+
+    @staticmethod
+    def _blocks(path):
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def merge(self):
+        """
+        Yields the rows of every run in (primary, secondary) order, a DataFrame at
+        a time. Each round emits everything up to the smallest last key among the
+        runs' current blocks, which is always safe, and at least one block is used up.
+        """
+        readers = [self._blocks(path) for path in self.paths]
+        heads = [next(reader, None) for reader in readers]
+        while True:
+            live = [i for i, head in enumerate(heads) if head is not None]
+            if not live:
+                return
+            bound_primary, bound_secondary = min((heads[i][self.primary].iat[-1], heads[i][self.secondary].iat[-1]) for i in live)
+            taken = []
+            for i in live:
+                block = heads[i]
+                primary, secondary = block[self.primary], block[self.secondary]
+                count = int(((primary < bound_primary) | ((primary == bound_primary) & (secondary <= bound_secondary))).sum())
+                if count:
+                    taken.append(block.iloc[:count])
+                    heads[i] = block.iloc[count:] if count < len(block) else next(readers[i], None)
+            yield pd.concat(taken).sort_values([self.primary, self.secondary], kind='stable')
+
+    def close(self):
+        """Deletes the run files."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.paths = []
@@ -0,0 +1,138 @@
+import re
+
+# --- Patterns (kept identical to the original per-call regexes in site_analyzer) ---
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+SOCIAL_ANCHORS = ['linkedin.com/company/', 'facebook.com/', 'twitter.com/']
+SCHEME_REQUIRED = {'linkedin.com/company/'} # Only the LinkedIn alternative of the old regex needs https?://(www.)?
+SENTENCE_BREAK = re.compile(r'[\n.!?]')
+MIN_SENTENCE_LENGTH = 5
+MAX_SENTENCE_LENGTH = 300
+MAX_LOCAL_PART = 64 # Longest email local part we look back for from an '@'
+
+_LOCAL_PART_TAIL = re.compile(r'[\w\.-]+\Z')
+_SCHEME_TAIL = re.compile(r'https?://(?:www\.)?\Z')
+_UNTIL_QUOTE = re.compile(r'[^"\']+')
+
+
+class ExtractionEngine:
+    """
+    Compiles everything site_analyzer looks for in a page into one pattern of
+    literal anchors: '@' for emails, the social domains, and every
+    TECH_SIGNATURES string. A page's HTML is scanned once with it; emails and
+    social links are only expanded with their full regexes around the anchors
+    that were hit. Contact keywords get the same treatment over the visible
+    text, so only sentences containing a keyword are ever split out and checked.
+
+    The anchors are plain literals, so `re` runs the scan in C; a pure-Python
+    Aho-Corasick automaton would be slower for a few dozen patterns. Build the
+    engine once and call `start()` per website, then feed it one page at a time.
+    """
+
+    def __init__(self, tech_signatures, contact_keywords, junk_keywords):
+        self.anchor_kind = {'@': 'email'}
+        self.anchor_kind.update({anchor: 'social' for anchor in SOCIAL_ANCHORS})
+        self.signature_tech = {}
+        for tech, signatures in tech_signatures.items():
+            for signature in signatures:
+                self.signature_tech.setdefault(signature, []).append(tech)
+                self.anchor_kind.setdefault(signature, 'tech')
+        # Longest first so an anchor that contains another still wins the alternation.
+        anchors = sorted(self.anchor_kind, key=len, reverse=True)
+        self.anchor_pattern = re.compile('|'.join(re.escape(a) for a in anchors))
+
+        self.contact_keywords = list(contact_keywords)
+        keyword_alternation = '|'.join(re.escape(k) for k in self.contact_keywords)
+        self.keyword_pattern = re.compile(keyword_alternation)
+        self.keyword_pattern_ignorecase = re.compile(keyword_alternation, re.IGNORECASE)
+        self.junk_pattern = re.compile('|'.join(re.escape(j) for j in junk_keywords))
+
+    def start(self):
+        """A fresh accumulator for one website."""
+        return SiteExtraction(self)
+
+
+class SiteExtraction:
+    """Accumulates matches across the pages of one website."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.emails = set()
+        self.socials = set()
+        self.tech = set()
+        self.contacts = {} # Insertion-ordered set
+
+    def feed(self, source, text):
+        """Scans one page's HTML and visible text exactly once each."""
+        self._scan_source(source)
+        self._scan_text(text)
+        return self
+
+    def _scan_source(self, source):
+        engine = self.engine
+        email_end = 0 # Emails and social links don't overlap themselves, like re.findall
+        social_end = 0
+        for match in engine.anchor_pattern.finditer(source):
+            anchor = match.group()
+            kind = engine.anchor_kind[anchor]
+            at = match.start()
+
+            if anchor in engine.signature_tech:
+                self.tech.update(engine.signature_tech[anchor])
+
+            if kind == 'email' and at >= email_end:
+                tail = _LOCAL_PART_TAIL.search(source, max(email_end, at - MAX_LOCAL_PART), at)
+                email = EMAIL_PATTERN.match(source, tail.start()) if tail else None
+                if email:
+                    self.emails.add(email.group().lower())
+                    email_end = email.end()
+
+            elif kind == 'social' and at >= social_end:
+                start = at
+                if anchor in SCHEME_REQUIRED:
+                    scheme = _SCHEME_TAIL.search(source, max(social_end, at - len('https://www.')), at)
+                    if not scheme:
+                        continue
+                    start = scheme.start()
+                rest = _UNTIL_QUOTE.match(source, match.end())
+                if rest:
+                    self.socials.add(source[start:rest.end()])
+                    social_end = rest.end()
+
+    def _scan_text(self, text):
+        engine = self.engine
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            hits = ((m.start(), m.end(), m.group()) for m in engine.keyword_pattern.finditer(lowered))
+        else:
+            # Some characters change length when lower-cased; match case-insensitively instead.
+            hits = ((m.start(), m.end(), m.group().lower()) for m in engine.keyword_pattern_ignorecase.finditer(text))
+
+        sentence_keywords = {}
+        for start, end, keyword in hits:
+            # Sentence boundaries around the hit, same split as re.split(r'[\n.!?]', text)
+            begin = max(text.rfind(ch, 0, start) for ch in '\n.!?') + 1
+            stop = SENTENCE_BREAK.search(text, end)
+            sentence_keywords.setdefault((begin, stop.start() if stop else len(text)), set()).add(keyword)
+
+        for (begin, end), found in sentence_keywords.items():
+            clean_sentence = ' '.join(text[begin:end].split())
+            # Check 1: Is it a reasonable length?
+            if not (MIN_SENTENCE_LENGTH < len(clean_sentence) < MAX_SENTENCE_LENGTH):
+                continue
+            # Check 2: Does it contain junk words?
+            if engine.junk_pattern.search(clean_sentence.lower()):
+                continue
+            words = clean_sentence.split()
+            for keyword in engine.contact_keywords:
+                # Check 3: Does it likely refer to a person? (Look for capitalized words)
+                if keyword in found and any(word.istitle() and word.lower() != keyword for word in words):
+                    self.contacts[f"{keyword.title()}: {clean_sentence}"] = None
+
+    def result(self):
+        """The site_analyzer result dict, with 'N/A' for anything not found."""
+        return {
+            'emails': ', '.join(sorted(self.emails)) if self.emails else 'N/A',
+            'tech_stack': ', '.join(sorted(self.tech)) if self.tech else 'N/A',
+            'social_links': ', '.join(sorted(self.socials)) if self.socials else 'N/A',
+            'contacts': ' | '.join(self.contacts) if self.contacts else 'N/A'
+        }
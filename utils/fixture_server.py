@@ -0,0 +1,138 @@
+import os
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# --- Configuration ---
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+SUNBIZ_FIXTURES = os.path.join(FIXTURES_DIR, 'sunbiz')
+SITES_FIXTURES = os.path.join(FIXTURES_DIR, 'sites')
+YELLOWPAGES_FIXTURES = os.path.join(FIXTURES_DIR, 'yellowpages')
+
+
+def slugify(value):
+    """Turns a search term into the file-name slug used by the fixture pages."""
+    return re.sub(r'[^a-z0-9]+', '-', str(value).lower()).strip('-')
+
+
+class FixtureServer:
+    """
+    Serves saved pages from a fixtures directory on a local port so the scrapers
+    can be exercised without touching the real sites.
+
+    `routes` maps a URL path to a function taking the parsed query string and
+    returning a file path relative to `root` (or None for a 404). Any path not
+    in `routes` is served as a static file, with `index.html` for directories.
+    `delay` adds that many seconds to every response to imitate network latency.
+    """
+
+    def __init__(self, root, routes=None, port=0, delay=0.0):
+        self.root = root
+        self.routes = routes or {}
+        self.delay = delay
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=server.root, **kwargs)
+
+            def do_GET(self):
+                if server.delay:
+                    time.sleep(server.delay)
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip('/') or '/'
+                route = server.routes.get(path) or server.routes.get(path.lower())
+                if route is None:
+                    return super().do_GET()
+                relative = route(parse_qs(parsed.query))
+                full_path = os.path.join(server.root, relative) if relative else None
+                if not full_path or not os.path.isfile(full_path):
+                    self.send_error(404)
+                    return
+                with open(full_path, 'rb') as f:
+                    body = f.read()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep harness output readable
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def sunbiz_fixture_server(port=0):
+    """A FixtureServer that mimics the Sunbiz home, search and detail pages."""
+    def search_results(query):
+        term = query.get('searchTerm', [''])[0]
+        candidate = os.path.join('results', f"{slugify(term)}.html")
+        if os.path.isfile(os.path.join(SUNBIZ_FIXTURES, candidate)):
+            return candidate
+        return os.path.join('results', '_no_results.html')
+
+    def search_result_detail(query):
+        aggregate_id = query.get('aggregateId', [''])[0]
+        return os.path.join('detail', f"{slugify(aggregate_id)}.html") if aggregate_id else None
+
+    routes = {
+        '/sunbiz': lambda query: 'home.html',
+        '/sunbiz/search': lambda query: 'search.html',
+        '/Inquiry/CorporationRegistration/ByName': lambda query: 'by_name.html',
+        '/Inquiry/CorporationRegistration/SearchResults': search_results,
+        '/Inquiry/CorporationRegistration/SearchResultDetail': search_result_detail,
+    }
+    return FixtureServer(SUNBIZ_FIXTURES, routes=routes, port=port)
+
+
+def yellowpages_fixture_server(port=0, delay=0.0):
+    """
+    A FixtureServer that mimics Yellow Pages category listings under
+    /pinellas-county-fl/<category-slug>. Page N (from ?page=N, default 1) is
+    results/<slug>-<N>.html; pages past the last one get a page with no
+    v-cards, like the real site. Categories without fixtures are a 404.
+    """
+    def category_page(slug):
+        def route(query):
+            page = query.get('page', ['1'])[0]
+            candidate = os.path.join('results', f"{slug}-{page}.html")
+            if os.path.isfile(os.path.join(YELLOWPAGES_FIXTURES, candidate)):
+                return candidate
+            return os.path.join('results', '_empty.html')
+        return route
+
+    slugs = {name.rsplit('-', 1)[0] for name in os.listdir(os.path.join(YELLOWPAGES_FIXTURES, 'results'))
+             if not name.startswith('_')}
+    routes = {f"/pinellas-county-fl/{slug}": category_page(slug) for slug in slugs}
+    return FixtureServer(YELLOWPAGES_FIXTURES, routes=routes, port=port, delay=delay)
@@ -0,0 +1,50 @@
+import json
+import os
+import threading
+
+
+class Journal:
+    """
+    Append-only JSON-lines journal. Every record is flushed and fsync'd as it is
+    written, so a crash loses at most the record being written. A torn last line
+    left behind by a crash is dropped when the journal is reopened.
+    """
+
+    def __init__(self, path, resume=True):
+        self.path = path
+        self.lock = threading.Lock()
+        if resume:
+            self._drop_torn_tail()
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _drop_torn_tail(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def read(path):
+        """Returns every complete record in the journal, or [] if it doesn't exist."""
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue # Torn write from a crash
+        return records
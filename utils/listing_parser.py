@@ -0,0 +1,87 @@
+from lxml import html as lxml_html
+from urllib.parse import urljoin
+
+
+def has_class(name):
+    """XPath predicate matching elements whose class attribute contains `name` as a whole word."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Same fields and selectors as scraper.CARD_SCRIPT, in XPath (lxml has no CSS selectors without cssselect).
+CARD_XPATH = f"//div[{has_class('v-card')}]"
+FIELD_XPATHS = {
+    'name': f".//a[{has_class('business-name')}]//span",
+    'phone': f".//div[{has_class('phones')} and {has_class('phone')} and {has_class('primary')}]",
+    'street': f".//div[{has_class('street-address')}]",
+    'locality': f".//div[{has_class('locality')}]",
+    'category': f".//div[{has_class('categories')}]//a",
+}
+# Links on the card, made absolute against the page URL like the browser's element.href
+LINK_XPATHS = {
+    'website': f".//a[{has_class('track-visit-website')}]/@href",
+    'detail_url': f".//a[{has_class('business-name')}]/@href",
+}
+RESULT_ID_XPATH = f"ancestor::div[{has_class('result')}][1]/@id"
+
+
+def listing_id(card):
+    """A card's Yellow Pages listing ID: its data-ypid, else the 'lid-<id>' of the result around it, else None."""
+    ypid = card.get('data-ypid')
+    if ypid:
+        return ypid
+    result_ids = card.xpath(RESULT_ID_XPATH)
+    if result_ids and result_ids[0].startswith('lid-'):
+        return result_ids[0][len('lid-'):]
+    return None
+
+
+def element_text(element):
+    """Visible-ish text of an element with whitespace collapsed, like WebElement.text for one-line fields."""
+    return ' '.join(element.text_content().split())
+
+
+def parse_listing_cards(page_source, page_url=None):
+    """
+    Parses a saved Yellow Pages result page into one dict per v-card with
+    name, phone, street, locality, category, website, detail_url and
+    listing_id (None when missing), the same shape scraper.CARD_SCRIPT
+    returns from the live page. Links are resolved against `page_url`.
+    """
+    if not page_source or not page_source.strip():
+        return []
+    tree = lxml_html.fromstring(page_source)
+    cards = []
+    for card in tree.xpath(CARD_XPATH):
+        fields = {}
+        for field, xpath in FIELD_XPATHS.items():
+            found = card.xpath(xpath)
+            fields[field] = element_text(found[0]) if found else None
+        for field, xpath in LINK_XPATHS.items():
+            hrefs = card.xpath(xpath)
+            fields[field] = (urljoin(page_url, hrefs[0]) if page_url else hrefs[0]) if hrefs else None
+        fields['listing_id'] = listing_id(card)
+        cards.append(fields)
+    return cards
+
+
+def parse_first_listing_url(page_source, page_url):
+    """The absolute URL of the first listing's details page on a search results page, or None."""
+    hrefs = lxml_html.fromstring(page_source).xpath(f"//div[{has_class('result')}]//a[{has_class('business-name')}]/@href")
+    return urljoin(page_url, hrefs[0]) if hrefs else None
+
+
+def parse_website(page_source, page_url):
+    """The 'Visit Website' link on a listing's details page, or None."""
+    hrefs = lxml_html.fromstring(page_source).xpath(f"//a[{has_class('track-visit-website')}]/@href")
+    return urljoin(page_url, hrefs[0]) if hrefs else None
+
+
+def parse_card_website(page_source, page_url):
+    """The website linked from the first result card of a search results page, or None if the card has none."""
+    tree = lxml_html.fromstring(page_source)
+    listings = tree.xpath(f"//div[{has_class('result')}]//a[{has_class('business-name')}]")
+    if not listings:
+        return None
+    card = listings[0].xpath(f"ancestor::div[{has_class('result')}][1]")[0]
+    hrefs = card.xpath(f".//a[{has_class('track-visit-website')}]/@href")
+    return urljoin(page_url, hrefs[0]) if hrefs else None
@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# --- Configuration ---
+READY_TIMEOUT = 10 # Longest we wait for any readiness signal
+POLL_INTERVAL = 0.1
+NETWORK_IDLE = 0.5 # No new resource requests for this long counts as idle
+
+# One call: the document's readyState and how many resources it has requested so far.
+_READY_STATE_SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+class Pacer:
+    """
+    Pacing for one pipeline stage. Instead of fixed sleeps it:
+      - waits on concrete readiness signals (page_ready, results_changed),
+      - enforces politeness separately with a per-host HostRateLimiter (throttle),
+      - accounts every wait, so report() can show time waiting vs working.
+    """
+
+    def __init__(self, stage, limiter=None, timeout=READY_TIMEOUT):
+        self.stage = stage
+        self.limiter = limiter
+        self.timeout = timeout
+        self.started = time.perf_counter()
+        self.waits = {} # reason -> seconds
+
+    @contextmanager
+    def waiting(self, reason):
+        """Counts the time spent inside the block as waiting for `reason`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.waits[reason] = self.waits.get(reason, 0.0) + time.perf_counter() - start
+
+    def throttle(self, url):
+        """Blocks until the rate limiter allows a request to the URL's host."""
+        if self.limiter is not None:
+            with self.waiting('rate limit'):
+                self.limiter.wait(url)
+
+    def page_ready(self, driver, idle=NETWORK_IDLE):
+        """
+        Waits for document.readyState == 'complete' and then for the network to go
+        quiet (no new resource entries for `idle` seconds). Returns False on timeout,
+        in which case the caller just carries on with whatever has loaded.
+        """
+        with self.waiting('readiness'):
+            deadline = time.perf_counter() + self.timeout
+            last_count, quiet_since = -1, None
+            while time.perf_counter() < deadline:
+                try:
+                    state, count = driver.execute_script(_READY_STATE_SCRIPT)
+                except WebDriverException:
+                    return False
+                now = time.perf_counter()
+                if state == 'complete':
+                    if count != last_count:
+                        last_count, quiet_since = count, now
+                    elif now - quiet_since >= idle:
+                        return True
+                time.sleep(POLL_INTERVAL)
+            return False
+
+    def results_changed(self, driver, css_selector, previous, signature):
+        """
+        After an in-page navigation (e.g. an AJAX "next" click), waits until the
+        elements matching `css_selector` are no longer the `previous` ones, either
+        replaced (stale) or re-rendered so the first no longer reads `signature`,
+        and new ones exist. `signature` is previous[0].text read before the click;
+        read after it, an in-place re-render could already show the new text.
+        Returns the new elements, or [] on timeout.
+        """
+        first = previous[0] if previous else None
+
+        def changed(d):
+            if first is not None:
+                try:
+                    if first.text == signature:
+                        return False
+                except StaleElementReferenceException:
+                    pass # Replaced by the new page
+            return d.find_elements(By.CSS_SELECTOR, css_selector) or False
+
+        with self.waiting('readiness'):
+            try:
+                return WebDriverWait(driver, self.timeout, poll_frequency=POLL_INTERVAL).until(changed)
+            except TimeoutException:
+                return []
+
+    def totals(self):
+        """(elapsed, {reason: seconds}), picklable so worker processes can send it home."""
+        return time.perf_counter() - self.started, dict(self.waits)
+
+    def merge(self, totals):
+        """Adds another pacer's totals (e.g. from a worker process) to this one's waits."""
+        _, waits = totals
+        for reason, seconds in waits.items():
+            self.waits[reason] = self.waits.get(reason, 0.0) + seconds
+
+    def report(self, elapsed=None):
+        """Prints wall time split into waiting (by reason) and working."""
+        elapsed = elapsed if elapsed is not None else time.perf_counter() - self.started
+        waited = sum(self.waits.values())
+        details = ', '.join(f"{reason} {seconds:.1f}s" for reason, seconds in sorted(self.waits.items()))
+        print(f"[{self.stage}] {elapsed:.1f}s total: waiting {waited:.1f}s ({details or 'none'}), working {max(elapsed - waited, 0.0):.1f}s")
@@ -0,0 +1,158 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zstandard
+
+# --- Configuration ---
+ARCHIVE_DIR = 'page_archive'
+COMPRESSION_LEVEL = 10 # zstd level; pages are written once and read rarely
+INDEX_FILE = 'index.sqlite'
+
+
+class PageArchive:
+    """
+    Raw HTML of every page the pipeline fetched, so extraction can be re-run
+    without the network. Pages are stored once per distinct content as
+    zstd-compressed blobs named by their SHA-256 (blobs/ab/abcdef....html.zst);
+    an SQLite index maps (stage, url, fetch time) to a blob. Safe to share
+    between threads, and several processes can write to the same archive.
+    """
+
+    def __init__(self, path=ARCHIVE_DIR, level=COMPRESSION_LEVEL):
+        self.path = path
+        self.level = level
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(path, 'blobs'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, INDEX_FILE), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL") # Worker processes append while others read
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                stage TEXT,
+                url TEXT,
+                final_url TEXT,
+                fetched_at REAL,
+                digest TEXT,
+                raw_size INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_by_url ON pages (url, fetched_at)")
+        self.conn.commit()
+
+    def blob_path(self, digest):
+        return os.path.join(self.path, 'blobs', digest[:2], f"{digest}.html.zst")
+
+    def _write_blob(self, digest, raw):
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            return # Same content fetched before
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zstandard.ZstdCompressor(level=self.level).compress(raw))
+            os.replace(temp_path, path) # Readers never see half a blob
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def put(self, stage, url, html, final_url=None):
+        """Records that `stage` fetched `url` (ending up at `final_url`) and got `html`. Returns the blob digest."""
+        raw = html.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        self._write_blob(digest, raw)
+        with self.lock:
+            self.conn.execute("INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                              (stage, url, final_url or url, time.time(), digest, len(raw)))
+            self.conn.commit()
+        return digest
+
+    def read_blob(self, digest):
+        with open(self.blob_path(digest), 'rb') as f:
+            return zstandard.ZstdDecompressor().decompress(f.read()).decode('utf-8')
+
+    def get(self, url, stage=None, before=None):
+        """
+        The latest archived fetch of `url` (optionally only by `stage`, and only
+        fetches before the `before` timestamp) as (final_url, html), or None.
+        """
+        query = "SELECT final_url, digest FROM pages WHERE url = ?"
+        params = [url]
+        if stage is not None:
+            query += " AND stage = ?"
+            params.append(stage)
+        if before is not None:
+            query += " AND fetched_at < ?"
+            params.append(before)
+        with self.lock:
+            row = self.conn.execute(query + " ORDER BY fetched_at DESC LIMIT 1", params).fetchone()
+        return None if row is None else (row[0], self.read_blob(row[1]))
+
+    def fetch(self, url, stage=None):
+        """Stands in for a network fetch in replay mode: like get(), but raises ArchiveMiss if the page was never archived."""
+        page = self.get(url, stage)
+        if page is None:
+            raise ArchiveMiss(url)
+        return page
+
+    def urls(self, stage):
+        """Every URL `stage` has archived, each once, in the order they were first fetched."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT url FROM pages WHERE stage = ? GROUP BY url ORDER BY MIN(fetched_at)", (stage,)
+            ).fetchall()
+        return [url for url, in rows]
+
+    def stats(self):
+        """(pages indexed, distinct blobs, raw bytes indexed, bytes on disk)."""
+        with self.lock:
+            pages, blobs, raw = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT digest), COALESCE(SUM(raw_size), 0) FROM pages"
+            ).fetchone()
+        stored = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(os.path.join(self.path, 'blobs')) for name in names)
+        return pages, blobs, raw, stored
+
+    def report(self, stage, since):
+        """Prints how many pages `stage` archived since the `since` timestamp, from any process."""
+        with self.lock:
+            pages, unchanged = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(digest IN (SELECT digest FROM pages WHERE fetched_at < ?)), 0) "
+                "FROM pages WHERE stage = ? AND fetched_at >= ?", (since, stage, since)
+            ).fetchone()
+        print(f"[{stage}] Archived {pages} pages ({unchanged} unchanged since an earlier fetch) to '{self.path}'.")
+
+    def close(self):
+        self.conn.close()
+
+
+class ArchiveMiss(Exception):
+    """Raised in replay mode when a page the extraction needs was never archived."""
+
+
+def open_archive(path, enabled=True):
+    """The archive the scripts write to, or None when archiving is turned off."""
+    return PageArchive(path) if enabled and path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show what the page archive holds.")
+    parser.add_argument('path', nargs='?', default=ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    archive = PageArchive(args.path)
+    pages, blobs, raw, stored = archive.stats()
+    print(f"{args.path}: {pages} fetches of {blobs} distinct pages, {raw / 1e6:.1f} MB of HTML stored in {stored / 1e6:.1f} MB.")
+    with archive.lock:
+        for stage, count, urls in archive.conn.execute(
+                "SELECT stage, COUNT(*), COUNT(DISTINCT url) FROM pages GROUP BY stage ORDER BY stage"):
+            print(f"  {stage:<14}: {count:>6} fetches, {urls:>6} URLs")
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
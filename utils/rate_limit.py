@@ -0,0 +1,51 @@
+import multiprocessing
+import time
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host: each host allows `rate` requests per second with
+    bursts of up to `burst`. Buckets for the hosts passed in up front live in
+    shared memory, so one limiter created in the parent process and handed to
+    worker processes (e.g. as a pool initializer argument) enforces a single
+    budget across all of them. Other hosts get a bucket on first use that is
+    only shared within the current process. Pass the multiprocessing context
+    the workers will be started with (e.g. get_context('spawn')).
+    """
+
+    def __init__(self, rate, burst=1, hosts=(), context=None):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.context = context or multiprocessing.get_context()
+        self.lock = self.context.Lock()
+        self.buckets = {}
+        for host in hosts:
+            self._bucket(host)
+
+    def _bucket(self, host):
+        if host not in self.buckets:
+            # (tokens available, time they were counted)
+            self.buckets[host] = (self.context.Value('d', self.burst, lock=False),
+                                  self.context.Value('d', time.monotonic(), lock=False))
+        return self.buckets[host]
+
+    def reserve(self, url):
+        """Takes a token for the URL's host and returns how many seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        host = urlparse(url).netloc or url
+        with self.lock:
+            tokens, counted_at = self._bucket(host)
+            now = time.monotonic()
+            tokens.value = min(self.burst, tokens.value + (now - counted_at.value) * self.rate) - 1
+            counted_at.value = now
+            # A negative balance is a queue of callers that already hold a future slot.
+            return max(0.0, -tokens.value / self.rate)
+
+    def wait(self, url):
+        """Blocks until a request to the URL's host is allowed. Returns the seconds spent waiting."""
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+        return delay
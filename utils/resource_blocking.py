@@ -0,0 +1,83 @@
+# --- Configuration ---
+# What each blockable resource type looks like in a URL. Chrome's Network.setBlockedURLs
+# takes wildcard patterns, so types are matched by file extension.
+RESOURCE_EXTENSIONS = {
+    'images': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'],
+    'media': ['mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a', 'mov', 'm3u8'],
+    'fonts': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+}
+TRACKER_DOMAINS = [
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'googletagservices.com',
+    'google-analytics.com', 'googletagmanager.com', 'connect.facebook.net', 'facebook.com/tr',
+    'hotjar.com', 'clarity.ms', 'scorecardresearch.com', 'quantserve.com', 'adnxs.com',
+    'amazon-adsystem.com', 'criteo.com', 'taboola.com', 'outbrain.com', 'bat.bing.com',
+    'hs-analytics.net', 'hs-scripts.com', 'hsforms.com', 'ads-twitter.com', 'licdn.com',
+]
+BLOCKABLE = list(RESOURCE_EXTENSIONS) + ['trackers']
+DEFAULT_PROFILE = BLOCKABLE # images, media, fonts and trackers
+
+# Bytes on the wire and load time of the page the browser is on, from the Navigation/Resource Timing API.
+# Cross-origin resources without Timing-Allow-Origin report 0 bytes, so the totals are a lower bound.
+PAGE_WEIGHT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+const bytes = (nav ? nav.transferSize : 0) + resources.reduce((total, r) => total + (r.transferSize || 0), 0);
+const loaded = nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : performance.now();
+return [bytes, loaded - (nav ? nav.startTime : 0), resources.length];
+"""
+
+
+def blocked_url_patterns(profile=DEFAULT_PROFILE, keep=()):
+    """
+    Wildcard URL patterns blocking every resource type in `profile`. Tracker
+    domains that appear in any `keep` string (e.g. the TECH_SIGNATURES the site
+    analyzer looks for) are never blocked, so their script tags still load.
+    """
+    patterns = []
+    for kind in profile:
+        for extension in RESOURCE_EXTENSIONS.get(kind, []):
+            patterns += [f"*.{extension}", f"*.{extension}?*"]
+    if 'trackers' in profile:
+        patterns += [f"*{domain}*" for domain in TRACKER_DOMAINS
+                     if not any(domain in kept or kept in domain for kept in keep)]
+    return patterns
+
+
+def apply_blocking(driver, patterns):
+    """Makes the browser refuse every request matching `patterns` (Chrome DevTools Protocol)."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+
+
+class PageWeights:
+    """
+    Records bytes transferred and load time of each page a stage loads, so runs
+    with and without a blocking profile can be compared.
+    """
+
+    def __init__(self, stage, profile=()):
+        self.stage = stage
+        self.profile = list(profile)
+        self.pages = [] # (bytes, load ms, resources)
+
+    def measure(self, driver):
+        """Records the page the driver is on. Never raises; a page that can't be measured is skipped."""
+        try:
+            transferred, load_ms, resources = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+            self.pages.append((int(transferred or 0), float(load_ms or 0), int(resources or 0)))
+        except Exception:
+            pass
+
+    def summary(self):
+        """(pages, average KB transferred, average load seconds, average resources)."""
+        if not self.pages:
+            return 0, 0.0, 0.0, 0.0
+        count = len(self.pages)
+        return (count, sum(p[0] for p in self.pages) / count / 1024,
+                sum(p[1] for p in self.pages) / count / 1000, sum(p[2] for p in self.pages) / count)
+
+    def report(self):
+        count, kb, seconds, resources = self.summary()
+        blocking = ', '.join(self.profile) or 'nothing'
+        print(f"[{self.stage}] {count} pages: avg {kb:.0f} KB transferred, {seconds:.2f}s to load, "
+              f"{resources:.0f} resources (blocking {blocking})")
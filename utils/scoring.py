@@ -0,0 +1,140 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Allow `python utils/scoring.py`
+
+import argparse
+import re
+import time
+import numpy as np
+import pandas as pd
+from utils.exclusions import ExclusionIndex, EXCLUSIONS_FILE
+from utils.table_io import read_table, write_table
+
+# --- Scoring Weights ---
+CATEGORY_SCORES = {
+    'Accountants': 30, 'Financial Advisors': 30, 'Bookkeeping Services': 25,
+    'Tax Return Preparation': 25, 'Lawyers': 20, 'Plumbers': 10,
+    'Electricians': 10, 'Contractors': 10, 'Landscaping': 10,
+    'Restaurants': -20, 'Pizza': -25, 'Hair Salons': -10,
+    'Nail Salons': -10, 'default': 0
+}
+
+NAME_KEYWORDS = {"inc": 15, "llc": 15, "p.a.": 15, "pa": 15, "group": 15, "associates": 15, "company": 10, "corp": 15}
+# Longer words a keyword also matches, as a substring check would: "Acme Corporation" scores like "Acme Corp"
+KEYWORD_SPELLINGS = {"inc": ["incorporated"], "corp": ["corporation"], "llc": ["pllc"]}
+ADDRESS_KEYWORDS = {"suite": 10, "ste": 10, "floor": 10, "#": 5, " bldg": 10}
+OWNER_FOUND_SCORE = 40
+INACTIVE_PENALTY = -1000
+EXCLUDED_PENALTY = INACTIVE_PENALTY # Use the same penalty to filter chains and other exclusions
+CALLS_PER_DAY = 50
+
+SCORE_COMPONENTS = ['score_category', 'score_excluded', 'score_name', 'score_address', 'score_owner', 'score_inactive']
+
+
+def keyword_pattern(keywords):
+    """
+    One regex for all keywords, each matched as a whole word so "pa" doesn't
+    fire inside "Pasadena" and "ste" doesn't fire inside "Westchester". Symbols
+    like '#' match anywhere. Word-like keywords share a single leading
+    lookbehind, which keeps the scan fast.
+    """
+    bounded, unbounded = [], []
+    for keyword in sorted(keywords, key=len, reverse=True):
+        escaped = re.escape(keyword) + (r'(?![a-z0-9])' if keyword[-1].isalnum() else '')
+        (bounded if keyword[0].isalnum() else unbounded).append(escaped)
+    alternatives = ([r'(?<![a-z0-9])(?:' + '|'.join(bounded) + ')'] if bounded else []) + unbounded
+    return re.compile('|'.join(alternatives))
+
+
+def keyword_scores(values, keywords, spellings=KEYWORD_SPELLINGS):
+    """
+    Sum of the weights of every distinct keyword found in each value, a keyword
+    also being found as any of its `spellings`. The distinct values are joined
+    into one string and scanned in a single pass, so the cost is one C-level
+    regex scan plus a little work per hit.
+    """
+    weights = {keyword.strip().lower(): weight for keyword, weight in keywords.items()}
+    forms = {keyword: keyword for keyword in weights} # Each spelling -> the keyword it counts as
+    for keyword in weights:
+        for spelling in spellings.get(keyword, []):
+            forms.setdefault(spelling, keyword)
+    codes, uniques = pd.factorize(values.fillna('').astype(str).str.lower().str.replace('\n', ' ', regex=False))
+    uniques = uniques.to_numpy(dtype=object).tolist()
+    lengths = np.fromiter(map(len, uniques), dtype=np.int64, count=len(uniques))
+    starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+
+    keyword_ids = {keyword: i for i, keyword in enumerate(weights)}
+    matches = [(match.start(), keyword_ids[forms[match.group()]]) for match in keyword_pattern(forms).finditer('\n'.join(uniques))]
+    found = np.array(matches, dtype=np.int64).reshape(-1, 2)
+    positions = np.searchsorted(starts, found[:, 0], side='right') - 1
+    # Each keyword counts once per value
+    pairs = np.unique(positions * len(keyword_ids) + found[:, 1])
+
+    unique_scores = np.zeros(len(uniques), dtype=np.int64)
+    np.add.at(unique_scores, pairs // len(keyword_ids), np.array(list(weights.values()), dtype=np.int64)[pairs % len(keyword_ids)])
+    return unique_scores[codes]
+
+
+def score_frame(df, category_scores=CATEGORY_SCORES, name_keywords=NAME_KEYWORDS,
+                address_keywords=ADDRESS_KEYWORDS, owner_found_score=OWNER_FOUND_SCORE,
+                inactive_penalty=INACTIVE_PENALTY, excluded_penalty=EXCLUDED_PENALTY, exclusions=None):
+    """
+    Scores every row at once and returns a DataFrame (same index as `df`) with
+    the exclusion flags, one column per component and their sum in 'ai_score'.
+    Uses only columns already on the frame, so re-scoring with new weights never
+    touches the network. `exclusions` defaults to the rules in exclusions.json.
+    """
+    exclusions = exclusions if exclusions is not None else ExclusionIndex.load()
+    default = category_scores.get('default', 0)
+    owners = df['owner_name'].fillna('').astype(str).str.strip() if 'owner_name' in df else pd.Series('', index=df.index)
+    status = df['sunbiz_status'].astype(object).fillna('').astype(str) if 'sunbiz_status' in df else pd.Series('', index=df.index)
+
+    scores = exclusions.classify(df)
+    scores['score_category'] = df['category'].astype(str).map(category_scores).fillna(default).astype(np.int64)
+    scores['score_excluded'] = np.where(scores['excluded'], excluded_penalty, 0)
+    scores['score_name'] = keyword_scores(df['name'], name_keywords)
+    scores['score_address'] = keyword_scores(df['address'], address_keywords) if 'address' in df else 0
+    scores['score_owner'] = np.where(owners != '', owner_found_score, 0)
+    scores['score_inactive'] = np.where(status == 'INACTIVE', inactive_penalty, 0)
+    scores['ai_score'] = scores[SCORE_COMPONENTS].sum(axis=1).astype(np.int64)
+    return scores
+
+
+def apply_scores(df, **weights):
+    """Returns a copy of `df` with the score breakdown and ai_score columns (re)computed."""
+    scored = df.copy()
+    scores = score_frame(scored, **weights)
+    for col in scores.columns:
+        scored[col] = scores[col]
+    return scored
+
+
+def prioritize(df, calls_per_day=CALLS_PER_DAY):
+    """Sorts by ai_score (highest first) and assigns call_day in blocks of calls_per_day."""
+    df_sorted = df.sort_values(by='ai_score', ascending=False, kind='stable').reset_index(drop=True)
+    df_sorted['call_day'] = np.arange(len(df_sorted)) // calls_per_day + 1
+    return df_sorted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score an enriched call list offline with the current weights.")
+    parser.add_argument('input', help="Enriched call list (.parquet, .xlsx or .csv) with owner_name and sunbiz_status.")
+    parser.add_argument('output', nargs='?', help="Where to save it (defaults to overwriting the input).")
+    parser.add_argument('--calls-per-day', type=int, default=CALLS_PER_DAY)
+    parser.add_argument('--exclusions-file', default=EXCLUSIONS_FILE)
+    args = parser.parse_args()
+
+    output = args.output or args.input
+    df = read_table(args.input)
+    print(f"Loaded {len(df)} rows from '{args.input}'.")
+
+    start = time.perf_counter()
+    df_final = prioritize(apply_scores(df, exclusions=ExclusionIndex.load(args.exclusions_file)), args.calls_per_day)
+    print(f"Re-scored {len(df_final)} rows in {time.perf_counter() - start:.3f}s.")
+
+    write_table(df_final, output)
+    print(f"Saved to '{output}'.")
+
+
+if __name__ == "__main__":
+    main()
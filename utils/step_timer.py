@@ -0,0 +1,95 @@
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None # Not on Windows; psutil is used there instead
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SAMPLE_INTERVAL = 0.2 # Seconds between memory samples of a command run by run_measured
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB, or None where it can't be read."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024 # Bytes on macOS, KB on Linux
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2**20
+    return None
+
+
+def tree_rss(process):
+    """Resident memory of a process and every process it started, in bytes."""
+    total = 0
+    for member in [process] + process.children(recursive=True):
+        try:
+            total += member.memory_info().rss
+        except psutil.Error:
+            pass # Exited since it was listed
+    return total
+
+
+def run_measured(command, interval=SAMPLE_INTERVAL):
+    """
+    Runs a command to completion and returns (exit status, peak RSS in MB of it
+    and every process it started, such as browsers). The peak is sampled every
+    `interval` seconds, so it is that run's own; it is None without psutil.
+    """
+    process = subprocess.Popen(command)
+    if psutil is None:
+        return process.wait(), None
+    watched, peak = psutil.Process(process.pid), 0
+    while True:
+        try:
+            peak = max(peak, tree_rss(watched))
+        except psutil.Error:
+            pass # The command itself has exited
+        try:
+            return process.wait(timeout=interval), (peak / 2**20 if peak else None)
+        except subprocess.TimeoutExpired:
+            continue
+
+
+class StepTimer:
+    """
+    Times the steps of a pipeline and records the process's peak RSS after each:
+    `with steps.step('sort'):` around each step, then report(). A step that runs
+    in a subprocess sets the subprocess's own peak instead:
+    `with steps.step('sort') as measured: measured['peak_mb'] = ...`.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.steps = [] # (label, seconds, peak RSS MB or None)
+
+    @contextmanager
+    def step(self, label):
+        print(f"[{self.name}] {label}...")
+        start = time.perf_counter()
+        measured = {}
+        try:
+            yield measured
+        finally:
+            peak = measured['peak_mb'] if 'peak_mb' in measured else peak_rss_mb()
+            self.steps.append((label, time.perf_counter() - start, peak))
+
+    def total_seconds(self):
+        return sum(seconds for _, seconds, _ in self.steps)
+
+    def report(self):
+        """Prints one line per step and the total."""
+        width = max([len(label) for label, _, _ in self.steps] + [5])
+        print(f"[{self.name}] {'step':<{width}} {'seconds':>8} {'peak RSS':>10}")
+        for label, seconds, peak in self.steps:
+            memory = f"{peak:.0f} MB" if peak is not None else 'n/a'
+            print(f"[{self.name}] {label:<{width}} {seconds:>8.2f} {memory:>10}")
+        print(f"[{self.name}] {'total':<{width}} {self.total_seconds():>8.2f}")
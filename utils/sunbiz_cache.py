@@ -0,0 +1,70 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# --- Configuration ---
+CACHE_FILE = 'sunbiz_cache.sqlite'
+TTL_DAYS = 30 # How long a found business stays fresh
+NEGATIVE_TTL_DAYS = 1 # How long "No Results Found" / "Scrape Error" answers are trusted
+NEGATIVE_STATUSES = {"No Results Found", "Scrape Error"}
+
+
+def normalize_name(name):
+    """Cache key for a business name: lower case, punctuation dropped, whitespace collapsed."""
+    return ' '.join(re.sub(r'[^a-z0-9&]+', ' ', str(name).lower()).split())
+
+
+class SunbizCache:
+    """
+    Persistent SQLite cache of Sunbiz lookups keyed by normalized business name.
+    Safe to share between worker threads.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl_days=TTL_DAYS, negative_ttl_days=NEGATIVE_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS lookups (
+                name_key TEXT PRIMARY KEY,
+                business_name TEXT,
+                status TEXT,
+                officers TEXT,
+                detail_url TEXT,
+                fetched_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, business_name):
+        """Returns (status, officers, detail_url) if a fresh entry exists, otherwise None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, officers, detail_url, fetched_at FROM lookups WHERE name_key = ?",
+                (normalize_name(business_name),)
+            ).fetchone()
+            if row is not None:
+                status, officers, detail_url, fetched_at = row
+                ttl = self.negative_ttl if status in NEGATIVE_STATUSES else self.ttl
+                if time.time() - fetched_at < ttl:
+                    self.hits += 1
+                    return status, json.loads(officers), detail_url
+            self.misses += 1
+            return None
+
+    def put(self, business_name, status, officers, detail_url=None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_name(business_name), str(business_name), status, json.dumps(officers), detail_url, time.time())
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
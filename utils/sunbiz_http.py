@@ -0,0 +1,104 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+
+# --- Configuration ---
+REQUEST_TIMEOUT = 15 # Seconds per request
+POOL_SIZE = 10 # Connections kept alive per host
+HEADERS = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+    'Accept': "text/html,application/xhtml+xml",
+    'Accept-Encoding': "gzip, deflate",
+    'Connection': "keep-alive",
+}
+BLOCK_TAGS = {'div', 'p', 'tr', 'li', 'table'}
+
+
+class PageNeedsBrowser(Exception):
+    """Raised when a page does not contain the server-rendered markup we expect (e.g. a JS challenge)."""
+
+
+def create_session(pool_size=POOL_SIZE):
+    """Creates a requests Session with a keep-alive connection pool sized for `pool_size` parallel lookups."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def fetch(session, url):
+    """GETs a page and returns (final_url, html). Raises for HTTP errors."""
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.url, response.text
+
+
+def element_lines(element):
+    """
+    Returns the element's text split into lines the way a browser renders it:
+    a new line for every <br> and block-level element.
+    """
+    parts = []
+
+    def walk(node):
+        if node.tag in BLOCK_TAGS:
+            parts.append('\n')
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            if child.tag == 'br':
+                parts.append('\n')
+            elif isinstance(child.tag, str):
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if node.tag in BLOCK_TAGS:
+            parts.append('\n')
+
+    walk(element)
+    return [' '.join(line.split()) for line in ''.join(parts).split('\n') if line.strip()]
+
+
+def parse_search_results(page_html, page_url):
+    """
+    Parses a Sunbiz by-name results page.
+    Returns ('INACTIVE', None), ('No Results Found', None) or (None, detail_url).
+    """
+    tree = lxml_html.fromstring(page_html)
+    if not tree.xpath("//*[@id='search-results']"):
+        raise PageNeedsBrowser("No #search-results on the results page")
+
+    # The status is in the 3rd column of the first result row
+    status_cells = tree.xpath("//*[@id='search-results']//tbody/tr[1]/td[3]")
+    if status_cells and "INACT" in status_cells[0].text_content():
+        return "INACTIVE", None
+
+    detail_links = tree.xpath("//td/a[@href]")
+    if not detail_links:
+        return "No Results Found", None
+    return None, urljoin(page_url, detail_links[0].get('href'))
+
+
+def parse_detail_page(page_html):
+    """Parses a Sunbiz entity detail page and returns (status, officers)."""
+    tree = lxml_html.fromstring(page_html)
+    if not tree.xpath("//div[contains(concat(' ', normalize-space(@class), ' '), ' corporationName ')]"):
+        raise PageNeedsBrowser("No div.corporationName on the detail page")
+
+    status_spans = tree.xpath("//label[contains(text(),'Status')]/following-sibling::span[1]")
+    status = status_spans[0].text_content().strip() if status_spans else "Unknown"
+
+    officers = []
+    sections = tree.xpath("//div[@class='detailSection' and .//span[contains(text(), 'Officer/Director Detail')]]")
+    if sections:
+        lines = element_lines(sections[0])
+        for i, line in enumerate(lines):
+            if line.startswith("Title") and i + 1 < len(lines):
+                potential_name = lines[i + 1]
+                # A simple check to ensure it's a name and not an address line
+                if potential_name.isupper() and "," in potential_name:
+                    officers.append(potential_name.title())
+    return status, officers
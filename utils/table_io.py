@@ -0,0 +1,208 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Allow `python utils/table_io.py`
+
+import argparse
+import tempfile
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- Configuration ---
+# Stages hand each other Parquet files with these types; CSV and XLSX are only for people.
+CATEGORICAL_COLUMNS = ['category', 'locality', 'sunbiz_status'] # A few distinct values repeated on every row
+STRING_COLUMNS = ['name', 'phone', 'address', 'owner_name', 'website', 'detail_url', 'listing_id', 'status', 'notes',
+                  'exclusion_reason', 'sunbiz_path', 'emails', 'tech_stack', 'social_links', 'contacts',
+                  'business_key', 'listing_hash', 'sunbiz_hash', 'websites_hash', 'sites_hash']
+BOOL_COLUMNS = ['is_chain', 'excluded']
+INT_COLUMNS = ['call_day', 'ai_score', 'cluster_id'] # And every score_* component; nullable (Int64)
+FLOAT_COLUMNS = ['sunbiz_seconds', 'first_seen', 'last_seen', 'sunbiz_at', 'websites_at', 'sites_at'] # Durations and Unix timestamps, in seconds
+COMPRESSION = 'zstd'
+UMASK = os.umask(0o022) # Read once (setting it is the only way), then restored
+os.umask(UMASK)
+# CSV and XLSX text columns are read as text, so pandas never guesses them numeric: a listing_id
+# in a column with blanks would come back as '123456.0', a listing_hash lose its leading zeros.
+TEXT_DTYPES = {column: str for column in STRING_COLUMNS + CATEGORICAL_COLUMNS}
+
+
+def is_int_column(column):
+    return column in INT_COLUMNS or column.startswith('score_')
+
+
+def column_type(column):
+    """The Arrow type a known pipeline column is stored as, or None to infer it."""
+    if column in CATEGORICAL_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if column in STRING_COLUMNS:
+        return pa.string()
+    if column in BOOL_COLUMNS:
+        return pa.bool_()
+    if is_int_column(column):
+        return pa.int64()
+    if column in FLOAT_COLUMNS:
+        return pa.float64()
+    return None
+
+
+def apply_dtypes(df):
+    """
+    Returns `df` with the pipeline's explicit dtypes: categoricals, strings (NaN
+    kept as missing), bools (missing = False), nullable Int64 and floats. Columns
+    it doesn't know are left as they are.
+    """
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if column in CATEGORICAL_COLUMNS:
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                df[column] = values.where(values.isna(), values.astype(str)).astype('category')
+        elif column in STRING_COLUMNS:
+            df[column] = values.where(values.isna(), values.astype(str))
+        elif column in BOOL_COLUMNS and values.dtype != bool:
+            df[column] = values.astype(str).str.strip().str.lower().isin(['true', '1', '1.0'])
+        elif is_int_column(column):
+            df[column] = pd.to_numeric(values, errors='coerce').astype('Int64')
+        elif column in FLOAT_COLUMNS:
+            df[column] = pd.to_numeric(values, errors='coerce').astype(float)
+    return df
+
+
+def arrow_schema(df):
+    """The Parquet schema for `df`: the explicit type of every known column, inferred for the rest."""
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    return pa.schema([pa.field(field.name, column_type(field.name) or field.type) for field in inferred])
+
+
+def to_arrow(df, schema=None):
+    df = apply_dtypes(df)
+    return pa.Table.from_pandas(df, schema=schema or arrow_schema(df), preserve_index=False)
+
+
+def from_arrow(table):
+    """A pandas DataFrame from an Arrow table: dictionaries become categoricals, int64 stays int64 with missing values."""
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def read_table(path):
+    """Reads a stage file by extension (.parquet, .csv or .xlsx) into a DataFrame with the pipeline's dtypes."""
+    if path.endswith('.parquet'):
+        return from_arrow(pq.read_table(path))
+    df = pd.read_excel(path, dtype=TEXT_DTYPES) if path.endswith('.xlsx') else pd.read_csv(path, dtype=TEXT_DTYPES)
+    return from_arrow(to_arrow(df)) # Through Arrow, so every format loads with exactly the same dtypes
+
+
+def iter_table(path, chunk_rows):
+    """Yields a stage file `chunk_rows` rows at a time, typed like read_table."""
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield from_arrow(pa.Table.from_batches([batch]))
+    elif path.endswith('.xlsx'):
+        df = read_table(path) # openpyxl can't stream into pandas
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+    else:
+        for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype=TEXT_DTYPES):
+            yield from_arrow(to_arrow(chunk))
+
+
+def table_columns(path):
+    """The column names of a stage file, without reading its rows."""
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    return list((pd.read_excel(path, nrows=0) if path.endswith('.xlsx') else pd.read_csv(path, nrows=0)).columns)
+
+
+class TableWriter:
+    """
+    Writes a table block by block (Parquet row groups, or CSV appends) into a temp
+    file next to `path`, renamed into place by close() so readers never see a
+    half-written file. Parquet blocks are all cast to the first block's schema.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.temp_path = tempfile.mkstemp(prefix='.tmp-', suffix=os.path.splitext(path)[1], dir=directory)
+        os.close(fd)
+        self.parquet = path.endswith('.parquet')
+        if path.endswith('.xlsx'):
+            raise ValueError("XLSX can't be written block by block; use write_table.")
+        self.writer = None
+        self.schema = None
+        self.rows = 0
+
+    def write(self, df):
+        if self.parquet:
+            table = to_arrow(df, self.schema)
+            if self.writer is None:
+                self.schema = table.schema
+                self.writer = pq.ParquetWriter(self.temp_path, self.schema, compression=COMPRESSION)
+            self.writer.write_table(table)
+        else:
+            df.to_csv(self.temp_path, mode='a' if self.rows else 'w', header=not self.rows, index=False)
+        self.rows += len(df) or 1 # An empty first block still writes the CSV header
+
+    def close(self, columns=None):
+        """Finishes the file; with no rows written, an empty table with `columns` is written instead."""
+        if self.writer is not None:
+            self.writer.close()
+        elif not self.rows:
+            write_file(pd.DataFrame(columns=columns or []), self.temp_path)
+        publish(self.temp_path, self.path)
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def publish(temp_path, path):
+    """
+    Flushes a finished temp file to disk and renames it to `path`, with the
+    permissions a plain open() would have given it (mkstemp makes it 0600).
+    """
+    with open(temp_path, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.chmod(temp_path, 0o666 & ~UMASK)
+    os.replace(temp_path, path)
+
+
+def write_file(df, path):
+    if path.endswith('.parquet'):
+        pq.write_table(to_arrow(df), path, compression=COMPRESSION)
+    elif path.endswith('.xlsx'):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def write_table(df, path):
+    """Writes a DataFrame by extension (.parquet, .csv or .xlsx) via a temp file and rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', suffix=os.path.splitext(path)[1], dir=directory)
+    os.close(fd)
+    try:
+        write_file(df, temp_path)
+        publish(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a pipeline Parquet file to CSV or XLSX (or convert any of them into another).")
+    parser.add_argument('input', help="e.g. prioritized_call_list.parquet")
+    parser.add_argument('output', help="e.g. prioritized_call_list.xlsx")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = read_table(args.input)
+    write_table(df, args.output)
+    print(f"Exported {len(df)} rows from '{args.input}' to '{args.output}' in {time.perf_counter() - start:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()